@@ -1,34 +1,200 @@
-import joblib
-import numpy as np
+import json
 import os
+import time
+from contextlib import asynccontextmanager, nullcontext
 from fastapi import FastAPI, Request, Form, HTTPException, status
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.docs import get_swagger_ui_html
-from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
-from config.paths_config import MODEL_OUTPUT_PATH
-import uvicorn
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError, ValidationInfo, field_validator
+from typing import Dict, Any, List, Optional, Union
+from config.paths_config import MODEL_OUTPUT_PATH, COMPILED_MODEL_DIR, MODEL_BUNDLE_DIR, CONFIG_PATH
+from utils.common_functions import read_yaml_file
+from src.inference import FEATURE_COLUMNS, TRAINING_COLUMN_NAMES, build_feature_matrix, predict_batch, describe_prediction, validate_feature_names
+from src.batching import MicroBatcher
+from src.worker_pool import InferencePool, PoolSaturatedError, InferenceTimeoutError
+from src.prediction_cache import PredictionCache
+from src.model_registry import ModelRegistry
+from src.metrics import ServingMetrics
+from src.custom_exception import CustomException
+
+# The model is loaded here (or on first use) rather than at import time,
+# so importing the app stays cheap for tests, tooling and new workers
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if serving_config["preload_model"]:
+        await run_in_threadpool(model_registry.ensure_loaded)
+    if model_reload_config["watch"]:
+        model_registry.start_watching(model_reload_config["poll_interval_seconds"])
+    yield
+    model_registry.stop_watching()
+    inference_pool.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
     title="Hotel Booking Prediction API",
     description="API for predicting hotel booking cancellations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure templates and static files
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Load the pre-trained model
-try:
-    loaded_model = joblib.load(MODEL_OUTPUT_PATH)
-except Exception as e:
-    print(f"Error loading model: {e}")
-    loaded_model = None
+serving_config = read_yaml_file(CONFIG_PATH)["serving"]
+# Request and per-stage latency for GET /metrics; every hook is skipped when disabled
+metrics_config = serving_config["metrics"]
+metrics = ServingMetrics(buckets=metrics_config["buckets"]) if metrics_config["enabled"] else None
+
+def stage(name):
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+# Set by the multi-worker launcher below so every worker maps the shared model
+serving_engine = os.environ.get("SERVING_ENGINE", serving_config["engine"])
+
+def load_model(engine):
+    # Imported here: these pull in lightgbm (and scikit-learn for the pickle)
+    from src.model_bundle import load_model_bundle, load_preprocessor, read_manifest
+    from src.tree_engine import CompiledForest
+
+    if engine == "lightgbm":
+        import joblib
+        model = joblib.load(MODEL_OUTPUT_PATH)
+        validate_feature_names(model.feature_name_)
+        # The bundle is saved with the pickle, raw category labels use its preprocessor
+        if os.path.exists(os.path.join(MODEL_BUNDLE_DIR, "manifest.json")):
+            model.preprocessor = load_preprocessor(read_manifest(MODEL_BUNDLE_DIR))
+        return model
+
+    manifest = read_manifest(MODEL_BUNDLE_DIR)
+    validate_feature_names(manifest["feature_names"])
+    if engine in ("numpy", "mmap"):
+        # Prefer the trees compiled for this exact bundle, compile on the fly otherwise
+        if CompiledForest.read_source_version(COMPILED_MODEL_DIR) == manifest["model_sha256"]:
+            model = CompiledForest.load(COMPILED_MODEL_DIR, mmap_mode="r" if engine == "mmap" else None)
+        else:
+            model = CompiledForest.from_model(load_model_bundle(MODEL_BUNDLE_DIR))
+        model.preprocessor = load_preprocessor(manifest)
+        return model
+    return load_model_bundle(MODEL_BUNDLE_DIR)
+
+def export_shared_model():
+    # Compile once in the parent process so workers only map read-only files
+    from src.model_bundle import load_model_bundle, read_manifest
+    from src.tree_engine import CompiledForest
+
+    source_version = read_manifest(MODEL_BUNDLE_DIR)["model_sha256"]
+    if CompiledForest.read_source_version(COMPILED_MODEL_DIR) != source_version:
+        CompiledForest.from_model(load_model_bundle(MODEL_BUNDLE_DIR)).save(COMPILED_MODEL_DIR, source_version=source_version)
+
+model_reload_config = serving_config["model_reload"]
+
+def current_preprocessor(model=None):
+    return getattr(model if model is not None else model_registry.model, "preprocessor", None)
+
+def featurize(rows):
+    # Encodes raw category labels and applies log1p the way the training data was processed
+    return build_feature_matrix(rows, current_preprocessor())
+
+def warm_up_model(model):
+    rows = [dict.fromkeys(FEATURE_COLUMNS, 0)] * model_reload_config["warmup_rows"]
+    predict_batch(model, build_feature_matrix(rows, current_preprocessor(model)))
+
+# New model artifacts are loaded and warmed in the background, then swapped in atomically
+# A bundle directory is swapped in whole, so its manifest changes once per new model
+model_registry = ModelRegistry(
+    MODEL_OUTPUT_PATH if serving_engine == "lightgbm" else os.path.join(MODEL_BUNDLE_DIR, "manifest.json"),
+    loader=lambda: load_model(serving_engine),
+    warmup=warm_up_model
+)
+
+def predict_features(features):
+    # The model is resolved once per call, so a whole batch is scored by the same version.
+    # With a process pool this runs in the worker, whose metrics are not exported.
+    # Workers started with spawn or forkserver import this module without a model and load their own.
+    if model_registry.model is None and not model_registry.ensure_loaded():
+        raise CustomException("Model not loaded", model_registry.last_error)
+    model, version = model_registry.current()
+    if metrics is None:
+        return predict_batch(model, features)
+    with metrics.model_predict.time(version):
+        return predict_batch(model, features)
+
+# Model calls run in a bounded pool so the event loop keeps serving other requests
+worker_pool_config = serving_config["worker_pool"]
+inference_pool = InferencePool(
+    kind=worker_pool_config["kind"],
+    max_workers=worker_pool_config["max_workers"],
+    max_pending=worker_pool_config["max_pending"],
+    timeout_seconds=worker_pool_config["timeout_seconds"],
+    start_method=worker_pool_config.get("start_method")
+)
+
+async def run_inference(fn, *args, timeout=None):
+    try:
+        return await inference_pool.run(fn, *args, timeout=timeout)
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+# Concurrent single predictions can be coalesced into one model call
+micro_batching_config = serving_config["micro_batching"]
+batcher = MicroBatcher(
+    predict_features,
+    max_batch_size=micro_batching_config["max_batch_size"],
+    max_wait_ms=micro_batching_config["max_wait_ms"],
+    runner=run_inference,
+    featurize=featurize
+) if micro_batching_config["enabled"] else None
+
+# Repeated submissions of the same booking are answered without touching the model
+prediction_cache_config = serving_config["prediction_cache"]
+prediction_cache = PredictionCache(
+    max_size=prediction_cache_config["max_size"],
+    ttl_seconds=prediction_cache_config["ttl_seconds"],
+    model_version=model_registry.version
+) if prediction_cache_config["enabled"] else None
+
+def on_model_swap(model, version):
+    if metrics is not None:
+        metrics.set_model_version(version)
+    if prediction_cache is not None:
+        prediction_cache.set_model_version(version)
+    if inference_pool.kind == "process":
+        inference_pool.restart()
+
+model_registry.on_swap.append(on_model_swap)
+
+async def score_booking(row: Dict[str, Any]) -> int:
+    cache_key = None
+    if prediction_cache is not None:
+        cache_key = prediction_cache.key(row)
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    with stage("inference"):
+        if batcher is not None:
+            prediction, _ = await batcher.submit(row)
+        else:
+            with stage("features"):
+                features = featurize([row])
+            predictions, _ = await run_inference(predict_features, features)
+            prediction = predictions[0]
+    prediction = int(prediction)
+
+    if cache_key is not None:
+        prediction_cache.put(cache_key, prediction)
+    return prediction
+
+def count_predictions(predictions):
+    if metrics is not None:
+        metrics.count_predictions(model_registry.version, predictions)
 
 # Define Pydantic models for API input validation
 class BookingFeatures(BaseModel):
@@ -37,11 +203,27 @@ class BookingFeatures(BaseModel):
     avg_price_per_room: float = Field(..., description="Average price per room", ge=0)
     arrival_month: int = Field(..., description="Month of arrival (1-12)", ge=1, le=12)
     arrival_date: int = Field(..., description="Date of arrival (1-31)", ge=1, le=31)
-    market_segment_type: int = Field(..., description="Type of market segment")
+    market_segment_type: Union[int, str] = Field(..., description="Type of market segment, encoded or as a label such as \"Online\"")
     no_of_week_nights: int = Field(..., description="Number of weeknights", ge=0)
     no_of_weekend_nights: int = Field(..., description="Number of weekend nights", ge=0)
-    type_of_meal_plan: int = Field(..., description="Type of meal plan")
-    room_type_reserved: int = Field(..., description="Type of room reserved")
+    type_of_meal_plan: Union[int, str] = Field(..., description="Type of meal plan, encoded or as a label such as \"Meal Plan 1\"")
+    room_type_reserved: Union[int, str] = Field(..., description="Type of room reserved, encoded or as a label such as \"Room_Type 1\"")
+
+    @field_validator("market_segment_type", "type_of_meal_plan", "room_type_reserved")
+    @classmethod
+    def check_category(cls, value: Union[int, str], info: ValidationInfo) -> Union[int, str]:
+        # Labels are only checked here, they are encoded for the whole batch in featurize
+        if not isinstance(value, str):
+            return value
+        if value.isdigit():
+            return int(value)
+        preprocessor = current_preprocessor()
+        if preprocessor is None:
+            raise ValueError("the serving model has no preprocessor for category labels, send the encoded value")
+        labels = preprocessor.mappings[TRAINING_COLUMN_NAMES.get(info.field_name, info.field_name)]
+        if value not in labels:
+            raise ValueError(f"unknown category {value!r}, expected one of {sorted(labels)}")
+        return value
     
     class Config:
         json_schema_extra = {
@@ -51,11 +233,11 @@ class BookingFeatures(BaseModel):
                 "avg_price_per_room": 150.0,
                 "arrival_month": 6,
                 "arrival_date": 15,
-                "market_segment_type": 2,
+                "market_segment_type": "Online",
                 "no_of_week_nights": 3,
                 "no_of_weekend_nights": 2,
-                "type_of_meal_plan": 1,
-                "room_type_reserved": 2
+                "type_of_meal_plan": "Meal Plan 1",
+                "room_type_reserved": "Room_Type 1"
             }
         }
 
@@ -64,6 +246,19 @@ class PredictionResponse(BaseModel):
     prediction_text: str
     features: Dict[str, Any]
 
+class BatchPredictionItem(BaseModel):
+    index: int
+    prediction: Optional[int] = None
+    probability: Optional[float] = None
+    prediction_text: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+class BatchPredictionResponse(BaseModel):
+    total: int
+    scored: int
+    failed: int
+    results: List[BatchPredictionItem]
+
 class ErrorResponse(BaseModel):
     detail: str
 
@@ -95,12 +290,15 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     if request.url.path.startswith("/api/"):
         return JSONResponse(
             status_code=exc.status_code,
-            content={"detail": exc.detail}
+            content={"detail": exc.detail},
+            headers=exc.headers
         )
     else:
         return templates.TemplateResponse(
             "error.html",
-            {"request": request, "status_code": exc.status_code, "message": "Error", "detail": exc.detail}
+            {"request": request, "status_code": exc.status_code, "message": "Error", "detail": exc.detail},
+            status_code=exc.status_code,
+            headers=exc.headers
         )
 
 @app.exception_handler(Exception)
@@ -124,8 +322,18 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Middleware to check if model is loaded
 @app.middleware("http")
 async def check_model_loaded(request: Request, call_next):
-    if loaded_model is None and "/docs" not in request.url.path and "/openapi.json" not in request.url.path and "/static" not in request.url.path:
-        if request.url.path.startswith("/api/"):
+    path = request.url.path
+    needs_model = (
+        "/docs" not in path and "/openapi.json" not in path and "/static" not in path
+        and not path.startswith("/api/admin/") and path not in ("/health", "/ready", "/metrics")
+    )
+    if needs_model:
+        # Timed on every request that needs the model, not only when it has to be loaded
+        with stage("model_check"):
+            if model_registry.model is None:
+                await run_in_threadpool(model_registry.ensure_loaded)
+    if needs_model and model_registry.model is None:
+        if path.startswith("/api/"):
             return JSONResponse(
                 status_code=503,
                 content={"detail": "Model not loaded. Please check server logs."}
@@ -143,6 +351,30 @@ async def check_model_loaded(request: Request, call_next):
     response = await call_next(request)
     return response
 
+# Registered after check_model_loaded so it wraps it and times the whole request
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if metrics is None:
+        return await call_next(request)
+
+    start = time.perf_counter()
+    metrics.in_flight.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        metrics.in_flight.dec()
+        # Label by route template rather than raw path to keep the number of series bounded
+        route = request.scope.get("route")
+        metrics.requests.observe(
+            time.perf_counter() - start,
+            request.method,
+            route.path if route is not None else "unmatched",
+            status_code
+        )
+
 # API routes
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -162,6 +394,19 @@ async def predict_form(
     type_of_meal_plan: int = Form(...),
     room_type_reserved: int = Form(...)
 ):
+    form_data = {
+        "lead_time": lead_time,
+        "no_of_special_request": no_of_special_request,
+        "avg_price_per_room": avg_price_per_room,
+        "arrival_month": arrival_month,
+        "arrival_date": arrival_date,
+        "market_segment_type": market_segment_type,
+        "no_of_week_nights": no_of_week_nights,
+        "no_of_weekend_nights": no_of_weekend_nights,
+        "type_of_meal_plan": type_of_meal_plan,
+        "room_type_reserved": room_type_reserved
+    }
+
     error = None
     # Validate inputs
     if arrival_month < 1 or arrival_month > 12:
@@ -182,18 +427,7 @@ async def predict_form(
                 "request": request, 
                 "prediction": None, 
                 "error": error,
-                "form_data": {
-                    "lead_time": lead_time,
-                    "no_of_special_request": no_of_special_request,
-                    "avg_price_per_room": avg_price_per_room,
-                    "arrival_month": arrival_month,
-                    "arrival_date": arrival_date,
-                    "market_segment_type": market_segment_type,
-                    "no_of_week_nights": no_of_week_nights,
-                    "no_of_weekend_nights": no_of_weekend_nights,
-                    "type_of_meal_plan": type_of_meal_plan,
-                    "room_type_reserved": room_type_reserved
-                }
+                "form_data": form_data
             }
         )
     
@@ -213,44 +447,23 @@ async def predict_form(
             }
         )
     
-    features = np.array([[
-        lead_time,
-        no_of_special_request,
-        avg_price_per_room,
-        arrival_month,
-        arrival_date,
-        market_segment_type,
-        no_of_week_nights,
-        no_of_weekend_nights,
-        type_of_meal_plan,
-        room_type_reserved
-    ]])
-    
     try:
-        prediction = loaded_model.predict(features)
-        prediction_text = "Booking likely to be CANCELLED" if prediction[0] == 1 else "Booking likely to be CONFIRMED"
+        prediction = await score_booking(form_data)
+        count_predictions([prediction])
         
         # Prepare context with all form values to repopulate the form
         context = {
             "request": request, 
-            "prediction": int(prediction[0]),
-            "prediction_text": prediction_text,
-            "form_data": {
-                "lead_time": lead_time,
-                "no_of_special_request": no_of_special_request,
-                "avg_price_per_room": avg_price_per_room,
-                "arrival_month": arrival_month,
-                "arrival_date": arrival_date,
-                "market_segment_type": market_segment_type,
-                "no_of_week_nights": no_of_week_nights,
-                "no_of_weekend_nights": no_of_weekend_nights,
-                "type_of_meal_plan": type_of_meal_plan,
-                "room_type_reserved": room_type_reserved
-            }
+            "prediction": prediction,
+            "prediction_text": describe_prediction(prediction),
+            "form_data": form_data
         }
         
-        return templates.TemplateResponse("index.html", context)
+        with stage("render"):
+            return templates.TemplateResponse("index.html", context)
     
+    except HTTPException:
+        raise
     except Exception as e:
         return templates.TemplateResponse(
             "index.html", 
@@ -258,60 +471,193 @@ async def predict_form(
                 "request": request, 
                 "prediction": None, 
                 "error": f"Prediction error: {str(e)}",
-                "form_data": {
-                    "lead_time": lead_time,
-                    "no_of_special_request": no_of_special_request,
-                    "avg_price_per_room": avg_price_per_room,
-                    "arrival_month": arrival_month,
-                    "arrival_date": arrival_date,
-                    "market_segment_type": market_segment_type,
-                    "no_of_week_nights": no_of_week_nights,
-                    "no_of_weekend_nights": no_of_weekend_nights,
-                    "type_of_meal_plan": type_of_meal_plan,
-                    "room_type_reserved": room_type_reserved
-                }
+                "form_data": form_data
             }
         )
 
-@app.post("/api/predict", response_model=PredictionResponse)
-async def predict_api(booking: BookingFeatures):
-    if loaded_model is None:
+async def parse_booking(request: Request) -> BookingFeatures:
+    with stage("parse"):
+        try:
+            payload = await request.json()
+        except ValueError as e:
+            raise RequestValidationError([{"type": "json_invalid", "loc": ("body",), "msg": f"JSON decode error: {str(e)}", "input": None}])
+    with stage("validation"):
+        try:
+            return BookingFeatures.model_validate(payload)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+
+# The body is validated in the handler rather than by FastAPI, so validation gets its own stage;
+# openapi_extra keeps BookingFeatures as the documented request body
+@app.post(
+    "/api/predict",
+    response_model=PredictionResponse,
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {"schema": BookingFeatures.model_json_schema()}}}}
+)
+async def predict_api(request: Request):
+    if model_registry.model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
-        
-    features = np.array([[
-        booking.lead_time,
-        booking.no_of_special_request,
-        booking.avg_price_per_room,
-        booking.arrival_month,
-        booking.arrival_date,
-        booking.market_segment_type,
-        booking.no_of_week_nights,
-        booking.no_of_weekend_nights,
-        booking.type_of_meal_plan,
-        booking.room_type_reserved
-    ]])
-    
+
+    booking = await parse_booking(request)
     try:
-        prediction = loaded_model.predict(features)
-        prediction_text = "Booking likely to be CANCELLED" if prediction[0] == 1 else "Booking likely to be CONFIRMED"
+        features = booking.model_dump()
+        prediction = await score_booking(features)
+        count_predictions([prediction])
         
         return {
-            "prediction": int(prediction[0]),
-            "prediction_text": prediction_text,
-            "features": booking.dict()
+            "prediction": prediction,
+            "prediction_text": describe_prediction(prediction),
+            "features": features
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
-# Health check endpoint
+def parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    try:
+        if "ndjson" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed request body: {str(e)}")
+
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict) and isinstance(payload.get("bookings"), list):
+        return payload["bookings"]
+    if isinstance(payload, dict) and isinstance(payload.get("columns"), dict):
+        columns = payload["columns"]
+        lengths = {len(values) for values in columns.values() if isinstance(values, list)}
+        if len(lengths) != 1 or not all(isinstance(values, list) for values in columns.values()):
+            raise HTTPException(status_code=400, detail="All columns must be lists of the same length")
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+    raise HTTPException(
+        status_code=400,
+        detail="Expected a JSON list, {\"bookings\": [...]}, {\"columns\": {...}} or an NDJSON body"
+    )
+
+def prepare_batch(body: bytes, content_type: str):
+    # Parsing, validation and featurizing cost about a second for a full batch,
+    # so they run in a thread rather than on the event loop
+    with stage("parse"):
+        rows = parse_batch_body(body, content_type)
+
+    max_batch_size = serving_config["max_batch_size"]
+    if len(rows) > max_batch_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch of {len(rows)} rows exceeds the maximum of {max_batch_size}"
+        )
+
+    # Validate row by row so one bad booking does not fail the whole batch
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    valid_index = []
+    valid_rows = []
+    with stage("validation"):
+        for i, row in enumerate(rows):
+            try:
+                booking = BookingFeatures.model_validate(row)
+            except ValidationError as e:
+                errors = [f"{error['loc'][-1] if error['loc'] else 'row'}: {error['msg']}" for error in e.errors()]
+                results[i] = {"index": i, "errors": errors}
+                continue
+            valid_index.append(i)
+            valid_rows.append(booking.model_dump())
+
+    features = None
+    if valid_rows:
+        try:
+            with stage("features"):
+                features = featurize(valid_rows)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+    return results, valid_index, features
+
+@app.post("/api/predict/batch", response_model=BatchPredictionResponse)
+async def predict_batch_api(request: Request):
+    if model_registry.model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    body = await request.body()
+    results, valid_index, features = await run_in_threadpool(prepare_batch, body, request.headers.get("content-type", ""))
+
+    if valid_index:
+        try:
+            with stage("inference"):
+                predictions, probabilities = await run_inference(
+                    predict_features,
+                    features,
+                    timeout=worker_pool_config["batch_timeout_seconds"]
+                )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        count_predictions(predictions)
+
+        for j, i in enumerate(valid_index):
+            prediction = int(predictions[j])
+            results[i] = {
+                "index": i,
+                "prediction": prediction,
+                "probability": float(probabilities[j]) if probabilities is not None else None,
+                "prediction_text": describe_prediction(prediction)
+            }
+
+    # Skip response_model re-validation, it dominates the cost of large batches
+    return JSONResponse(content={
+        "total": len(results),
+        "scored": len(valid_index),
+        "failed": len(results) - len(valid_index),
+        "results": results
+    })
+
+# Readiness probe: only route traffic here once a model is serving
+@app.get("/ready")
+async def readiness_check():
+    if not await run_in_threadpool(model_registry.ensure_loaded):
+        return JSONResponse(
+            status_code=503,
+            content={"ready": False, "detail": model_registry.last_error or "Model not loaded"}
+        )
+    return {"ready": True, "model_version": model_registry.version}
+
+# Liveness probe: answers as long as the process is up, model or not
 @app.get("/health")
 async def health_check():
     return {
         "status": "healthy",
-        "model_loaded": loaded_model is not None,
-        "version": app.version
+        "model_loaded": model_registry.model is not None,
+        "model_version": model_registry.version,
+        "version": app.version,
+        "micro_batching": batcher.stats() if batcher is not None else None,
+        "prediction_cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "worker_pool": inference_pool.stats(),
+        "model_registry": model_registry.stats()
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/api/admin/reload-model")
+async def reload_model(request: Request):
+    admin_token = model_reload_config["admin_token"]
+    if admin_token and request.headers.get("x-admin-token") != admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    try:
+        reloaded = await run_in_threadpool(model_registry.load)
+    except CustomException as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"reloaded": reloaded, "model_version": model_registry.version}
+
 # API documentation endpoint
 @app.get("/api/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
@@ -323,4 +669,20 @@ async def custom_swagger_ui_html():
     )
 
 if __name__ == "__main__":
-    uvicorn.run("application:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the hotel booking prediction API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--reload", action=argparse.BooleanOptionalAction, default=True,
+                        help="Restart on code changes (single worker only)")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        export_shared_model()
+        os.environ["SERVING_ENGINE"] = "mmap"
+        uvicorn.run("application:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run("application:app", host=args.host, port=args.port, reload=args.reload)
\ No newline at end of file
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from config.paths_config import RAW_DIR, PROCESSED_DIR
+from utils.common_functions import load_data, save_data
+
+FORMATS = ["csv", "parquet", "feather"]
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare read/write time and size of the stage artifact formats")
+    parser.add_argument("--datasets", nargs="+", default=[
+        os.path.join(RAW_DIR, "train.csv"),
+        os.path.join(PROCESSED_DIR, "processed_train.csv")
+    ])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for dataset in args.datasets:
+            df = load_data(dataset)
+            print(f"\n{dataset}: {len(df)} rows x {df.shape[1]} columns")
+            print(f"{'format':<10}{'write (ms)':>12}{'read (ms)':>12}{'disk (KB)':>12}{'memory (KB)':>14}")
+
+            for fmt in FORMATS:
+                path = os.path.join(tmp_dir, f"{Path(dataset).stem}.{fmt}")
+                write, _ = best_of(lambda: save_data(df, path), args.repeats)
+                read, loaded = best_of(lambda: load_data(path), args.repeats)
+                memory = loaded.memory_usage(deep=True).sum()
+                print(f"{fmt:<10}{write * 1000:>12.1f}{read * 1000:>12.1f}{os.path.getsize(path) / 1024:>12.0f}{memory / 1024:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
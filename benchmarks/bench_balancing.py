@@ -0,0 +1,68 @@
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import lightgbm as lgb
+from imblearn.over_sampling import SMOTE
+import pandas as pd
+from sklearn.metrics import f1_score
+from config.paths_config import TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH
+from utils.common_functions import load_data
+from src.data_preprocessing import DataProcessor
+from src.balancing import STRATEGIES, training_class_weight
+
+
+def original_smote(df):
+    # balance_data before the strategies: float64 SMOTE on the frame, then a rebuilt copy
+    X = df.drop(columns="booking_status")
+    X_resampled, y_resampled = SMOTE(random_state=42).fit_resample(X, df["booking_status"])
+    balanced_df = pd.DataFrame(X_resampled, columns=X.columns)
+    balanced_df["booking_status"] = y_resampled
+    return balanced_df
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(test_df, name, balanced, elapsed, peak, class_weight, n_estimators):
+    X = balanced.drop(columns="booking_status")
+    model = lgb.LGBMClassifier(n_estimators=n_estimators, class_weight=class_weight, random_state=42, verbose=-1)
+    start = time.perf_counter()
+    model.fit(X, balanced["booking_status"])
+    fit = time.perf_counter() - start
+    f1 = f1_score(test_df["booking_status"], model.predict(test_df[X.columns]))
+    frame = balanced.memory_usage(deep=True).sum() / 2**20
+    print(f"{name:<16}{len(balanced):>8}{elapsed:>9.3f}{peak / 2**20:>9.1f}{frame:>10.1f}{fit:>8.2f}{f1:>9.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare balancing strategies by time, memory and the model they lead to")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--n-estimators", type=int, default=200, help="Trees of the LightGBM model fitted on each result")
+    args = parser.parse_args()
+
+    processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+    train_df = processor.preprocess_data(load_data(TRAIN_FILE_PATH))
+    # Evaluated on the real class ratio of the test split
+    test_df = processor.preprocess_data(load_data(TEST_FILE_PATH))
+    print(f"train {len(train_df)} rows, class counts {train_df['booking_status'].value_counts().to_dict()}, test {len(test_df)} rows")
+    print(f"{'strategy':<16}{'rows':>8}{'seconds':>9}{'peak MB':>9}{'frame MB':>10}{'fit s':>8}{'test f1':>9}")
+
+    report(test_df, "smote (before)", *measure(lambda: original_smote(train_df)), None, args.n_estimators)
+    for strategy in args.strategies:
+        settings = dict(processor.config["data_processing"]["balancing"], strategy=strategy)
+        processor.config["data_processing"]["balancing"] = settings
+        report(test_df, strategy, *measure(lambda: processor.balance_data(train_df)), training_class_weight(settings), args.n_estimators)
+
+
+if __name__ == "__main__":
+    main()
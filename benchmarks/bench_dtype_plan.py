@@ -0,0 +1,56 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from config.paths_config import TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH
+from utils.common_functions import load_data
+from src.data_preprocessing import DataProcessor
+
+
+def run_stages(optimize):
+    # The stages of DataProcessor.process, without writing the outputs
+    processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+    if not optimize:
+        processor.dtype_plan = None
+
+    start = time.perf_counter()
+    train_df = load_data(TRAIN_FILE_PATH, dtype_plan=processor.dtype_plan)
+    test_df = load_data(TEST_FILE_PATH, dtype_plan=processor.dtype_plan)
+    processor.record_memory("loading", train=train_df, test=test_df)
+    train_df = processor.preprocess_data(train_df)
+    test_df = processor.preprocess_data(test_df)
+    processor.record_memory("preprocessing", train=train_df, test=test_df)
+    train_df = processor.balance_data(train_df)
+    processor.record_memory("balancing", train=train_df, test=test_df)
+    train_df = processor.select_features(train_df)
+    test_df = test_df[train_df.columns]
+    processor.record_memory("feature selection", train=train_df, test=test_df)
+    return processor.memory_report, time.perf_counter() - start, train_df, test_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare DataFrame memory per processing stage with and without the dtype plan")
+    parser.parse_args()
+
+    default, default_seconds, default_train, default_test = run_stages(False)
+    planned, planned_seconds, planned_train, planned_test = run_stages(True)
+
+    print(f"{'stage':<20}{'split':<7}{'default MB':>12}{'planned MB':>12}{'saved':>8}")
+    for stage, splits in default.items():
+        for split, mb in splits.items():
+            saved = 1 - planned[stage][split] / mb
+            print(f"{stage:<20}{split:<7}{mb:>12.2f}{planned[stage][split]:>12.2f}{saved:>8.0%}")
+    print(f"seconds: default {default_seconds:.2f}, planned {planned_seconds:.2f}")
+
+    # Same processed data up to dtypes
+    same = all(
+        list(default_df.columns) == list(planned_df.columns)
+        and ((default_df.astype("float64") - planned_df.astype("float64")).abs().max() < 1e-4).all()
+        for default_df, planned_df in ((default_train, planned_train), (default_test, planned_test))
+    )
+    print(f"same processed data: {same}")
+
+
+if __name__ == "__main__":
+    main()
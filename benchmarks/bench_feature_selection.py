@@ -0,0 +1,57 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from config.paths_config import TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH
+from utils.common_functions import load_data
+from src.data_preprocessing import DataProcessor
+from src.feature_selection import STRATEGIES, rank_features, selection_stability
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare feature selection strategies by time and stability of the selected features")
+    parser.add_argument("--data", default=TRAIN_FILE_PATH)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--seeds", type=int, default=3, help="Runs per strategy, each with a different random_state")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # The same balanced training data select_features sees in the pipeline
+    processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+    df = processor.balance_data(processor.preprocess_data(load_data(args.data)))
+    X = df.drop(columns="booking_status")
+    y = df["booking_status"]
+    settings = processor.config["data_processing"]["feature_selection"]
+    k = processor.config["data_processing"]["no_of_features"]
+
+    # Reference: the original full random forest with the configured seed
+    reference = set(rank_features(X, y, settings, strategy="random_forest")[0].index[:k])
+
+    print(f"{len(X)} rows x {X.shape[1]} features, selecting {k}")
+    print(f"{'strategy':<15}{'mean s':>9}{'min s':>9}{'stability':>11}{'vs forest':>11}")
+    results = {}
+    for strategy in args.strategies:
+        timings, selections = [], []
+        for seed in range(args.seeds):
+            ranking, elapsed = rank_features(X, y, settings, strategy=strategy, random_state=seed)
+            timings.append(elapsed)
+            selections.append(ranking.index[:k].tolist())
+        overlap = sum(len(reference & set(selection)) for selection in selections) / (len(selections) * k)
+        results[strategy] = {
+            "mean_seconds": sum(timings) / len(timings),
+            "min_seconds": min(timings),
+            "stability": selection_stability(selections),
+            "overlap_with_random_forest": overlap,
+            "selections": selections
+        }
+        result = results[strategy]
+        print(f"{strategy:<15}{result['mean_seconds']:>9.2f}{result['min_seconds']:>9.2f}{result['stability']:>11.2f}{overlap:>11.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
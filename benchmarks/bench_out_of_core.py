@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import lightgbm as lgb
+from config.paths_config import PROCESSED_TRAIN_DATA_PATH
+from config.model_params import OUT_OF_CORE_PARAMS
+from utils.common_functions import ChunkedDataWriter, load_data, data_format, peak_rss_mb
+from src.hyperparameter_search import booster_params
+from src.out_of_core import build_streamed_dataset
+
+
+def write_replicated(source, path, repeat, chunk_size):
+    # The processed training data repeated, written in chunks like streaming ingestion does
+    df = load_data(source)
+    writer = ChunkedDataWriter(path)
+    for _ in range(repeat):
+        for start in range(0, len(df), chunk_size):
+            writer.write(df.iloc[start:start + chunk_size])
+    writer.close()
+    return writer.rows
+
+
+def train(mode, path, batch_size, rounds):
+    # Runs in its own process, so the peak memory is this mode's alone
+    params = booster_params(lgb.LGBMClassifier(**OUT_OF_CORE_PARAMS["model"]))
+    # Interpreter and libraries, before any data is read
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "memory":
+        df = load_data(path)
+        dataset = lgb.Dataset(df.drop(columns="booking_status"), label=df["booking_status"], params=params).construct()
+        del df
+    else:
+        dataset, _ = build_streamed_dataset(path, params, batch_size)
+    built = time.perf_counter() - start
+    lgb.train(params, dataset, num_boost_round=rounds)
+    return {"dataset_seconds": built, "total_seconds": time.perf_counter() - start, "baseline_mb": baseline, "peak_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare peak memory of in-memory and streamed (out-of-core) training")
+    parser.add_argument("--source", default=PROCESSED_TRAIN_DATA_PATH)
+    parser.add_argument("--repeat", type=int, default=20, help="Copies of the source rows in the benchmark file")
+    parser.add_argument("--formats", nargs="+", default=["parquet", "feather", "csv"])
+    parser.add_argument("--batch-size", type=int, default=OUT_OF_CORE_PARAMS["batch_size"])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--workdir", default="/tmp/bench_out_of_core")
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(train(args.run[0], args.run[1], args.batch_size, args.rounds)))
+        return
+
+    os.makedirs(args.workdir, exist_ok=True)
+    print(f"{'format':<9}{'mode':<10}{'rows':>10}{'file MB':>9}{'dataset s':>11}{'total s':>9}{'base MB':>9}{'peak MB':>9}")
+    for fmt in args.formats:
+        path = os.path.join(args.workdir, f"train.{data_format(f'x.{fmt}')}")
+        rows = write_replicated(args.source, path, args.repeat, args.batch_size)
+        size = os.path.getsize(path) / 2**20
+        for mode in ("memory", "streamed"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--run", mode, path, "--batch-size", str(args.batch_size), "--rounds", str(args.rounds)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{fmt:<9}{mode:<10}{rows:>10}{size:>9.1f}{result['dataset_seconds']:>11.2f}{result['total_seconds']:>9.2f}{result['baseline_mb']:>9.0f}{result['peak_mb']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
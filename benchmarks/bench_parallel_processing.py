@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import pandas as pd
+from config.paths_config import TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH
+from utils.common_functions import load_data
+from src.data_preprocessing import DataProcessor
+
+
+def repeated(df, repeat):
+    # Distinct Booking_IDs, so drop_duplicates keeps every copy
+    return pd.concat([df.assign(Booking_ID=df["Booking_ID"].astype(str) + f"-{i}") for i in range(repeat)], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time preprocessing of both splits sequentially and in process pools")
+    parser.add_argument("--repeat", type=int, default=20, help="Copies of the raw rows to preprocess")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+    train_df = repeated(load_data(TRAIN_FILE_PATH, dtype_plan=processor.dtype_plan), args.repeat)
+    test_df = repeated(load_data(TEST_FILE_PATH, dtype_plan=processor.dtype_plan), args.repeat)
+    print(f"{len(train_df)} train and {len(test_df)} test rows, {os.cpu_count()} cores")
+
+    processor.preprocessor = None
+    start = time.perf_counter()
+    expected = processor.preprocess_splits(train_df, test_df)
+    print(f"{'sequential':<14}{time.perf_counter() - start:>8.2f}s")
+
+    for workers in args.workers:
+        processor.config["data_processing"]["parallel"] = {"enabled": True, "workers": workers}
+        processor.preprocessor = None
+        start = time.perf_counter()
+        with processor.worker_pool() as pool:
+            result = processor.preprocess_splits(train_df, test_df, pool)
+        elapsed = time.perf_counter() - start
+        same = all(a.equals(b) for a, b in zip(expected, result))
+        print(f"{f'{workers} workers':<14}{elapsed:>8.2f}s  same output: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from datetime import datetime
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import httpx
+import numpy as np
+import psutil
+from pandas.api.types import is_numeric_dtype
+from config.paths_config import TEST_FILE_PATH, LABEL_MAPPINGS_PATH
+from utils.common_functions import load_data, read_json_file
+from src.inference import FEATURE_COLUMNS, TRAINING_COLUMN_NAMES
+
+ROOT = Path(__file__).parent.parent
+DAYS_IN_MONTH = {1: 31, 2: 28, 3: 31, 4: 30, 5: 31, 6: 30, 7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31}
+
+
+def load_payloads(path, limit=None):
+    # Raw bookings encoded the way the training pipeline did, keeping only rows the API accepts
+    df = load_data(path)
+    for col, mapping in read_json_file(LABEL_MAPPINGS_PATH).items():
+        if col in df.columns and not is_numeric_dtype(df[col]):
+            df[col] = df[col].map(mapping)
+
+    df = df.rename(columns={v: k for k, v in TRAINING_COLUMN_NAMES.items()})[FEATURE_COLUMNS].dropna()
+    df = df[df["arrival_date"] <= df["arrival_month"].map(DAYS_IN_MONTH)]
+
+    payloads = [
+        {col: (float(value) if col == "avg_price_per_room" else int(value)) for col, value in row.items()}
+        for row in df.to_dict(orient="records")
+    ]
+    return payloads[:limit] if limit else payloads
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("api", "form", "batch"):
+            raise argparse.ArgumentTypeError(f"Unknown request kind {kind!r}, expected api, form or batch")
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+async def send(client, kind, payloads, rng, batch_size):
+    if kind == "api":
+        return await client.post("/api/predict", json=rng.choice(payloads))
+    if kind == "form":
+        return await client.post("/", data=rng.choice(payloads))
+    return await client.post("/api/predict/batch", json=rng.sample(payloads, batch_size))
+
+
+async def drive(client, args, payloads):
+    rng = random.Random(args.seed)
+    kinds = rng.choices(list(args.mix), weights=list(args.mix.values()), k=args.warmup + args.requests)
+    samples = {kind: [] for kind in args.mix}
+    errors = {kind: 0 for kind in args.mix}
+    queue = iter(enumerate(kinds))
+
+    async def worker():
+        for i, kind in queue:
+            start = time.perf_counter()
+            try:
+                response = await send(client, kind, payloads, rng, args.batch_size)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if i < args.warmup:
+                continue
+            if ok:
+                samples[kind].append(elapsed)
+            else:
+                errors[kind] += 1
+
+    # Warm-up requests are sent first by the same workers but left out of the results
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return samples, errors, time.perf_counter() - start
+
+
+class ResourceSampler:
+    # Samples CPU time and RSS of a process and its children (uvicorn workers)
+
+    def __init__(self, pid, interval=0.1):
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.peak_rss = 0
+        self._task = None
+
+    def _processes(self):
+        try:
+            return [self.process] + self.process.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    def _cpu_seconds(self):
+        total = 0.0
+        for process in self._processes():
+            try:
+                times = process.cpu_times()
+                total += times.user + times.system
+            except psutil.NoSuchProcess:
+                pass
+        return total
+
+    def _sample_rss(self):
+        rss = 0
+        for process in self._processes():
+            try:
+                rss += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        self.peak_rss = max(self.peak_rss, rss)
+
+    async def _run(self):
+        while True:
+            self._sample_rss()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._cpu_start = self._cpu_seconds()
+        self._wall_start = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        self._task.cancel()
+        self._sample_rss()
+        wall = time.perf_counter() - self._wall_start
+        cpu = self._cpu_seconds() - self._cpu_start
+        return {"cpu_percent": 100 * cpu / wall if wall else 0.0, "peak_rss_mb": self.peak_rss / 2**20}
+
+
+def summarize(samples, errors, wall):
+    results = {}
+    for kind in samples:
+        latencies = np.asarray(samples[kind]) * 1000
+        results[kind] = {
+            "requests": len(latencies),
+            "errors": errors[kind],
+            "rps": len(latencies) / wall if wall else 0.0,
+            **{f"p{q}_ms": float(np.percentile(latencies, q)) if len(latencies) else None for q in (50, 95, 99)}
+        }
+    total = np.concatenate([np.asarray(values) for values in samples.values()]) * 1000
+    results["total"] = {
+        "requests": len(total),
+        "errors": sum(errors.values()),
+        "rps": len(total) / wall if wall else 0.0,
+        **{f"p{q}_ms": float(np.percentile(total, q)) if len(total) else None for q in (50, 95, 99)}
+    }
+    return results
+
+
+async def run_in_process(args, payloads):
+    # Imported here so --mode uvicorn measures a server that did not share our interpreter
+    import application
+
+    await asyncio.get_running_loop().run_in_executor(None, application.model_registry.ensure_loaded)
+    transport = httpx.ASGITransport(app=application.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sampler = ResourceSampler(os.getpid())
+        sampler.start()
+        samples, errors, wall = await drive(client, args, payloads)
+        return samples, errors, wall, sampler.stop()
+
+
+async def wait_until_ready(client, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server was not ready within {timeout}s")
+
+
+async def run_over_uvicorn(args, payloads):
+    server = subprocess.Popen(
+        [sys.executable, "application.py", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--no-reload"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=30) as client:
+            await wait_until_ready(client, server)
+            sampler = ResourceSampler(server.pid)
+            sampler.start()
+            samples, errors, wall = await drive(client, args, payloads)
+            return samples, errors, wall, sampler.stop()
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the serving API and report latency, throughput and resource use")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("api=8,form=1,batch=1"),
+                        help="Weighted request kinds, e.g. api=8,form=1,batch=1")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--data", default=TEST_FILE_PATH)
+    parser.add_argument("--payload-limit", type=int, default=None, help="Use only the first N bookings as payloads")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--history", default=str(ROOT / "artifacts" / "benchmarks" / "serving.jsonl"),
+                        help="JSON lines file the summary is appended to")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="Fail if the overall p95 latency is higher")
+    parser.add_argument("--min-rps", type=float, default=None, help="Fail if the overall throughput is lower")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.data, args.payload_limit)
+    if "batch" in args.mix and len(payloads) < args.batch_size:
+        parser.error(f"Only {len(payloads)} payloads available for batches of {args.batch_size}")
+
+    runner = run_in_process if args.mode == "inprocess" else run_over_uvicorn
+    samples, errors, wall, resources = asyncio.run(runner(args, payloads))
+    results = summarize(samples, errors, wall)
+
+    print(f"{args.mode}: {args.requests} requests, concurrency {args.concurrency}, {len(payloads)} distinct payloads")
+    print(f"{'kind':<8}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, result in results.items():
+        latencies = "".join(f"{result[f'p{q}_ms']:>10.2f}" if result[f"p{q}_ms"] is not None else f"{'-':>10}" for q in (50, 95, 99))
+        print(f"{kind:<8}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.1f}{latencies}")
+    print(f"cpu {resources['cpu_percent']:.0f}%   peak rss {resources['peak_rss_mb']:.0f} MB")
+
+    summary = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "uvicorn" else None,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "batch_size": args.batch_size,
+        "results": results,
+        **resources
+    }
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(summary) + "\n")
+
+    failures = []
+    if results["total"]["errors"]:
+        failures.append(f"{results['total']['errors']} requests failed")
+    if args.max_p95_ms is not None and (results["total"]["p95_ms"] or 0) > args.max_p95_ms:
+        failures.append(f"p95 {results['total']['p95_ms']:.1f} ms is above {args.max_p95_ms} ms")
+    if args.min_rps is not None and results["total"]["rps"] < args.min_rps:
+        failures.append(f"{results['total']['rps']:.1f} requests/s is below {args.min_rps}")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Runs in a fresh interpreter so nothing is already imported or cached
+PROBE = """
+import json, time
+start = time.perf_counter()
+import application
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(application.app)
+ready = client.get("/ready")
+loaded = time.perf_counter()
+response = client.post("/api/predict", json={
+    "lead_time": 30, "no_of_special_request": 1, "avg_price_per_room": 150.0,
+    "arrival_month": 6, "arrival_date": 15, "market_segment_type": 2,
+    "no_of_week_nights": 3, "no_of_weekend_nights": 2,
+    "type_of_meal_plan": 1, "room_type_reserved": 2
+})
+predicted = time.perf_counter()
+assert ready.status_code == 200 and response.status_code == 200, (ready.text, response.text)
+print(json.dumps({
+    "version": application.app.version,
+    "import_s": imported - start,
+    "model_load_s": loaded - imported,
+    "first_prediction_s": predicted - loaded,
+    "total_s": predicted - start
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import and first-prediction latency")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--history", default=str(ROOT / "artifacts" / "benchmarks" / "startup.jsonl"),
+                        help="JSON lines file the summary is appended to, one record per run of this script")
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    summary = {
+        "version": samples[0]["version"],
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "runs": args.runs
+    }
+    for metric in ["import_s", "model_load_s", "first_prediction_s", "total_s"]:
+        values = [sample[metric] for sample in samples]
+        summary[metric] = {"median": statistics.median(values), "max": max(values)}
+        print(f"{metric:<20} median {summary[metric]['median'] * 1000:8.1f} ms   max {summary[metric]['max'] * 1000:8.1f} ms")
+
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(summary) + "\n")
+    print(f"Appended results for version {summary['version']} to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+import joblib
+import numpy as np
+from config.paths_config import MODEL_OUTPUT_PATH, PROCESSED_TEST_DATA_PATH
+from utils.common_functions import load_data
+from src.tree_engine import CompiledForest
+
+
+def time_per_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LightGBM and the compiled NumPy engine")
+    parser.add_argument("--model", default=MODEL_OUTPUT_PATH)
+    parser.add_argument("--data", default=PROCESSED_TEST_DATA_PATH)
+    parser.add_argument("--row-repeats", type=int, default=500)
+    parser.add_argument("--batch-repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    X = load_data(args.data).drop(columns=["booking_status"]).to_numpy(dtype=np.float32)
+
+    start = time.perf_counter()
+    forest = CompiledForest.from_model(model)
+    print(f"compiled {forest.num_trees} trees / {len(forest.value)} nodes in {time.perf_counter() - start:.2f}s")
+
+    max_diff = np.abs(model.predict_proba(X)[:, 1] - forest.predict_proba(X)[:, 1]).max()
+    print(f"max probability difference on {len(X)} rows: {max_diff:.2e}")
+
+    print(f"{'engine':<10}{'per-row (ms)':>15}{'batch (ms)':>15}{'batch rows/s':>15}")
+    for name, engine in [("lightgbm", model), ("numpy", forest)]:
+        row = time_per_call(lambda: engine.predict_proba(X[:1]), args.row_repeats)
+        batch = time_per_call(lambda: engine.predict_proba(X), args.batch_repeats)
+        print(f"{name:<10}{row * 1000:>15.3f}{batch * 1000:>15.1f}{len(X) / batch:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
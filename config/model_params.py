@@ -10,12 +10,50 @@ LIGHTGM_PARAMS={
 
 
 RANDOM_SEARCH_PARAMS = {
+    # random: random search with cv-fold cross-validation, each candidate trained to its full n_estimators.
+    # halving: successive halving over boosting rounds with early stopping on a validation fold.
+    # Both bin the features into one lgb.Dataset that every candidate and fold trains on subsets of.
+    'engine' : 'random',
     'n_iter' : 4,
     'cv' : 2,
+    # Candidates trained in parallel (-1: one per core); LightGBM gets the remaining
+    # n_cores // n_jobs threads, so the two never oversubscribe the machine
     'n_jobs':-1,
-    'verbose' :2,
+    'n_cores' : None,
     'random_state' : 42,
-    'scoring' : 'accuracy'
+    'scoring' : 'accuracy',
+    # Keep the binned dataset in LightGBM's binary format under LGBM_DATASET_DIR, so a
+    # rerun on the same training data skips binning
+    'save_binary_dataset' : False,
+
+    # halving engine
+    'n_candidates' : 16,
+    'min_rounds' : 50,
+    'max_rounds' : 500,
+    'eta' : 3,
+    'early_stopping_rounds' : 20,
+    'validation_fraction' : 0.2
 }
 
 
+
+
+# Out-of-core training for data larger than memory: the processed train split is streamed
+# from disk into a LightGBM Dataset batch by batch (parquet/feather row groups, or LightGBM's
+# two-round loader for csv) and one model is trained with these fixed parameters, without a search
+OUT_OF_CORE_PARAMS = {
+    'enabled' : False,
+    'batch_size' : 65536,
+    'n_cores' : None,
+    # Keep the binned dataset under LGBM_DATASET_DIR, so a rerun skips reading the data
+    'save_binary_dataset' : True,
+    # LGBMClassifier parameters of the trained model
+    'model' : {
+        'n_estimators' : 300,
+        'learning_rate' : 0.1,
+        'num_leaves' : 63,
+        'boosting_type' : 'gbdt',
+        'max_bin' : 255,
+        'random_state' : 42
+    }
+}
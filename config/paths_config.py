@@ -3,11 +3,19 @@ import os
 
 ######################## DATA INGESTION ########################
 
+# Format of the datasets passed between stages: parquet, feather or csv.
+# load_data falls back to an existing .csv file when no file in this format exists yet.
+ARTIFACT_FORMAT = os.environ.get("ARTIFACT_FORMAT", "parquet")
+
 RAW_DIR = "artifacts/raw"
 RAW_FILE_PATH = os.path.join(RAW_DIR, "raw.csv")
 
-TRAIN_FILE_PATH = os.path.join(RAW_DIR, "train.csv")
-TEST_FILE_PATH = os.path.join(RAW_DIR, "test.csv")
+TRAIN_FILE_PATH = os.path.join(RAW_DIR, f"train.{ARTIFACT_FORMAT}")
+TEST_FILE_PATH = os.path.join(RAW_DIR, f"test.{ARTIFACT_FORMAT}")
+
+# Incremental ingestion: new rows are appended under split=<train|test>/arrival=<YYYY-MM>/
+RAW_PARTITIONS_DIR = os.path.join(RAW_DIR, "partitions")
+INGESTION_STATE_PATH = os.path.join(RAW_DIR, "ingestion_state.json")
 
 CONFIG_PATH = "config/config.yaml"
 
@@ -15,10 +23,26 @@ CONFIG_PATH = "config/config.yaml"
 ######################## DATA PROCESSING ########################
 
 PROCESSED_DIR = "artifacts/processed"
-PROCESSED_TRAIN_DATA_PATH = os.path.join(PROCESSED_DIR,"processed_train.csv")
-PROCESSED_TEST_DATA_PATH = os.path.join(PROCESSED_DIR,"processed_test.csv")
+PROCESSED_TRAIN_DATA_PATH = os.path.join(PROCESSED_DIR,f"processed_train.{ARTIFACT_FORMAT}")
+PROCESSED_TEST_DATA_PATH = os.path.join(PROCESSED_DIR,f"processed_test.{ARTIFACT_FORMAT}")
+LABEL_MAPPINGS_PATH = os.path.join(PROCESSED_DIR,"label_mappings.json")
+PREPROCESSOR_PATH = os.path.join(PROCESSED_DIR,"preprocessor.json")
+PROCESSED_PARTITIONS_DIR = os.path.join(PROCESSED_DIR,"partitions")
+PROCESSING_STATE_PATH = os.path.join(PROCESSED_DIR,"processing_state.json")
 
 
 
 ####################### MODEL TRAINING #################
-MODEL_OUTPUT_PATH = "artifacts/models/lgbm_model.pkl"
\ No newline at end of file
+MODEL_OUTPUT_PATH = "artifacts/models/lgbm_model.pkl"
+COMPILED_MODEL_DIR = "artifacts/models/lgbm_compiled"
+MODEL_BUNDLE_DIR = "artifacts/models/lgbm_bundle"
+TRAINING_SUMMARY_PATH = "artifacts/models/training_summary.json"
+LGBM_DATASET_DIR = "artifacts/cache/lgbm_dataset"
+# Datasets already logged to MLflow, by content hash
+MLFLOW_DATASET_INDEX_PATH = "artifacts/cache/mlflow_datasets.json"
+
+
+####################### PIPELINE #################
+STAGE_CACHE_DIR = "artifacts/cache"
+STAGE_REPORT_PATH = os.path.join(STAGE_CACHE_DIR, "report.json")
+PIPELINE_STATE_PATH = os.path.join(STAGE_CACHE_DIR, "pipeline_state.json")
@@ -10,6 +10,6 @@ else
     echo "WARNING: Application may not work correctly without a trained model"
 fi
 
-# Run the application
-echo "Starting the application..."
-exec python /app/application.py
\ No newline at end of file
+# Run the application (WORKERS > 1 serves from a shared memory-mapped model)
+echo "Starting the application with ${WORKERS:-1} worker(s)..."
+exec python /app/application.py --workers "${WORKERS:-1}"
\ No newline at end of file
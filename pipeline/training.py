@@ -1,28 +1,112 @@
 import sys
+import argparse
+import functools
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 
 
+import mlflow
 from src.data_ingestion import DataIngestion
 from src.data_preprocessing import DataProcessor
 from src.model_training import ModelTraining
-from utils.common_functions import read_yaml_file
+from src.stage_cache import StageCache
+from src.pipeline_runner import PipelineRunner, Stage
+from src.balancing import training_class_weight
+from utils.common_functions import read_yaml_file, write_json_file
 from config.paths_config import *
+from config.model_params import *
 
+STAGES = ["ingestion", "processing", "training", "export", "tracking"]
+
+
+def build_stages(config):
+    incremental = config["data_ingestion"].get("mode") == "incremental"
 
-if __name__=="__main__":
     ### 1. Data Ingestion
 
-    data_ingestion = DataIngestion(read_yaml_file(CONFIG_PATH))
-    data_ingestion.initiate_data_ingestion()
+    data_ingestion = DataIngestion(config)
+    ingestion = Stage(
+        "ingestion",
+        data_ingestion.initiate_data_ingestion,
+        outputs=[TRAIN_FILE_PATH, TEST_FILE_PATH] + ([RAW_FILE_PATH] if data_ingestion.mode == "full" else []),
+        # Looked up when the stage runs, so a failing lookup of the source is retried with it
+        config=lambda: {"data_ingestion": config["data_ingestion"], "source": data_ingestion.get_storage().stat(data_ingestion.bucket_file_name)},
+        code=["src/data_ingestion.py", "src/object_storage.py", "utils/common_functions.py"],
+        # Incremental ingestion only pulls new rows, tracked by its own watermark
+        cached=not incremental
+    )
 
     ### 2. Data Processing
 
     processor = DataProcessor(TRAIN_FILE_PATH,TEST_FILE_PATH,PROCESSED_DIR,CONFIG_PATH)
-    processor.process()
+    processing = Stage(
+        "processing",
+        processor.process,
+        deps=["ingestion"],
+        inputs=[RAW_PARTITIONS_DIR] if incremental else [TRAIN_FILE_PATH, TEST_FILE_PATH],
+        outputs=[PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, LABEL_MAPPINGS_PATH, PREPROCESSOR_PATH],
+        config={"data_processing": config["data_processing"], "incremental": incremental},
+        code=["src/data_preprocessing.py", "src/preprocessing.py", "src/dtype_plan.py", "src/feature_selection.py", "src/balancing.py", "utils/common_functions.py"]
+    )
 
     ### 3. Model Training
 
-    trainer = ModelTraining(PROCESSED_TRAIN_DATA_PATH,PROCESSED_TEST_DATA_PATH,MODEL_OUTPUT_PATH)
-    trainer.run()
\ No newline at end of file
+    class_weight = training_class_weight(config["data_processing"].get("balancing", {}))
+    trainer = ModelTraining(PROCESSED_TRAIN_DATA_PATH,PROCESSED_TEST_DATA_PATH,MODEL_OUTPUT_PATH,COMPILED_MODEL_DIR,MODEL_BUNDLE_DIR,class_weight)
+    training = Stage(
+        "training",
+        # The trees are compiled by the export stage, next to the MLflow logging
+        functools.partial(trainer.train, compile_model=False),
+        deps=["processing"],
+        inputs=[PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, LABEL_MAPPINGS_PATH, PREPROCESSOR_PATH],
+        outputs=[MODEL_OUTPUT_PATH, MODEL_BUNDLE_DIR, TRAINING_SUMMARY_PATH],
+        config={"params": LIGHTGM_PARAMS, "search": RANDOM_SEARCH_PARAMS, "out_of_core": OUT_OF_CORE_PARAMS, "class_weight": class_weight},
+        code=["src/model_training.py", "src/hyperparameter_search.py", "src/out_of_core.py", "src/model_bundle.py", "utils/common_functions.py"]
+    )
+
+    ### 4. Export and tracking, independent of each other once the model is saved
+
+    export = Stage(
+        "export",
+        trainer.export_compiled_model,
+        deps=["training"],
+        inputs=[MODEL_BUNDLE_DIR],
+        outputs=[COMPILED_MODEL_DIR],
+        code=["src/tree_engine.py", "src/model_bundle.py"]
+    )
+    tracking = Stage(
+        "tracking",
+        trainer.track,
+        deps=["training"],
+        inputs=[PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, MODEL_OUTPUT_PATH, MODEL_BUNDLE_DIR, TRAINING_SUMMARY_PATH],
+        # A new tracking store gets its own run
+        config=lambda: {"tracking_uri": mlflow.get_tracking_uri()},
+        code=["src/model_training.py", "src/mlflow_logger.py"]
+    )
+
+    return [ingestion, processing, training, export, tracking]
+
+
+def run_pipeline(force=(), resume=False, workers=2, retries=2):
+    config = read_yaml_file(CONFIG_PATH)
+    cache = StageCache(STAGE_CACHE_DIR, force=force)
+    runner = PipelineRunner(build_stages(config), cache=cache, max_workers=workers, retries=retries, state_path=PIPELINE_STATE_PATH)
+    try:
+        runner.run(resume=resume)
+    finally:
+        print(runner.format_report())
+        write_json_file(runner.report, STAGE_REPORT_PATH)
+    return runner.report
+
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Run the training pipeline, reusing cached stages whose inputs are unchanged")
+    parser.add_argument("--force", nargs="*", choices=STAGES, metavar="STAGE",
+                        help=f"Re-run these stages even if cached, or every stage when none are given ({', '.join(STAGES)})")
+    parser.add_argument("--resume", action="store_true", help="Skip the stages that finished before the last run failed")
+    parser.add_argument("--workers", type=int, default=2, help="Stages run at the same time when their dependencies allow it")
+    parser.add_argument("--retries", type=int, default=2, help="Retries of a stage that failed with a transient I/O error")
+    args = parser.parse_args()
+
+    run_pipeline(force=True if args.force == [] else set(args.force or ()), resume=args.resume, workers=args.workers, retries=args.retries)
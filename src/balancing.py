@@ -0,0 +1,27 @@
+import numpy as np
+
+# smote: synthesize minority rows, undersample: drop majority rows,
+# class_weight: keep every row and weight the classes in LightGBM instead, none: keep every row
+STRATEGIES = ["smote", "undersample", "class_weight", "none"]
+
+
+def smote_resample(X, y, k_neighbors=5, n_jobs=-1, random_state=42):
+    from imblearn.over_sampling import SMOTE
+    from sklearn.neighbors import NearestNeighbors
+
+    # SMOTE no longer takes n_jobs, the neighbour search it spends its time in does
+    neighbors = NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=n_jobs)
+    return SMOTE(k_neighbors=neighbors, random_state=random_state).fit_resample(X, y)
+
+
+def undersample_indices(y, random_state=42):
+    # Every class keeps as many rows as the smallest one; positions stay in their original order
+    rng = np.random.default_rng(random_state)
+    classes, counts = np.unique(y, return_counts=True)
+    keep = [rng.choice(np.flatnonzero(y == label), counts.min(), replace=False) for label in classes]
+    return np.sort(np.concatenate(keep))
+
+
+def training_class_weight(settings):
+    # What ModelTraining passes to LightGBM for a balancing config
+    return "balanced" if settings.get("strategy") == "class_weight" else None
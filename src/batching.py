@@ -0,0 +1,95 @@
+import asyncio
+from src.inference import build_feature_matrix
+
+
+# Collects concurrent single-row predictions into one vectorized model call.
+# A batch is cut after max_wait_ms or once max_batch_size rows are queued, and
+# predict_fn(features) -> (predictions, probabilities) runs off the event loop,
+# through runner(fn, *args) when given (e.g. InferencePool.run).
+# featurize(rows) turns the queued rows into the model's feature matrix.
+class MicroBatcher:
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5, runner=None, featurize=build_feature_matrix):
+        self.predict_fn = predict_fn
+        self.featurize = featurize
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.runner = runner
+
+        self.batches = 0
+        self.rows = 0
+        self.last_batch_size = 0
+
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, row):
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "rows": self.rows,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "avg_batch_fill": self.rows / (self.batches * self.max_batch_size) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000
+        }
+
+    def _ensure_worker(self):
+        # The worker is bound to the loop that first submits to it
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            rows = [row for row, _ in batch]
+            futures = [future for _, future in batch]
+
+            try:
+                features = self.featurize(rows)
+                if self.runner is not None:
+                    predictions, probabilities = await self.runner(self.predict_fn, features)
+                else:
+                    predictions, probabilities = await self._loop.run_in_executor(None, self.predict_fn, features)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            self.last_batch_size = len(batch)
+
+            for i, future in enumerate(futures):
+                if not future.done():
+                    future.set_result((predictions[i], probabilities[i] if probabilities is not None else None))
@@ -4,55 +4,181 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from google.cloud import storage
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.object_storage import get_storage
 from config.paths_config import *
-from utils.common_functions import read_yaml_file
+from utils.common_functions import read_yaml_file,read_json_file,write_json_file,save_data,ChunkedDataWriter
 
 logger = get_logger(__name__)
 
+# Granularity of the hash split: a row goes to train when its bucket is below train_ratio * HASH_BUCKETS
+HASH_BUCKETS = 10000
+
 class DataIngestion:
-    def __init__(self,config):
+    def __init__(self,config,raw_dir=RAW_DIR):
         self.config = config["data_ingestion"]
         self.bucket_name = self.config["bucket_name"]
         self.bucket_file_name = self.config["bucket_file_name"]
         self.train_test_ratio = self.config["train_ratio"]
+        self.mode = self.config.get("mode", "full")
+        self.chunk_size = self.config.get("chunk_size", 50000)
+        self.split_key = self.config.get("split_key", "Booking_ID")
+        self.watermark_column = self.config.get("watermark_column", "Booking_ID")
+        self.partition_by = self.config.get("partition_by", ["arrival_year", "arrival_month"])
+        # Label and key columns are read and written as text, so chunks that happen to
+        # leave one of them empty do not change its type halfway through a file
+        categorical_columns = config.get("data_processing", {}).get("categorical_columns", [])
+        self.text_columns = list(dict.fromkeys([*categorical_columns, self.split_key, self.watermark_column]))
+
+        self.raw_file_path = os.path.join(raw_dir, os.path.basename(RAW_FILE_PATH))
+        self.train_file_path = os.path.join(raw_dir, os.path.basename(TRAIN_FILE_PATH))
+        self.test_file_path = os.path.join(raw_dir, os.path.basename(TEST_FILE_PATH))
+        self.partitions_dir = os.path.join(raw_dir, os.path.basename(RAW_PARTITIONS_DIR))
+        self.state_path = os.path.join(raw_dir, os.path.basename(INGESTION_STATE_PATH))
 
-        os.makedirs(RAW_DIR,exist_ok=True)
+        os.makedirs(raw_dir,exist_ok=True)
+        self.storage = None
 
         logger.info(f"Data Ingestion is started for {self.bucket_name} and {self.bucket_file_name} ")
         
     
+    def get_storage(self):
+        if self.storage is None:
+            self.storage = get_storage(self.config)
+        return self.storage
+
     def download_csv_from_gcp(self):
         try:
-            client = storage.Client()
-            bucket = client.bucket(self.bucket_name)
-            blob = bucket.blob(self.bucket_file_name)
-            blob.download_to_filename(RAW_FILE_PATH)
-            logger.info(f"Successfully downloaded the csv file from {self.bucket_name} to {RAW_FILE_PATH}")
+            self.get_storage().download(self.bucket_file_name, self.raw_file_path)
+            logger.info(f"Successfully downloaded the csv file from {self.bucket_name} to {self.raw_file_path}")
 
         except Exception as e:
-            logger.error(f"Error while downloading the csv file from {self.bucket_name} to {RAW_FILE_PATH}: {e}")
+            logger.error(f"Error while downloading the csv file from {self.bucket_name} to {self.raw_file_path}: {e}")
             raise CustomException("Error while downloading the csv file from GCP", e)
         
     def split_data_into_train_test(self):
         try:
             logger.info(f"Splitting the data into train and test sets")
-            df = pd.read_csv(RAW_FILE_PATH)
+            df = pd.read_csv(self.raw_file_path)
             train_df, test_df = train_test_split(df, test_size=1-self.train_test_ratio, random_state=42)
-            train_df.to_csv(TRAIN_FILE_PATH, index=False)
-            test_df.to_csv(TEST_FILE_PATH, index=False)
-            logger.info(f"Successfully split the data into train and test sets and saved to {TRAIN_FILE_PATH} and {TEST_FILE_PATH}")
+            save_data(train_df, self.train_file_path)
+            save_data(test_df, self.test_file_path)
+            logger.info(f"Successfully split the data into train and test sets and saved to {self.train_file_path} and {self.test_file_path}")
         except Exception as e:
             logger.error(f"Error while splitting the data into train and test sets: {e}")
             raise CustomException("Error while splitting the data into train and test sets", e)     
+
+    def is_train_row(self, keys):
+        # Hashing the key (not the row position) keeps a booking on the same side of the
+        # split regardless of chunk size, file order or rows added later
+        buckets = pd.util.hash_pandas_object(keys.astype(str), index=False).to_numpy() % HASH_BUCKETS
+        return buckets < self.train_test_ratio * HASH_BUCKETS
+
+    def stream_split_from_storage(self):
+        try:
+            logger.info(f"Streaming {self.bucket_file_name} in chunks of {self.chunk_size} rows")
+            train_writer = ChunkedDataWriter(self.train_file_path, self.text_columns)
+            test_writer = ChunkedDataWriter(self.test_file_path, self.text_columns)
+
+            # Only one chunk is held in memory; outputs are appended and renamed once complete
+            try:
+                with self.get_storage().open(self.bucket_file_name) as source:
+                    for chunk in pd.read_csv(source, chunksize=self.chunk_size, dtype=dict.fromkeys(self.text_columns, str)):
+                        if self.split_key not in chunk.columns:
+                            raise CustomException("Missing split key", f"{self.split_key} column not found in {self.bucket_file_name}")
+                        is_train = self.is_train_row(chunk[self.split_key])
+                        train_writer.write(chunk[is_train])
+                        test_writer.write(chunk[~is_train])
+            except Exception:
+                train_writer.abort()
+                test_writer.abort()
+                raise
+
+            train_writer.close()
+            test_writer.close()
+            rows = {"train": train_writer.rows, "test": test_writer.rows}
+            logger.info(f"Streamed {rows['train']} train and {rows['test']} test rows to {self.train_file_path} and {self.test_file_path}")
+            return rows
+        except Exception as e:
+            logger.error(f"Error while streaming the data into train and test sets: {e}")
+            raise CustomException("Error while streaming the data into train and test sets", e)
         
+    def booking_numbers(self, keys):
+        # INN00042 -> 42, so the watermark keeps working once IDs outgrow their zero padding
+        return keys.astype(str).str.extract(r"(\d+)$", expand=False).astype("int64")
+
+    def partition_path(self, split, values, run_id):
+        partition = "-".join(f"{int(value):02d}" for value in values)
+        return os.path.join(self.partitions_dir, f"split={split}", f"arrival={partition}", f"part-{run_id}.{ARTIFACT_FORMAT}")
+
+    def ingest_new_rows(self):
+        try:
+            state = read_json_file(self.state_path) if os.path.exists(self.state_path) else {}
+            source = self.get_storage().stat(self.bucket_file_name)
+            if state.get("source") == source:
+                logger.info(f"{self.bucket_file_name} is unchanged since the last run, nothing to ingest")
+                return {"train": 0, "test": 0}
+
+            watermark = state.get("watermark")
+            logger.info(f"Ingesting rows of {self.bucket_file_name} with {self.watermark_column} above {watermark}")
+
+            # Part files are named after the source generation, so a failed run that is
+            # retried overwrites its own parts instead of appending the same rows twice
+            run_id = source["generation"]
+            writers = {}
+            rows = {"train": 0, "test": 0}
+            new_watermark = watermark
+            try:
+                with self.get_storage().open(self.bucket_file_name) as source_file:
+                    for chunk in pd.read_csv(source_file, chunksize=self.chunk_size, dtype=dict.fromkeys(self.text_columns, str)):
+                        numbers = self.booking_numbers(chunk[self.watermark_column])
+                        # Every chunk is compared with the last run's watermark; the source need not be sorted
+                        if watermark is not None:
+                            chunk, numbers = chunk[numbers > watermark], numbers[numbers > watermark]
+                        if chunk.empty:
+                            continue
+                        new_watermark = max(int(numbers.max()), new_watermark or 0)
+
+                        # groupby would drop these rows while the watermark moves past them
+                        missing = chunk[self.partition_by].isna().any(axis=1)
+                        if missing.any():
+                            raise CustomException("Missing partition key", f"{int(missing.sum())} rows have no {'/'.join(self.partition_by)}, e.g. {chunk.loc[missing, self.watermark_column].iloc[0]}")
+
+                        is_train = self.is_train_row(chunk[self.split_key])
+                        for split, rows_in_split in (("train", chunk[is_train]), ("test", chunk[~is_train])):
+                            for values, group in rows_in_split.groupby(self.partition_by, sort=False):
+                                path = self.partition_path(split, values, run_id)
+                                if path not in writers:
+                                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                                    writers[path] = ChunkedDataWriter(path, self.text_columns)
+                                writers[path].write(group)
+                            rows[split] += len(rows_in_split)
+            except Exception:
+                for writer in writers.values():
+                    writer.abort()
+                raise
+
+            for writer in writers.values():
+                writer.close()
+            # The watermark only moves once every new part is in place
+            write_json_file({"source": source, "watermark": new_watermark, "rows": rows, "partitions": len(writers)}, self.state_path)
+            logger.info(f"Appended {rows['train']} train and {rows['test']} test rows to {len(writers)} partitions, watermark {new_watermark}")
+            return rows
+        except Exception as e:
+            logger.error(f"Error while ingesting new rows: {e}")
+            raise CustomException("Error while ingesting new rows", e)
+
     def initiate_data_ingestion(self):
         try:
             logger.info(f"Initiating the data ingestion")
-            self.download_csv_from_gcp()
-            self.split_data_into_train_test()
+            if self.mode == "incremental":
+                self.ingest_new_rows()
+            elif self.mode == "streaming":
+                self.stream_split_from_storage()
+            else:
+                self.download_csv_from_gcp()
+                self.split_data_into_train_test()
             logger.info(f"Data ingestion is completed")
         except CustomException as e:
             logger.error(f"Error while initiating the data ingestion: {str(e)}")
@@ -1,4 +1,7 @@
 import os
+import glob
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import sys
@@ -7,74 +10,129 @@ sys.path.append(str(Path(__file__).parent.parent))
 from src.logger import get_logger
 from src.custom_exception import CustomException
 from config.paths_config import *
-from utils.common_functions import read_yaml_file,load_data
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-from imblearn.over_sampling import SMOTE
+from utils.common_functions import read_yaml_file,read_json_file,write_json_file,load_data,save_data,frame_memory_mb
+from src.preprocessing import BookingPreprocessor
+from src.dtype_plan import DtypePlan
+from src.feature_selection import rank_features
+from src.balancing import STRATEGIES, smote_resample, undersample_indices
 
 logger = get_logger(__name__)
 
 class DataProcessor:
 
-    def __init__(self, train_path, test_path, processed_dir, config_path):
+    def __init__(self, train_path, test_path, processed_dir, config_path, partitions_dir=RAW_PARTITIONS_DIR):
         self.train_path = train_path
         self.test_path = test_path
         self.processed_dir = processed_dir
+        self.partitions_dir = partitions_dir
+        self.processed_partitions_dir = os.path.join(processed_dir, os.path.basename(PROCESSED_PARTITIONS_DIR))
+        self.state_path = os.path.join(processed_dir, os.path.basename(PROCESSING_STATE_PATH))
 
         self.config = read_yaml_file(config_path)
+        self.label_mappings = {}
+        self.preprocessor = None
+        # Lean dtypes for the configured columns, applied when the raw data is loaded
+        self.dtype_plan = DtypePlan.from_config(self.config) if self.config["data_processing"].get("optimize_dtypes", True) else None
+        # DataFrame memory in MB per processing stage and split
+        self.memory_report = {}
 
         if not os.path.exists(self.processed_dir):
             os.makedirs(self.processed_dir)
         
     
-    def preprocess_data(self,df):
+    def worker_pool(self):
+        # Process pool for the independent per-split and per-column work, None when parallel processing is off
+        settings = self.config["data_processing"].get("parallel", {})
+        if not settings.get("enabled"):
+            return contextlib.nullcontext()
+        return ProcessPoolExecutor(max_workers=settings.get("workers") or os.cpu_count())
+
+    def drop_columns(self, df):
+        logger.info("Dropping the columns")
+        # Not inplace: the caller's frame stays as it was loaded
+        return df.drop(columns=['Booking_ID']).drop_duplicates()
+
+    def fit_preprocessor(self, df, executor=None):
+        logger.info("Fitting label encoding and skewness handling")
+        self.preprocessor = BookingPreprocessor.fit(
+            df,
+            self.config["data_processing"]["categorical_columns"],
+            self.config["data_processing"]["numerical_columns"],
+            self.config["data_processing"]["skewness_threshold"],
+            executor=executor
+        )
+        logger.info("Label Mappings are : ")
+        for col,mapping in self.preprocessor.mappings.items():
+            logger.info(f"{col} : {mapping}")
+        logger.info(f"Applying log1p to {self.preprocessor.log1p_columns}")
+        self.label_mappings = self.preprocessor.mappings
+
+    def preprocess_data(self,df,executor=None):
         try:
             logger.info("Starting our Data Processing step")
+            df = self.drop_columns(df)
 
-            logger.info("Dropping the columns")
-            df.drop(columns=['Booking_ID'] , inplace=True)
-            df.drop_duplicates(inplace=True)
+            # Fitted on the first (training) split, every later split reuses its encoding
+            if self.preprocessor is None:
+                self.fit_preprocessor(df, executor)
 
-            cat_cols = self.config["data_processing"]["categorical_columns"]
-            num_cols = self.config["data_processing"]["numerical_columns"]
-
-            logger.info("Applying Label Encoding")
-
-            label_encoder = LabelEncoder()
-            mappings={}
-
-            for col in cat_cols:
-                df[col] = label_encoder.fit_transform(df[col])
-                mappings[col] = {label:code for label,code in zip(label_encoder.classes_ , label_encoder.transform(label_encoder.classes_))}
-
-            logger.info("Label Mappings are : ")
-            for col,mapping in mappings.items():
-                logger.info(f"{col} : {mapping}")
-
-            logger.info("Doing Skewness Handling")
-
-            skew_threshold = self.config["data_processing"]["skewness_threshold"]
-            skewness = df[num_cols].apply(lambda x:x.skew())
-
-            for column in skewness[skewness>skew_threshold].index:
-                df[column] = np.log1p(df[column])
-
-            return df
+            return self.preprocessor.transform(df, executor)
         
         except Exception as e:
             logger.error(f"Error during preprocess step {e}")
             raise CustomException("Error while preprocess data", e)
+
+    def preprocess_splits(self, train_df, test_df, executor=None):
+        # Train fits the preprocessor, then the column tasks of both splits are queued
+        # together, so test columns do not wait for the last train column
+        if executor is None:
+            train_df = self.preprocess_data(train_df)
+            return train_df, self.preprocess_data(test_df)
+        try:
+            logger.info("Starting our Data Processing step on both splits in parallel")
+            splits = [self.drop_columns(train_df), self.drop_columns(test_df)]
+            self.fit_preprocessor(splits[0], executor)
+            pending = []
+            for df in splits:
+                columns = self.preprocessor.columns_to_transform(df)
+                pending.append((df, columns, executor.map(self.preprocessor.transform_column, columns, [df[col].to_numpy() for col in columns])))
+            return tuple(df.assign(**dict(zip(columns, values))) for df, columns, values in pending)
+        except Exception as e:
+            logger.error(f"Error during parallel preprocess step {e}")
+            raise CustomException("Error while preprocess data", e)
         
     def balance_data(self,df):
         try:
-            logger.info("Handling Imbalanced Data")
-            X = df.drop(columns='booking_status')
-            y = df["booking_status"]
-
-            smote = SMOTE(random_state=42)
-            X_resampled , y_resampled = smote.fit_resample(X,y)
-
-            balanced_df = pd.DataFrame(X_resampled , columns=X.columns)
+            settings = self.config["data_processing"].get("balancing", {})
+            strategy = settings.get("strategy", "smote")
+            logger.info(f"Handling Imbalanced Data with {strategy}")
+
+            if strategy in ("none", "class_weight"):
+                # class_weight keeps the rows, ModelTraining weights the classes instead
+                return df
+            if strategy == "undersample":
+                return df.iloc[undersample_indices(df["booking_status"].to_numpy(), settings.get("random_state", 42))]
+            if strategy != "smote":
+                raise ValueError(f"Unknown balancing strategy {strategy}, expected one of {STRATEGIES}")
+
+            # One float32 matrix goes through SMOTE and is wrapped without another copy
+            columns = [col for col in df.columns if col != "booking_status"]
+            X_resampled , y_resampled = smote_resample(
+                df[columns].to_numpy(dtype=np.float32),
+                df["booking_status"].to_numpy(),
+                k_neighbors=settings.get("k_neighbors", 5),
+                n_jobs=settings.get("n_jobs", -1),
+                random_state=settings.get("random_state", 42)
+            )
+
+            # Synthetic rows interpolate between neighbours; integer columns (codes, counts, dates)
+            # are truncated back to whole values as imblearn does when it restores DataFrame dtypes
+            for i, col in enumerate(columns):
+                if pd.api.types.is_integer_dtype(df[col]):
+                    np.trunc(X_resampled[:, i], out=X_resampled[:, i])
+
+            # Back to the column dtypes of the input, one column at a time from the float32 matrix
+            balanced_df = pd.DataFrame(X_resampled , columns=columns, copy=False).astype(df[columns].dtypes.to_dict())
             balanced_df["booking_status"] = y_resampled
 
             logger.info("Data balanced sucesffuly")
@@ -84,6 +142,9 @@ class DataProcessor:
             logger.error(f"Error during balancing data step {e}")
             raise CustomException("Error while balancing data", e)
     
+    def balance_test(self):
+        return self.config["data_processing"].get("balancing", {}).get("balance_test", False)
+
     def select_features(self,df):
         try:
             logger.info("Starting our Feature selection step")
@@ -91,22 +152,15 @@ class DataProcessor:
             X = df.drop(columns='booking_status')
             y = df["booking_status"]
 
-            model =  RandomForestClassifier(random_state=42)
-            model.fit(X,y)
-
-            feature_importance = model.feature_importances_
-
-            feature_importance_df = pd.DataFrame({
-                        'feature':X.columns,
-                        'importance':feature_importance
-                            })
-            top_features_importance_df = feature_importance_df.sort_values(by="importance" , ascending=False)
+            # Strategy and its settings come from data_processing.feature_selection
+            settings = self.config["data_processing"].get("feature_selection", {})
+            ranking, elapsed = rank_features(X, y, settings)
 
             num_features_to_select = self.config["data_processing"]["no_of_features"]
 
-            top_10_features = top_features_importance_df["feature"].head(num_features_to_select).values
+            top_10_features = ranking.index[:num_features_to_select]
 
-            logger.info(f"Features selected : {top_10_features}")
+            logger.info(f"Features selected : {top_10_features.tolist()} ({settings.get('strategy', 'random_forest')}, {elapsed:.2f}s)")
 
             top_10_df = df[top_10_features.tolist() + ["booking_status"]]
 
@@ -118,11 +172,15 @@ class DataProcessor:
             logger.error(f"Error during feature selection step {e}")
             raise CustomException("Error while feature selection", e)
     
+    def record_memory(self, stage, **splits):
+        self.memory_report[stage] = {split: frame_memory_mb(df) for split, df in splits.items()}
+        logger.info(f"Memory after {stage}: " + ", ".join(f"{split} {mb:.2f} MB" for split, mb in self.memory_report[stage].items()))
+
     def save_data(self,df , file_path):
         try:
             logger.info("Saving our data in processed folder")
 
-            df.to_csv(file_path, index=False)
+            save_data(df, file_path)
 
             logger.info(f"Data saved sucesfuly to {file_path}")
 
@@ -130,21 +188,181 @@ class DataProcessor:
             logger.error(f"Error during saving data step {e}")
             raise CustomException("Error while saving data", e)
 
-    def process(self):
+    def save_preprocessor(self, train_df, file_path):
+        # The selected feature order is only known once feature selection ran
+        self.preprocessor.feature_columns = [col for col in train_df.columns if col != self.preprocessor.target_column]
+        self.preprocessor.save(file_path)
+        logger.info(f"Preprocessor saved to {file_path}")
+
+    def process_partition(self, paths, output_path, mappings):
+        # Independent of every other partition, so it can run in a worker process
+        df = self.encode_partition(pd.concat([load_data(path) for path in paths], ignore_index=True), mappings)
+        save_data(df, output_path)
+        return len(df), self.column_moments(df[self.config["data_processing"]["numerical_columns"]])
+
+    def encode_partition(self, df, mappings):
+        if self.dtype_plan:
+            df = self.dtype_plan.apply(df)
+        return BookingPreprocessor(mappings).transform(df.drop(columns=["Booking_ID"]).drop_duplicates())
+
+    def extend_label_mappings(self, mappings, paths):
+        # Unseen categories get the next free codes, so partitions encoded earlier stay valid.
+        # On the first run this gives the same sorted codes as LabelEncoder.
+        cat_cols = self.config["data_processing"]["categorical_columns"]
+        seen = {col: set() for col in cat_cols}
+        for path in paths:
+            df = load_data(path, columns=cat_cols)
+            for col in cat_cols:
+                seen[col].update(df[col].unique().tolist())
+
+        for col in cat_cols:
+            mapping = mappings.setdefault(col, {})
+            for label in sorted(label for label in seen[col] if str(label) not in mapping):
+                mapping[str(label)] = len(mapping)
+        return mappings
+
+    @staticmethod
+    def column_moments(df):
+        # Count, mean and central moment sums, which combine exactly across partitions
+        values = df.to_numpy(dtype=np.float64)
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return {
+            col: [len(values), float(mean[i]), float((centered[:, i] ** 2).sum()), float((centered[:, i] ** 3).sum())]
+            for i, col in enumerate(df.columns)
+        }
+
+    @staticmethod
+    def combined_skewness(moments):
+        n, mean, m2, m3 = 0, 0.0, 0.0, 0.0
+        for n_b, mean_b, m2_b, m3_b in moments:
+            if n_b == 0:
+                continue
+            total = n + n_b
+            delta = mean_b - mean
+            m3 = (m3 + m3_b + delta ** 3 * n * n_b * (n - n_b) / total ** 2
+                  + 3 * delta * (n * m2_b - n_b * m2) / total)
+            m2 = m2 + m2_b + delta ** 2 * n * n_b / total
+            mean = mean + delta * n_b / total
+            n = total
+        # Same bias-adjusted estimator as pandas.Series.skew
+        if n < 3 or m2 <= 1e-14 * max(1.0, mean ** 2) * n:
+            return 0.0
+        return float(np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5)
+
+    def process_partitions(self):
         try:
-            logger.info("Loading data from RAW directory")
+            logger.info(f"Processing changed partitions under {self.partitions_dir}")
+            state = read_json_file(self.state_path) if os.path.exists(self.state_path) else {"partitions": {}}
+            num_cols = self.config["data_processing"]["numerical_columns"]
 
-            train_df = load_data(self.train_path)
-            test_df = load_data(self.test_path)
+            # A partition is reprocessed when its set of part files changed since the last run
+            partitions = {}
+            changed = []
+            for split in ("train", "test"):
+                for partition_dir in sorted(glob.glob(os.path.join(self.partitions_dir, f"split={split}", "arrival=*"))):
+                    key = f"{split}/{os.path.basename(partition_dir).split('=', 1)[1]}"
+                    paths = sorted(path for path in glob.glob(os.path.join(partition_dir, "part-*")) if not path.endswith(".tmp"))
+                    fingerprint = [[os.path.basename(path), os.path.getsize(path)] for path in paths]
+                    output_path = os.path.join(self.processed_partitions_dir, f"{key}.{ARTIFACT_FORMAT}")
+                    partitions[key] = output_path
+                    cached = state["partitions"].get(key)
+                    if cached is None or cached["fingerprint"] != fingerprint or not os.path.exists(output_path):
+                        changed.append((key, paths, fingerprint, output_path))
+
+            if not partitions:
+                raise CustomException("No partitions found", f"{self.partitions_dir} has no ingested data")
+            logger.info(f"{len(changed)} of {len(partitions)} partitions changed")
+
+            mappings = self.extend_label_mappings(state.get("label_mappings", {}), [path for _, paths, _, _ in changed for path in paths])
+            with self.worker_pool() as pool:
+                results = (pool.map if pool else map)(
+                    self.process_partition,
+                    [paths for _, paths, _, _ in changed],
+                    [output_path for _, _, _, output_path in changed],
+                    [mappings] * len(changed)
+                )
+                for (key, _, fingerprint, _), (rows, moments) in zip(changed, results):
+                    state["partitions"][key] = {"fingerprint": fingerprint, "rows": rows, "moments": moments}
+            state["partitions"] = {key: value for key, value in state["partitions"].items() if key in partitions}
+
+            self.label_mappings = mappings
+            write_json_file(mappings, os.path.join(self.processed_dir, os.path.basename(LABEL_MAPPINGS_PATH)))
+
+            splits = {}
+            duplicates = {}
+            for split in ("train", "test"):
+                keys = sorted(key for key in partitions if key.startswith(f"{split}/"))
+                df = pd.concat([load_data(partitions[key]) for key in keys], ignore_index=True)
+                # Each partition is deduplicated on its own; a booking repeated in another
+                # partition or ingestion run is only caught on the whole split, as in full mode
+                splits[split] = df.drop_duplicates(ignore_index=True)
+                duplicates[split] = len(df) - len(splits[split])
+            logger.info(f"Dropped {duplicates['train']} train and {duplicates['test']} test rows duplicated across partitions")
+
+            # Skewness comes from the stored moments, unless cross-partition duplicates were
+            # dropped from them. Both splits get the log1p columns picked from the training split.
+            skew_threshold = self.config["data_processing"]["skewness_threshold"]
+            train_keys = sorted(key for key in partitions if key.startswith("train/"))
+            train_moments = (
+                [self.column_moments(splits["train"][num_cols])] if duplicates["train"]
+                else [state["partitions"][key]["moments"] for key in train_keys]
+            )
+            log1p_columns = [
+                column for column in num_cols
+                if self.combined_skewness([moments[column] for moments in train_moments]) > skew_threshold
+            ]
+            self.preprocessor = BookingPreprocessor(mappings, log1p_columns)
+            # Encoding already happened per partition, only the log1p step is left
+            splits = {split: BookingPreprocessor({}, log1p_columns).transform(df) for split, df in splits.items()}
+
+            self.record_memory("preprocessing", **splits)
+            train_df = self.select_features(self.balance_data(splits["train"]))
+            test_df = (self.balance_data(splits["test"]) if self.balance_test() else splits["test"])[train_df.columns]
+            self.record_memory("feature selection", train=train_df, test=test_df)
+            self.save_preprocessor(train_df, os.path.join(self.processed_dir, os.path.basename(PREPROCESSOR_PATH)))
+
+            self.save_data(train_df, os.path.join(self.processed_dir, os.path.basename(PROCESSED_TRAIN_DATA_PATH)))
+            self.save_data(test_df, os.path.join(self.processed_dir, os.path.basename(PROCESSED_TEST_DATA_PATH)))
+
+            state["label_mappings"] = mappings
+            write_json_file(state, self.state_path)
+            logger.info("Partitioned data processing completed sucesfully")
+            return [key for key, _, _, _ in changed]
+        except Exception as e:
+            logger.error(f"Error during partitioned preprocessing {e}")
+            raise CustomException("Error while processing partitions", e)
 
-            train_df = self.preprocess_data(train_df)
-            test_df = self.preprocess_data(test_df)
+    def process(self):
+        if self.config["data_ingestion"].get("mode") == "incremental":
+            return self.process_partitions()
+        try:
+            logger.info("Loading data from RAW directory")
 
-            train_df = self.balance_data(train_df)
-            test_df = self.balance_data(test_df)
+            train_df = load_data(self.train_path, dtype_plan=self.dtype_plan)
+            test_df = load_data(self.test_path, dtype_plan=self.dtype_plan)
+            self.record_memory("loading", train=train_df, test=test_df)
+
+            self.preprocessor = None
+            with self.worker_pool() as pool:
+                train_df, test_df = self.preprocess_splits(train_df, test_df, pool)
+                # Kept with the model bundle so serving knows how categories were encoded
+                write_json_file(self.label_mappings, LABEL_MAPPINGS_PATH)
+                self.record_memory("preprocessing", train=train_df, test=test_df)
+
+                # Evaluation sees the real class ratio unless balance_test is set
+                if self.balance_test() and pool:
+                    train_df, test_df = [future.result() for future in [pool.submit(self.balance_data, df) for df in (train_df, test_df)]]
+                else:
+                    train_df = self.balance_data(train_df)
+                    if self.balance_test():
+                        test_df = self.balance_data(test_df)
+            self.record_memory("balancing", train=train_df, test=test_df)
 
             train_df = self.select_features(train_df)
             test_df = test_df[train_df.columns]  
+            self.record_memory("feature selection", train=train_df, test=test_df)
+            self.save_preprocessor(train_df, PREPROCESSOR_PATH)
 
             self.save_data(train_df,PROCESSED_TRAIN_DATA_PATH)
             self.save_data(test_df , PROCESSED_TEST_DATA_PATH)
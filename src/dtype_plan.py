@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+
+# Lean dtypes for the booking columns, derived from their roles in config.yaml:
+# categorical columns become pandas categories, integer columns the smallest integer
+# type that holds them and float columns float32. Columns outside the plan are kept.
+class DtypePlan:
+
+    def __init__(self, categorical_columns, numerical_columns):
+        self.categorical_columns = list(categorical_columns)
+        self.numerical_columns = list(numerical_columns)
+
+    @classmethod
+    def from_config(cls, config):
+        settings = config["data_processing"]
+        return cls(settings["categorical_columns"], settings["numerical_columns"])
+
+    def read_dtypes(self):
+        # For pd.read_csv, so labels are parsed straight into categories instead of Python strings
+        return {col: "category" for col in self.categorical_columns}
+
+    def apply(self, df):
+        columns = {}
+        for col in self.categorical_columns:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                columns[col] = df[col].astype("category")
+        for col in self.numerical_columns:
+            if col not in df.columns:
+                continue
+            dtype = df[col].dtype
+            if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                narrowed = pd.to_numeric(df[col], downcast="integer")
+                if narrowed.dtype != dtype:
+                    columns[col] = narrowed
+            elif pd.api.types.is_float_dtype(dtype) and dtype != np.float32:
+                columns[col] = df[col].astype(np.float32)
+        return df.assign(**columns) if columns else df
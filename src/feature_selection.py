@@ -0,0 +1,113 @@
+import time
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+STRATEGIES = ["random_forest", "forest", "lightgbm", "mutual_info"]
+
+
+def stratified_sample(X, y, size, random_state):
+    # size is a row count or a fraction; the class ratio of y is kept
+    if size is None or size >= len(X) or (isinstance(size, float) and size >= 1):
+        return X, y
+    X_sample, _, y_sample, _ = train_test_split(X, y, train_size=size, stratify=y, random_state=random_state)
+    return X_sample, y_sample
+
+
+def random_forest_importance(X, y, params, random_state, n_jobs):
+    from sklearn.ensemble import RandomForestClassifier
+
+    # The original ranking: a default forest on every row, only parallelized
+    model = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs)
+    model.fit(X, y)
+    return model.feature_importances_
+
+
+def forest_importance(X, y, params, random_state, n_jobs):
+    from sklearn.ensemble import RandomForestClassifier
+
+    # Fewer, shallower trees, each grown on a bootstrap subsample
+    model = RandomForestClassifier(
+        n_estimators=params["n_estimators"],
+        max_depth=params["max_depth"],
+        max_samples=params["max_samples"],
+        min_samples_leaf=params["min_samples_leaf"],
+        random_state=random_state,
+        n_jobs=n_jobs
+    )
+    model.fit(X, y)
+    return model.feature_importances_
+
+
+def lightgbm_importance(X, y, params, random_state, n_jobs):
+    import lightgbm as lgb
+
+    X_train, X_valid, y_train, y_valid = train_test_split(
+        X, y, test_size=params["validation_fraction"], stratify=y, random_state=random_state
+    )
+    model = lgb.LGBMClassifier(
+        n_estimators=params["n_estimators"],
+        learning_rate=params["learning_rate"],
+        num_leaves=params["num_leaves"],
+        importance_type="gain",
+        random_state=random_state,
+        n_jobs=n_jobs,
+        verbose=-1
+    )
+    model.fit(X_train, y_train, eval_set=[(X_valid, y_valid)],
+              callbacks=[lgb.early_stopping(params["early_stopping_rounds"], verbose=False)])
+    return model.feature_importances_
+
+
+def mutual_info_importance(X, y, params, random_state, n_jobs):
+    from sklearn.feature_selection import mutual_info_classif
+
+    # Integer columns are scored as discrete, the rest with the nearest-neighbour estimator
+    discrete = np.array([pd.api.types.is_integer_dtype(dtype) for dtype in X.dtypes])
+    return mutual_info_classif(X, y, discrete_features=discrete, random_state=random_state, n_jobs=n_jobs)
+
+
+IMPORTANCE_FUNCTIONS = {
+    "random_forest": random_forest_importance,
+    "forest": forest_importance,
+    "lightgbm": lightgbm_importance,
+    "mutual_info": mutual_info_importance
+}
+
+
+def rank_features(X, y, settings, strategy=None, random_state=None):
+    # Returns the features by decreasing importance and the time the ranking took.
+    # settings is data_processing.feature_selection from config.yaml.
+    try:
+        strategy = strategy or settings.get("strategy", "random_forest")
+        if strategy not in IMPORTANCE_FUNCTIONS:
+            raise ValueError(f"Unknown feature selection strategy {strategy}, expected one of {STRATEGIES}")
+        params = settings.get(strategy) or {}
+        random_state = settings.get("random_state", 42) if random_state is None else random_state
+
+        start = time.perf_counter()
+        X_sample, y_sample = stratified_sample(X, y, params.get("sample_size"), random_state)
+        importance = IMPORTANCE_FUNCTIONS[strategy](X_sample, y_sample, params, random_state, settings.get("n_jobs", -1))
+        importance = pd.Series(importance, index=X.columns)
+        elapsed = time.perf_counter() - start
+
+        # Stable sort, so ties keep the column order
+        ranking = importance.sort_values(ascending=False, kind="stable")
+        logger.info(f"Ranked {X.shape[1]} features with {strategy} on {len(X_sample)} rows in {elapsed:.2f}s")
+        return ranking, elapsed
+    except Exception as e:
+        logger.error(f"Error while ranking features {e}")
+        raise CustomException("Error while ranking features", e)
+
+
+def selection_stability(selections):
+    # Mean pairwise Jaccard similarity of the selected feature sets, 1.0 when every run agrees
+    pairs = list(combinations([set(selection) for selection in selections], 2))
+    if not pairs:
+        return 1.0
+    return float(np.mean([len(a & b) / len(a | b) for a, b in pairs]))
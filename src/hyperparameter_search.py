@@ -0,0 +1,250 @@
+import os
+import math
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score, log_loss
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+# Scoring names as in sklearn: (metric, whether it takes the positive class probability)
+SCORING = {
+    "accuracy": (accuracy_score, False),
+    "f1": (f1_score, False),
+    "precision": (precision_score, False),
+    "recall": (recall_score, False),
+    "roc_auc": (roc_auc_score, True),
+    "neg_log_loss": (lambda y, p: -log_loss(y, p), True)
+}
+
+# Estimator parameters that are not LightGBM parameters; every other sklearn name is an alias
+SKLEARN_ONLY_PARAMS = ("n_estimators", "class_weight", "importance_type")
+
+
+def core_budget(n_cores=None, n_jobs=-1, n_tasks=None):
+    # Splits the cores between parallel search workers and LightGBM threads per model,
+    # so workers * threads never exceeds the budget
+    n_cores = n_cores or os.cpu_count() or 1
+    workers = n_cores if n_jobs is None or n_jobs < 0 else min(n_jobs, n_cores)
+    if n_tasks:
+        workers = min(workers, n_tasks)
+    workers = max(1, workers)
+    return workers, max(1, n_cores // workers)
+
+
+def booster_params(estimator, params=None, threads=None):
+    merged = {**estimator.get_params(), **(params or {})}
+    if threads is not None:
+        merged["n_jobs"] = threads
+    merged = {key: value for key, value in merged.items() if key not in SKLEARN_ONLY_PARAMS and value is not None}
+    merged["objective"] = merged.get("objective") or "binary"
+    merged["verbose"] = -1
+    return merged
+
+
+def class_weights(y, class_weight):
+    # Per-row weights equivalent to LGBMClassifier(class_weight=...)
+    if class_weight is None:
+        return None
+    classes, counts = np.unique(y, return_counts=True)
+    if class_weight == "balanced":
+        weights = len(y) / (len(classes) * counts)
+    else:
+        weights = np.array([class_weight.get(label, 1.0) for label in classes])
+    return weights[np.searchsorted(classes, y)]
+
+
+def build_dataset(X, y, estimator, binary_path=None):
+    # Bins the features once; folds and candidates then train on subsets of it.
+    # feature_pre_filter is off so candidates may still change min_child_samples.
+    import lightgbm as lgb
+
+    params = dict(booster_params(estimator), feature_pre_filter=False)
+    start = time.perf_counter()
+    if binary_path and os.path.exists(binary_path):
+        dataset = lgb.Dataset(binary_path, params=params).construct()
+        logger.info(f"Loaded the binned training data from {binary_path}")
+    else:
+        weight = class_weights(np.asarray(y), estimator.get_params().get("class_weight"))
+        dataset = lgb.Dataset(X, label=y, weight=weight, params=params).construct()
+        if binary_path:
+            os.makedirs(os.path.dirname(binary_path) or ".", exist_ok=True)
+            dataset.save_binary(f"{binary_path}.tmp")
+            os.replace(f"{binary_path}.tmp", binary_path)
+            logger.info(f"Saved the binned training data to {binary_path}")
+    logger.info(f"Built the LightGBM dataset ({dataset.num_data()} rows) in {time.perf_counter() - start:.2f}s")
+    return dataset
+
+
+def score_booster(booster, X, y, scoring):
+    metric, uses_probability = SCORING[scoring]
+    probability = booster.predict(X, num_iteration=booster.best_iteration or None)
+    return metric(y, probability if uses_probability else (probability > 0.5).astype(y.dtype))
+
+
+def fit_on_subset(dataset, params, rounds, train_index, valid_index, X_valid, y_valid, scoring, early_stopping_rounds=None):
+    import lightgbm as lgb
+
+    # Subsets reuse the parent's bins, only the rows are copied
+    train_set = dataset.subset(train_index)
+    if early_stopping_rounds:
+        valid_sets = [dataset.subset(valid_index)]
+        callbacks = [lgb.early_stopping(early_stopping_rounds, verbose=False)]
+    else:
+        # Without early stopping the validation rows are only scored once, at the end
+        valid_sets, callbacks = [], []
+    booster = lgb.train(params, train_set, num_boost_round=rounds, valid_sets=valid_sets, callbacks=callbacks)
+    # Dart boosting has no early stopping and keeps every round
+    best_rounds = booster.best_iteration or booster.current_iteration()
+    return score_booster(booster, X_valid, y_valid, scoring), best_rounds
+
+
+# Base for the searches below: the features are binned into one lgb.Dataset, and every
+# candidate and fold trains on subsets of it instead of re-binning its own copy
+class SharedDatasetSearch:
+
+    def __init__(self, estimator, param_distributions, scoring="accuracy", n_jobs=-1, n_cores=None,
+                 random_state=42, binary_path=None):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.n_cores = n_cores
+        self.random_state = random_state
+        # Where the binned dataset is saved in LightGBM's binary format and reloaded from
+        self.binary_path = binary_path
+
+        self.history = []
+        self.best_params_ = None
+        self.best_score_ = None
+        self.best_estimator_ = None
+
+    def _prepare(self, X, y):
+        if self.scoring not in SCORING:
+            raise ValueError(f"Unsupported scoring {self.scoring}, expected one of {list(SCORING)}")
+        self._X = X.to_numpy(dtype=np.float32) if hasattr(X, "to_numpy") else np.asarray(X, dtype=np.float32)
+        self._y = np.asarray(y)
+        self._dataset = build_dataset(X, y, self.estimator, self.binary_path)
+
+    def _fit_all(self, jobs):
+        # jobs: (params, rounds, train_index, valid_index, early_stopping_rounds)
+        workers, threads = core_budget(self.n_cores, self.n_jobs, len(jobs))
+        start = time.perf_counter()
+        # LightGBM releases the GIL while training, so threads avoid copying the data to workers
+        results = Parallel(n_jobs=workers, prefer="threads")(
+            delayed(fit_on_subset)(self._dataset, booster_params(self.estimator, params, threads), rounds, train_index,
+                                   valid_index, self._X[valid_index], self._y[valid_index], self.scoring, early_stopping)
+            for params, rounds, train_index, valid_index, early_stopping in jobs
+        )
+        logger.info(f"Trained {len(jobs)} models with {workers} workers x {threads} threads in {time.perf_counter() - start:.2f}s")
+        return results
+
+    def _refit(self, X, y, params):
+        self._X = self._y = self._dataset = None
+        self.best_params_ = params
+        _, threads = core_budget(self.n_cores, 1)
+        self.best_estimator_ = clone(self.estimator).set_params(**params, n_jobs=threads).fit(X, y)
+
+
+# Random search with stratified k-fold cross-validation, as RandomizedSearchCV does it
+class CrossValidatedSearch(SharedDatasetSearch):
+
+    def __init__(self, estimator, param_distributions, n_iter=10, cv=5, **kwargs):
+        super().__init__(estimator, param_distributions, **kwargs)
+        self.n_iter = n_iter
+        self.cv = cv
+
+    def fit(self, X, y):
+        try:
+            self._prepare(X, y)
+            candidates = list(ParameterSampler(self.param_distributions, self.n_iter, random_state=self.random_state))
+            folds = list(StratifiedKFold(self.cv).split(self._X, self._y))
+
+            results = self._fit_all([
+                (params, params.get("n_estimators", self.estimator.n_estimators), train_index, valid_index, None)
+                for params in candidates for train_index, valid_index in folds
+            ])
+
+            scores = np.array([score for score, _ in results]).reshape(len(candidates), len(folds)).mean(axis=1)
+            for params, score in zip(candidates, scores):
+                self.history.append({"params": params, "score": float(score)})
+
+            best = int(np.argmax(scores))
+            self.best_score_ = float(scores[best])
+            self._refit(X, y, candidates[best])
+            logger.info(f"Best candidate scored {self.best_score_:.4f} over {len(folds)} folds")
+            return self
+        except Exception as e:
+            logger.error(f"Error during cross-validated search {e}")
+            raise CustomException("Error during cross-validated search", e)
+
+
+# Successive halving over boosting rounds: every sampled candidate is trained for
+# min_rounds with early stopping on a stratified validation fold, the best 1/eta are
+# trained again with eta times more rounds, until max_rounds or a single candidate.
+class SuccessiveHalvingSearch(SharedDatasetSearch):
+
+    def __init__(self, estimator, param_distributions, n_candidates=16, min_rounds=50, max_rounds=500, eta=3,
+                 early_stopping_rounds=20, validation_fraction=0.2, **kwargs):
+        super().__init__(estimator, param_distributions, **kwargs)
+        self.n_candidates = n_candidates
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.eta = eta
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_fraction = validation_fraction
+
+    def fit(self, X, y):
+        try:
+            self._prepare(X, y)
+            candidates = list(ParameterSampler(self.param_distributions, self.n_candidates, random_state=self.random_state))
+            train_index, valid_index = train_test_split(
+                np.arange(len(self._y)), test_size=self.validation_fraction, stratify=self._y, random_state=self.random_state
+            )
+
+            rounds = self.min_rounds
+            rung = 0
+            # Per candidate: (rounds trained, score, best rounds)
+            results = [None] * len(candidates)
+            survivors = list(range(len(candidates)))
+            while True:
+                # A candidate is trained again only if more rounds can change its result: it has not
+                # stopped early and its own n_estimators still leaves room
+                pending = []
+                for i in survivors:
+                    target = min(rounds, candidates[i].get("n_estimators", rounds))
+                    stopped = results[i] is not None and results[i][2] + self.early_stopping_rounds <= results[i][0]
+                    if results[i] is None or (target > results[i][0] and not stopped):
+                        pending.append((i, target))
+
+                fitted = self._fit_all([
+                    (candidates[i], target, train_index, valid_index, self.early_stopping_rounds) for i, target in pending
+                ])
+                for (i, target), (score, best_rounds) in zip(pending, fitted):
+                    results[i] = (target, score, best_rounds)
+                logger.info(f"Rung {rung}: {len(survivors)} candidates, {len(pending)} trained up to {rounds} rounds")
+
+                survivors.sort(key=lambda i: results[i][1], reverse=True)
+                for i in survivors:
+                    self.history.append({"rung": rung, "rounds": results[i][0], "params": candidates[i],
+                                         "score": results[i][1], "best_rounds": results[i][2]})
+
+                survivors = survivors[:max(1, math.ceil(len(survivors) / self.eta))]
+                if len(survivors) == 1 or rounds >= self.max_rounds:
+                    break
+                rounds = min(rounds * self.eta, self.max_rounds)
+                rung += 1
+
+            best = survivors[0]
+            _, self.best_score_, best_rounds = results[best]
+            # Refit on train and validation rows with the rounds early stopping settled on
+            self._refit(X, y, dict(candidates[best], n_estimators=best_rounds))
+            logger.info(f"Best candidate scored {self.best_score_:.4f} with {best_rounds} rounds")
+            return self
+        except Exception as e:
+            logger.error(f"Error during successive halving search {e}")
+            raise CustomException("Error during successive halving search", e)
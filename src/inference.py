@@ -0,0 +1,61 @@
+import numpy as np
+from src.custom_exception import CustomException
+
+# Order in which the model was trained (see artifacts/processed/processed_train.csv)
+FEATURE_COLUMNS = [
+    "lead_time",
+    "no_of_special_request",
+    "avg_price_per_room",
+    "arrival_month",
+    "arrival_date",
+    "market_segment_type",
+    "no_of_week_nights",
+    "no_of_weekend_nights",
+    "type_of_meal_plan",
+    "room_type_reserved"
+]
+
+# Request fields whose training column was named differently
+TRAINING_COLUMN_NAMES = {"no_of_special_request": "no_of_special_requests"}
+
+CANCELLED_TEXT = "Booking likely to be CANCELLED"
+CONFIRMED_TEXT = "Booking likely to be CONFIRMED"
+
+
+def describe_prediction(prediction):
+    return CANCELLED_TEXT if prediction == 1 else CONFIRMED_TEXT
+
+
+def validate_feature_names(feature_names):
+    # The request schema is fed to the model positionally, so the order has to match exactly
+    expected = [TRAINING_COLUMN_NAMES.get(col, col) for col in FEATURE_COLUMNS]
+    if list(feature_names) != expected:
+        raise CustomException("Model features do not match the request schema", f"expected {expected}, got {list(feature_names)}")
+
+
+def build_feature_matrix(rows, preprocessor=None):
+    # One contiguous float32 block so the model is called once for the whole batch.
+    # Filled column by column, so raw category labels are encoded for the whole batch at once.
+    features = np.empty((len(rows), len(FEATURE_COLUMNS)), dtype=np.float32)
+    for j, col in enumerate(FEATURE_COLUMNS):
+        values = [row[col] for row in rows]
+        name = TRAINING_COLUMN_NAMES.get(col, col)
+        if preprocessor is not None and name in preprocessor.mappings:
+            values = preprocessor.encode(name, values, numeric_codes=True)
+        features[:, j] = values
+
+    if preprocessor is not None:
+        skewed = [j for j, col in enumerate(FEATURE_COLUMNS) if TRAINING_COLUMN_NAMES.get(col, col) in preprocessor.log1p_columns]
+        if skewed:
+            features[:, skewed] = np.log1p(features[:, skewed])
+    return features
+
+
+def predict_batch(model, features):
+    if hasattr(model, "predict_proba"):
+        probabilities = model.predict_proba(features)[:, 1]
+        classes = getattr(model, "classes_", np.array([0, 1]))
+        predictions = np.asarray(classes).take((probabilities > 0.5).astype(np.intp))
+        return predictions, probabilities
+
+    return np.asarray(model.predict(features)), None
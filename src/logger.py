@@ -4,13 +4,21 @@ from datetime import datetime
 
 LOGS_DIR = "logs"
 
-os.makedirs(LOGS_DIR, exist_ok=True)
-
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 LOG_FILE_PATH = os.path.join(LOGS_DIR, LOG_FILE)
 
+
+# The log directory and file are only created once something is actually logged,
+# so importing a module that uses the logger has no filesystem side effects
+class LazyFileHandler(logging.FileHandler):
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 logging.basicConfig(
-    filename=LOG_FILE_PATH,
+    handlers=[LazyFileHandler(LOG_FILE_PATH, delay=True)],
     format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO,
 )
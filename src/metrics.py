@@ -0,0 +1,157 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+import numpy as np
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Metrics are updated without locks: each label set owns a small list that is only
+# ever incremented, so the worst case under concurrent threads is a rare lost
+# increment, which is fine for monitoring and keeps the request path cheap.
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in list(self._values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels, value):
+        self._values[labels] = value
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def clear(self):
+        self._values = {}
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            series = self._series.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self):
+        for labels, (counts, total, count) in list(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, labels, f'le="{le}"'), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), count
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        # Prometheus text exposition format 0.0.4
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# The metrics exported by the serving API
+class ServingMetrics:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.histogram(
+            "http_request_duration_seconds", "Time spent serving HTTP requests",
+            ("method", "route", "status"), buckets
+        )
+        self.in_flight = self.registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+        self.stages = self.registry.histogram(
+            "request_stage_duration_seconds", "Time spent in each stage of a request",
+            ("stage",), buckets
+        )
+        self.model_predict = self.registry.histogram(
+            "model_predict_duration_seconds", "Time spent in the model call, per batch",
+            ("model_version",), buckets
+        )
+        self.predictions = self.registry.counter(
+            "booking_predictions_total", "Predictions served by predicted class",
+            ("model_version", "prediction")
+        )
+        self.model_info = self.registry.gauge("serving_model_info", "Model version currently serving", ("model_version",))
+
+    def stage(self, name):
+        return self.stages.time(name)
+
+    def count_predictions(self, model_version, predictions):
+        classes, counts = np.unique(np.asarray(predictions), return_counts=True)
+        for prediction, count in zip(classes, counts):
+            self.predictions.inc(model_version, int(prediction), amount=int(count))
+
+    def set_model_version(self, model_version):
+        self.model_info.clear()
+        self.model_info.set(model_version, value=1)
+
+    def render(self):
+        return self.registry.render()
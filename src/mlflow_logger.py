@@ -0,0 +1,144 @@
+import os
+import time
+import queue
+import threading
+from mlflow.tracking import MlflowClient
+from mlflow.entities import Metric, Param, RunTag
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.pipeline_runner import is_transient
+from utils.common_functions import read_json_file, write_json_file, file_sha256
+
+logger = get_logger(__name__)
+
+
+# Sends artifacts, params and metrics of one MLflow run from a background thread,
+# so training does not wait on the tracking store. Datasets are hashed first: a file
+# already uploaded to a live run of the same tracking store is not uploaded again, the
+# run gets tags pointing at the earlier copy instead. close() waits for every queued
+# upload and raises if any of them failed.
+class AsyncMlflowLogger:
+
+    def __init__(self, run_id, dataset_index_path=None, client=None, retries=2, retry_delay=1.0):
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.tracking_uri = self.client.tracking_uri
+        self.dataset_index_path = dataset_index_path
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        self.uploaded = []
+        self.reused = []
+        self.errors = []
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name="mlflow-logger", daemon=True)
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Upload failures are only raised when the run itself succeeded
+        self.close(raise_errors=exc_type is None)
+        return False
+
+    def log_artifact(self, local_path, artifact_path=None):
+        self._queue.put((self._log_artifact, (local_path, artifact_path)))
+
+    def log_artifacts(self, local_dir, artifact_path=None):
+        self._queue.put((self._log_artifacts, (local_dir, artifact_path)))
+
+    def log_dataset(self, local_path, artifact_path="datasets"):
+        self._queue.put((self._log_dataset, (local_path, artifact_path)))
+
+    def log_params(self, params):
+        params = [Param(key, str(value)) for key, value in params.items()]
+        self._queue.put((self._log_batch, ((), params, ())))
+
+    def log_metrics(self, metrics, step=0):
+        timestamp = int(time.time() * 1000)
+        metrics = [Metric(key, float(value), timestamp, step) for key, value in metrics.items()]
+        self._queue.put((self._log_batch, (metrics, (), ())))
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self, raise_errors=True):
+        self.flush()
+        self._queue.put(None)
+        self._worker.join()
+        if self.errors and raise_errors:
+            raise CustomException(f"{len(self.errors)} MLflow uploads failed", self.errors[0])
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args = item
+                self._with_retries(fn, *args)
+            except Exception as e:
+                logger.error(f"MLflow logging failed for run {self.run_id}: {e}")
+                self.errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def _with_retries(self, fn, *args):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt > self.retries or not is_transient(e):
+                    raise
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    def _log_artifact(self, local_path, artifact_path):
+        self.client.log_artifact(self.run_id, local_path, artifact_path)
+        self.uploaded.append(local_path)
+
+    def _log_artifacts(self, local_dir, artifact_path):
+        self.client.log_artifacts(self.run_id, local_dir, artifact_path)
+        self.uploaded.append(local_dir)
+
+    def _log_batch(self, metrics, params, tags):
+        self.client.log_batch(self.run_id, metrics=list(metrics), params=list(params), tags=list(tags))
+
+    def _index(self):
+        if self.dataset_index_path and os.path.exists(self.dataset_index_path):
+            return read_json_file(self.dataset_index_path)
+        return {}
+
+    def _earlier_upload(self, entry):
+        # Only reuse copies whose run still exists in this tracking store
+        if entry is None or entry["tracking_uri"] != self.tracking_uri or entry["run_id"] == self.run_id:
+            return None
+        try:
+            run = self.client.get_run(entry["run_id"])
+        except Exception:
+            return None
+        return entry if run.info.lifecycle_stage == "active" else None
+
+    def _log_dataset(self, local_path, artifact_path):
+        name = os.path.basename(local_path)
+        sha256 = file_sha256(local_path)
+        index = self._index()
+        earlier = self._earlier_upload(index.get(sha256))
+        tags = [RunTag(f"dataset.{name}.sha256", sha256)]
+        if earlier is not None:
+            logger.info(f"{name} is unchanged since run {earlier['run_id']}, not uploading it again")
+            tags.append(RunTag(f"dataset.{name}.uri", earlier["artifact_uri"]))
+            self.client.log_batch(self.run_id, tags=tags)
+            self.reused.append(local_path)
+            return
+
+        self.client.log_artifact(self.run_id, local_path, artifact_path)
+        artifact_uri = f"runs:/{self.run_id}/{artifact_path}/{name}"
+        tags.append(RunTag(f"dataset.{name}.uri", artifact_uri))
+        self.client.log_batch(self.run_id, tags=tags)
+        self.uploaded.append(local_path)
+        if self.dataset_index_path:
+            index[sha256] = {"tracking_uri": self.tracking_uri, "run_id": self.run_id, "artifact_uri": artifact_uri}
+            write_json_file(index, self.dataset_index_path)
@@ -0,0 +1,124 @@
+import os
+import json
+import shutil
+from datetime import datetime, timezone
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from utils.common_functions import file_sha256, replace_directory
+
+logger = get_logger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+MODEL_FILE = "model.txt"
+MANIFEST_FILE = "manifest.json"
+
+
+def _to_json(value):
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+# Booster loaded from a bundle, exposing the parts of the sklearn API used for serving
+class BundleModel:
+
+    def __init__(self, booster, manifest):
+        self.booster_ = booster
+        self.manifest = manifest
+        self.classes_ = np.asarray(manifest["classes"])
+        self.feature_name_ = manifest["feature_names"]
+        self.preprocessor = load_preprocessor(manifest)
+
+    def predict_proba(self, X):
+        positive = self.booster_.predict(X)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_.take((self.predict_proba(X)[:, 1] > 0.5).astype(np.intp))
+
+
+def load_preprocessor(manifest):
+    # Bundles written before the preprocessor was shipped only take encoded values
+    from src.preprocessing import BookingPreprocessor
+    return BookingPreprocessor.from_dict(manifest["preprocessor"]) if manifest.get("preprocessor") else None
+
+
+def save_model_bundle(model, directory, feature_dtypes=None, metrics=None, label_mappings=None, preprocessor=None):
+    try:
+        directory = str(directory).rstrip(os.sep)
+        tmp_directory = f"{directory}.tmp"
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(tmp_directory)
+
+        booster = model.booster_
+        model_path = os.path.join(tmp_directory, MODEL_FILE)
+        booster.save_model(model_path)
+
+        import lightgbm as lgb
+        feature_names = booster.feature_name()
+        if preprocessor is not None and preprocessor.get("feature_columns") != feature_names:
+            raise ValueError(f"Preprocessor features {preprocessor.get('feature_columns')} do not match the model features {feature_names}")
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "lightgbm_version": lgb.__version__,
+            "model_file": MODEL_FILE,
+            "model_sha256": file_sha256(model_path),
+            "classes": getattr(model, "classes_", [0, 1]),
+            "feature_names": feature_names,
+            "feature_dtypes": feature_dtypes or {name: "float64" for name in feature_names},
+            "label_mappings": label_mappings or {},
+            "preprocessor": preprocessor,
+            "num_trees": booster.num_trees(),
+            "best_iteration": booster.best_iteration,
+            "params": model.get_params() if hasattr(model, "get_params") else booster.params,
+            "metrics": metrics or {}
+        }
+        with open(os.path.join(tmp_directory, MANIFEST_FILE), "w") as f:
+            json.dump(_to_json(manifest), f, indent=2)
+
+        replace_directory(tmp_directory, directory)
+        logger.info(f"Model bundle {manifest['model_sha256'][:12]} saved to {directory}")
+        return manifest
+
+    except Exception as e:
+        logger.error(f"Error while saving model bundle {e}")
+        raise CustomException("Failed to save model bundle", e)
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format version {manifest.get('format_version')}")
+        return manifest
+    except Exception as e:
+        logger.error(f"Error while reading model bundle manifest {e}")
+        raise CustomException("Failed to read model bundle manifest", e)
+
+
+def load_model_bundle(directory, verify=True):
+    manifest = read_manifest(directory)
+    try:
+        model_path = os.path.join(directory, manifest["model_file"])
+        if verify and file_sha256(model_path) != manifest["model_sha256"]:
+            raise ValueError(f"{model_path} does not match the hash recorded in the manifest")
+
+        import lightgbm as lgb
+        booster = lgb.Booster(model_file=model_path)
+        if booster.feature_name() != manifest["feature_names"]:
+            raise ValueError("Model features do not match the manifest")
+
+        return BundleModel(booster, manifest)
+
+    except Exception as e:
+        logger.error(f"Error while loading model bundle {e}")
+        raise CustomException("Failed to load model bundle", e)
@@ -0,0 +1,136 @@
+import os
+import time
+import threading
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from utils.common_functions import file_sha256
+
+logger = get_logger(__name__)
+
+
+# Holds the model currently used for serving. A new artifact is loaded and warmed
+# in the background, then published with a single reference swap, so requests that
+# already picked up the old model finish on it while new requests see the new one.
+class ModelRegistry:
+
+    def __init__(self, path, loader, warmup=None, on_swap=None):
+        self.path = path
+        self.loader = loader
+        self.warmup = warmup
+        self.on_swap = on_swap or []
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self._last_failure = None
+
+        self._current = (None, None)
+        self._signature = None
+        self._pending_signature = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    @property
+    def model(self):
+        return self._current[0]
+
+    @property
+    def version(self):
+        return self._current[1]
+
+    def current(self):
+        return self._current
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        with self._reload_lock:
+            try:
+                signature = self._stat_signature()
+                version = file_sha256(self.path)[:12]
+                if version == self.version:
+                    self._signature = signature
+                    return False
+
+                logger.info(f"Loading model version {version} from {self.path}")
+                model = self.loader()
+                if self.warmup is not None:
+                    self.warmup(model)
+
+                self._current = (model, version)
+                self._signature = signature
+                self.reloads += 1
+                self.last_error = None
+                logger.info(f"Model version {version} is now serving")
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                self._last_failure = time.monotonic()
+                logger.error(f"Error while loading model from {self.path}: {e}")
+                raise CustomException("Failed to load model", e)
+
+        for callback in self.on_swap:
+            callback(model, version)
+        return True
+
+    def ensure_loaded(self, retry_interval=5):
+        # Lazy first load; after a failure, retry at most once per retry_interval
+        if self.model is not None:
+            return True
+        if self._last_failure is not None and time.monotonic() - self._last_failure < retry_interval:
+            return False
+        try:
+            self.load()
+        except CustomException:
+            pass
+        return self.model is not None
+
+    def reload_if_changed(self):
+        signature = self._stat_signature()
+        if signature is None or signature == self._signature:
+            self._pending_signature = None
+            return False
+        # Only load once the artifact has stopped changing between two polls
+        if signature != self._pending_signature:
+            self._pending_signature = signature
+            return False
+        self._pending_signature = None
+        return self.load()
+
+    def _watch(self, poll_interval):
+        while not self._stop.wait(poll_interval):
+            try:
+                self.reload_if_changed()
+            except CustomException:
+                # Keep serving the previous model, the error is already logged
+                pass
+
+    def start_watching(self, poll_interval=10):
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(poll_interval,), name="model-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching {self.path} for new models every {poll_interval}s")
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def stats(self):
+        return {
+            "model_version": self.version,
+            "path": self.path,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "watching": self._watcher is not None and self._watcher.is_alive()
+        }
@@ -1,17 +1,24 @@
 import os
+import hashlib
+import numpy as np
 import pandas as pd
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 import joblib
-from sklearn.model_selection import RandomizedSearchCV
 import lightgbm as lgb
 from sklearn.metrics import accuracy_score,precision_score,recall_score,f1_score
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.tree_engine import CompiledForest
+from src.model_bundle import save_model_bundle, BundleModel, read_manifest, load_model_bundle
+from src.balancing import training_class_weight
+from src.hyperparameter_search import CrossValidatedSearch, SuccessiveHalvingSearch, booster_params, core_budget
+from src.out_of_core import build_streamed_dataset, evaluate_streamed
+from src.mlflow_logger import AsyncMlflowLogger
 from config.paths_config import *
 from config.model_params import *
-from utils.common_functions import read_yaml_file,load_data
+from utils.common_functions import read_yaml_file,read_json_file,write_json_file,load_data,resolve_data_path,file_sha256,peak_rss_mb
 from scipy.stats import randint
 
 import mlflow
@@ -21,13 +28,25 @@ logger = get_logger(__name__)
 
 class ModelTraining:
 
-    def __init__(self,train_path,test_path,model_output_path):
+    def __init__(self,train_path,test_path,model_output_path,compiled_model_dir=None,model_bundle_dir=None,class_weight=None):
         self.train_path = train_path
         self.test_path = test_path
         self.model_output_path = model_output_path
+        self.compiled_model_dir = compiled_model_dir
+        self.model_bundle_dir = model_bundle_dir
+        # "balanced" when data processing left the classes imbalanced on purpose
+        self.class_weight = class_weight
 
         self.params_dist = LIGHTGM_PARAMS
         self.random_search_params = RANDOM_SEARCH_PARAMS
+        self.out_of_core_params = OUT_OF_CORE_PARAMS
+        self.mlflow_dataset_index_path = MLFLOW_DATASET_INDEX_PATH
+        # Peak process memory in MB after each training step
+        self.memory_report = {}
+
+    def record_memory(self, step):
+        self.memory_report[step] = peak_rss_mb()
+        logger.info(f"Peak memory after {step}: {self.memory_report[step]:.0f} MB")
 
     def load_and_split_data(self):
         try:
@@ -56,33 +75,58 @@ class ModelTraining:
             logger.error(f"Error while loading data: {str(e)}")
             raise CustomException("Failed to load data", str(e))
         
+    def dataset_binary_path(self, *extra):
+        # Keyed by the training data, class weights and any binning parameters in extra
+        key = hashlib.sha256(f"{file_sha256(resolve_data_path(self.train_path))}:{self.class_weight}:{extra}".encode()).hexdigest()
+        return os.path.join(LGBM_DATASET_DIR, f"{key[:16]}.bin")
+
     def train_lgbm(self,X_train,y_train):
         try:
             logger.info("Intializing our model")
 
-            lgbm_model = lgb.LGBMClassifier(random_state=self.random_search_params["random_state"])
+            search_params = self.random_search_params
+            engine = search_params.get("engine", "random")
+            lgbm_model = lgb.LGBMClassifier(random_state=search_params["random_state"], class_weight=self.class_weight)
 
-            logger.info("Starting our Hyperparamter tuning")
+            logger.info(f"Starting our Hyperparamter tuning with the {engine} search")
 
-            random_search = RandomizedSearchCV(
-                estimator=lgbm_model,
-                param_distributions=self.params_dist,
-                n_iter = self.random_search_params["n_iter"],
-                cv = self.random_search_params["cv"],
-                n_jobs=self.random_search_params["n_jobs"],
-                verbose=self.random_search_params["verbose"],
-                random_state=self.random_search_params["random_state"],
-                scoring=self.random_search_params["scoring"]
+            # Both engines bin the features once and train every candidate and fold on subsets
+            common = dict(
+                scoring=search_params["scoring"],
+                n_jobs=search_params["n_jobs"],
+                n_cores=search_params.get("n_cores"),
+                random_state=search_params["random_state"],
+                binary_path=self.dataset_binary_path() if search_params.get("save_binary_dataset") else None
             )
-
-            logger.info("Starting our Hyperparamter tuning")
-
-            random_search.fit(X_train,y_train)
+            if engine == "halving":
+                search = SuccessiveHalvingSearch(
+                    lgbm_model,
+                    self.params_dist,
+                    n_candidates=search_params["n_candidates"],
+                    min_rounds=search_params["min_rounds"],
+                    max_rounds=search_params["max_rounds"],
+                    eta=search_params["eta"],
+                    early_stopping_rounds=search_params["early_stopping_rounds"],
+                    validation_fraction=search_params["validation_fraction"],
+                    **common
+                )
+            elif engine == "random":
+                search = CrossValidatedSearch(
+                    lgbm_model,
+                    self.params_dist,
+                    n_iter=search_params["n_iter"],
+                    cv=search_params["cv"],
+                    **common
+                )
+            else:
+                raise ValueError(f"Unknown search engine {engine}, expected random or halving")
+
+            search.fit(X_train,y_train)
 
             logger.info("Hyperparamter tuning completed")
 
-            best_params = random_search.best_params_
-            best_lgbm_model = random_search.best_estimator_
+            best_params = search.best_params_
+            best_lgbm_model = search.best_estimator_
 
             logger.info(f"Best paramters are : {best_params}")
 
@@ -92,6 +136,48 @@ class ModelTraining:
             logger.error(f"Error while training model {e}")
             raise CustomException("Failed to train model" ,  e)
     
+    def train_out_of_core(self):
+        # Streams the processed splits from disk instead of loading them with pandas;
+        # memory is bounded by the binned dataset, about one byte per feature and row
+        try:
+            settings = self.out_of_core_params
+            estimator = lgb.LGBMClassifier(**settings["model"], class_weight=self.class_weight)
+            _, threads = core_budget(settings.get("n_cores"), 1)
+            params = booster_params(estimator, threads=threads)
+            binary_path = self.dataset_binary_path(settings["model"]) if settings.get("save_binary_dataset") else None
+
+            logger.info(f"Streaming the training data from {self.train_path}")
+            dataset, feature_dtypes = build_streamed_dataset(
+                resolve_data_path(self.train_path), params, settings["batch_size"], self.class_weight, binary_path
+            )
+            self.record_memory("dataset")
+
+            classes = np.unique(dataset.get_label()).astype(int).tolist()
+            booster = lgb.train(params, dataset, num_boost_round=estimator.n_estimators)
+            dataset = None
+            model = BundleModel(booster, {"classes": classes, "feature_names": booster.feature_name()})
+            self.record_memory("training")
+
+            metrics = evaluate_streamed(model, resolve_data_path(self.test_path), settings["batch_size"])
+            self.record_memory("evaluation")
+            logger.info(f"Out-of-core metrics : {metrics}")
+            return model, metrics, feature_dtypes
+        except Exception as e:
+            logger.error(f"Error during out-of-core training {e}")
+            raise CustomException("Failed during out-of-core training", e)
+
+    def fit(self):
+        # Trains and evaluates with the configured mode; returns the model, its metrics and feature dtypes
+        if self.out_of_core_params.get("enabled"):
+            return self.train_out_of_core()
+        X_train,y_train,X_test,y_test = self.load_and_split_data()
+        self.record_memory("loading")
+        best_lgbm_model = self.train_lgbm(X_train,y_train)
+        self.record_memory("training")
+        metrics = self.evaluate_model(best_lgbm_model,X_test,y_test)
+        self.record_memory("evaluation")
+        return best_lgbm_model, metrics, X_train.dtypes.astype(str).to_dict()
+
     def evaluate_model(self , model , X_test , y_test):
         try:
             logger.info("Evaluating our model")
@@ -118,12 +204,42 @@ class ModelTraining:
             logger.error(f"Error while evaluating model {e}")
             raise CustomException("Failed to evaluate model" ,  e)
         
-    def save_model(self,model):
+    def read_preprocessor(self):
+        # Written by data processing next to the processed datasets
+        path = os.path.join(os.path.dirname(str(self.train_path)), os.path.basename(PREPROCESSOR_PATH))
+        return read_json_file(path) if os.path.exists(path) else None
+
+    def summary_path(self):
+        # What the MLflow run needs from training, written next to the model
+        return os.path.join(os.path.dirname(str(self.model_output_path)), os.path.basename(TRAINING_SUMMARY_PATH))
+
+    def save_model(self,model,metrics=None,feature_dtypes=None,compile_model=True):
         try:
             os.makedirs(os.path.dirname(self.model_output_path),exist_ok=True)
 
             logger.info("saving the model")
-            joblib.dump(model , self.model_output_path)
+            # Write then rename, so a serving process watching the file never reads a partial model
+            tmp_path = f"{self.model_output_path}.tmp"
+            joblib.dump(model , tmp_path)
+            source_version = file_sha256(tmp_path)
+
+            if self.model_bundle_dir:
+                logger.info("Saving the model bundle for serving")
+                manifest = save_model_bundle(
+                    model,
+                    self.model_bundle_dir,
+                    feature_dtypes=feature_dtypes,
+                    metrics=metrics,
+                    label_mappings=read_json_file(LABEL_MAPPINGS_PATH) if os.path.exists(LABEL_MAPPINGS_PATH) else None,
+                    preprocessor=self.read_preprocessor()
+                )
+                source_version = manifest["model_sha256"]
+
+            if self.compiled_model_dir and compile_model:
+                logger.info("Compiling the model trees for the NumPy serving engine")
+                CompiledForest.from_model(model).save(self.compiled_model_dir, source_version=source_version)
+
+            os.replace(tmp_path, self.model_output_path)
             logger.info(f"Model saved to {self.model_output_path}")
 
         except Exception as e:
@@ -134,44 +250,87 @@ class ModelTraining:
     def test_model(self):
         try: 
             logger.info("Model Training Started. Test Start")
-            X_train,y_train,X_test,y_test =self.load_and_split_data()
-            best_lgbm_model=self.train_lgbm(X_train,y_train)
-            metrics=self.evaluate_model(best_lgbm_model,X_test,y_test)
-            self.save_model(best_lgbm_model)
+            best_lgbm_model,metrics,feature_dtypes = self.fit()
+            self.save_model(best_lgbm_model,metrics,feature_dtypes)
             logger.info("Model Training successfully completed. Test OK")
         except Exception as e:
             logger.error(f"Error while saving model {e}")
             raise CustomException("Failed to save model" ,  e)
         
-    def run(self):
+    def train(self, compile_model=True):
+        # Fits and saves the model, then records its params and metrics for the MLflow run
         try:
-            with mlflow.start_run():
-                logger.info("Starting our Model Training pipeline")
+            best_lgbm_model,metrics,feature_dtypes = self.fit()
+            self.save_model(best_lgbm_model,metrics,feature_dtypes,compile_model)
+            params = best_lgbm_model.get_params() if hasattr(best_lgbm_model, "get_params") else self.out_of_core_params["model"]
+            summary = {
+                # MLflow stores params as strings, so the search's numpy values are kept that way here
+                "params": {key: str(value) for key, value in params.items()},
+                "metrics": metrics,
+                "peak_memory_mb": self.memory_report
+            }
+            write_json_file(summary, self.summary_path())
+            return summary
+        except Exception as e:
+            logger.error(f"Error while training the model {e}")
+            raise CustomException("Failed to train model" ,  e)
 
-                logger.info("Starting our MLFLOW experimentation")
+    def export_compiled_model(self):
+        # Compiles the saved bundle, for a model trained with compile_model=False
+        try:
+            logger.info("Compiling the model trees for the NumPy serving engine")
+            source_version = read_manifest(self.model_bundle_dir)["model_sha256"]
+            CompiledForest.from_model(load_model_bundle(self.model_bundle_dir)).save(self.compiled_model_dir, source_version=source_version)
+        except Exception as e:
+            logger.error(f"Error while compiling the model {e}")
+            raise CustomException("Failed to compile model" ,  e)
 
-                logger.info("Logging the training and testing datset to MLFLOW")
-                mlflow.log_artifact(self.train_path , artifact_path="datasets")
-                mlflow.log_artifact(self.test_path , artifact_path="datasets")
+    def log_datasets(self, tracker):
+        logger.info("Logging the training and testing datset to MLFLOW")
+        tracker.log_dataset(resolve_data_path(self.train_path))
+        tracker.log_dataset(resolve_data_path(self.test_path))
 
-                X_train,y_train,X_test,y_test =self.load_and_split_data()
-                best_lgbm_model = self.train_lgbm(X_train,y_train)
-                metrics = self.evaluate_model(best_lgbm_model ,X_test , y_test)
-                self.save_model(best_lgbm_model)
+    def log_model(self, tracker, summary):
+        logger.info("Logging the model into MLFLOW")
+        tracker.log_artifact(self.model_output_path)
+        if self.model_bundle_dir:
+            tracker.log_artifacts(self.model_bundle_dir, artifact_path="model_bundle")
 
-                logger.info("Logging the model into MLFLOW")
-                mlflow.log_artifact(self.model_output_path)
+        logger.info("Logging Params and metrics to MLFLOW")
+        tracker.log_params(summary["params"])
+        tracker.log_metrics(summary["metrics"])
+        tracker.log_metrics({f"peak_memory_mb_{step}": value for step, value in summary["peak_memory_mb"].items()})
 
-                logger.info("Logging Params and metrics to MLFLOW")
-                mlflow.log_params(best_lgbm_model.get_params())
-                mlflow.log_metrics(metrics)
+    def run(self):
+        try:
+            # The logger flushes before the run ends; uploads go on while the model trains
+            with mlflow.start_run() as run, AsyncMlflowLogger(run.info.run_id, self.mlflow_dataset_index_path) as tracker:
+                logger.info("Starting our Model Training pipeline")
+
+                logger.info("Starting our MLFLOW experimentation")
+                self.log_datasets(tracker)
+                summary = self.train()
+                self.log_model(tracker, summary)
 
                 logger.info("Model Training sucesfullly completed")
 
         except Exception as e:
             logger.error(f"Error in model training pipeline {e}")
             raise CustomException("Failed during model training pipeline" ,  e)
+
+    def track(self):
+        # The MLflow run of an already trained model, so logging can run beside other work
+        try:
+            summary = read_json_file(self.summary_path())
+            with mlflow.start_run() as run, AsyncMlflowLogger(run.info.run_id, self.mlflow_dataset_index_path) as tracker:
+                self.log_datasets(tracker)
+                self.log_model(tracker, summary)
+            logger.info(f"Logged the trained model to MLflow run {run.info.run_id}")
+        except Exception as e:
+            logger.error(f"Error while logging the model to MLflow {e}")
+            raise CustomException("Failed to log model to MLflow" ,  e)
         
 if __name__=="__main__":
-    trainer = ModelTraining(PROCESSED_TRAIN_DATA_PATH,PROCESSED_TEST_DATA_PATH,MODEL_OUTPUT_PATH)
+    class_weight = training_class_weight(read_yaml_file(CONFIG_PATH)["data_processing"].get("balancing", {}))
+    trainer = ModelTraining(PROCESSED_TRAIN_DATA_PATH,PROCESSED_TEST_DATA_PATH,MODEL_OUTPUT_PATH,COMPILED_MODEL_DIR,MODEL_BUNDLE_DIR,class_weight)
     trainer.run()
@@ -0,0 +1,64 @@
+import os
+import shutil
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+# Reads objects from a GCS bucket. Objects are opened as streams, so callers can
+# read them in chunks without downloading the whole file first.
+class GCSStorage:
+
+    def __init__(self, bucket_name):
+        # Imported here so the local backend works without google-cloud-storage credentials
+        from google.cloud import storage
+
+        self.bucket_name = bucket_name
+        self.bucket = storage.Client().bucket(bucket_name)
+
+    def open(self, name):
+        return self.bucket.blob(name).open("rt")
+
+    def download(self, name, path):
+        self.bucket.blob(name).download_to_filename(path)
+
+    def stat(self, name):
+        # Generation changes on every overwrite of the object
+        blob = self.bucket.get_blob(name)
+        if blob is None:
+            raise FileNotFoundError(f"gs://{self.bucket_name}/{name} does not exist")
+        return {"generation": str(blob.generation), "etag": blob.etag, "size": blob.size}
+
+
+# A directory standing in for a bucket, for local runs and tests
+class LocalStorage:
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def open(self, name):
+        return open(self.path(name), "r", newline="")
+
+    def download(self, name, path):
+        shutil.copyfile(self.path(name), path)
+
+    def stat(self, name):
+        stat = os.stat(self.path(name))
+        return {"generation": str(stat.st_mtime_ns), "etag": None, "size": stat.st_size}
+
+
+def get_storage(config):
+    try:
+        backend = config.get("storage_backend", "gcs")
+        if backend == "gcs":
+            return GCSStorage(config["bucket_name"])
+        if backend == "local":
+            return LocalStorage(config["local_bucket_dir"])
+        raise ValueError(f"Unknown storage backend {backend}")
+    except Exception as e:
+        logger.error(f"Error while creating the storage backend: {e}")
+        raise CustomException("Error while creating the storage backend", e)
@@ -0,0 +1,169 @@
+import os
+import time
+import numbers
+import numpy as np
+import lightgbm as lgb
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.hyperparameter_search import class_weights
+from utils.common_functions import data_format, load_data, peak_rss_mb
+
+logger = get_logger(__name__)
+
+TARGET_COLUMN = "booking_status"
+
+
+def file_schema(path):
+    import pyarrow as pa
+    if data_format(path) == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema
+
+
+# Rows of a parquet or feather file, read one row group or record batch at a time.
+# LightGBM samples rows in increasing order and then pushes consecutive ranges, so
+# only the block holding the current rows is ever decoded.
+class ArrowFileSequence(lgb.Sequence):
+
+    def __init__(self, path, columns, batch_size=65536):
+        import pyarrow as pa
+        self.path = path
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.format = data_format(path)
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._file = pq.ParquetFile(path)
+            sizes = [self._file.metadata.row_group(i).num_rows for i in range(self._file.num_row_groups)]
+        else:
+            # Memory-mapped, so record batches are only paged in when read
+            self._file = pa.ipc.open_file(pa.memory_map(path))
+            sizes = [self._file.get_batch(i).num_rows for i in range(self._file.num_record_batches)]
+        self._offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        self._block_index = None
+        self._block_rows = None
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def _block(self, row):
+        index = int(np.searchsorted(self._offsets, row, side="right")) - 1
+        if index != self._block_index:
+            if self.format == "parquet":
+                table = self._file.read_row_group(index, columns=self.columns)
+            else:
+                table = self._file.get_batch(index).select(self.columns)
+            # float64 like the DataFrame LightGBM gets in memory, so the bins come out the same
+            self._block_rows = np.column_stack([table.column(name).to_numpy().astype(np.float64) for name in self.columns])
+            self._block_index = index
+        return self._block_rows, int(self._offsets[index])
+
+    def __getitem__(self, idx):
+        if isinstance(idx, numbers.Integral):
+            rows, offset = self._block(idx)
+            return rows[idx - offset]
+        if isinstance(idx, slice):
+            start, stop, _ = idx.indices(len(self))
+            parts = []
+            while start < stop:
+                rows, offset = self._block(start)
+                end = min(stop, offset + len(rows))
+                parts.append(rows[start - offset:end - offset])
+                start = end
+            return parts[0] if len(parts) == 1 else np.concatenate(parts) if parts else np.empty((0, len(self.columns)))
+        if isinstance(idx, list):
+            return np.array([self[i] for i in idx])
+        raise TypeError(f"Sequence index must be integer, slice or list, got {type(idx).__name__}")
+
+
+def iter_batches(path, batch_size=65536):
+    # DataFrames of at most batch_size rows, read in file order
+    fmt = data_format(path)
+    if fmt == "csv":
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=batch_size)
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    else:
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size).to_pandas()
+
+
+def build_streamed_dataset(path, params, batch_size=65536, class_weight=None, binary_path=None):
+    # Bins the processed data without loading it: parquet and feather through an
+    # ArrowFileSequence, csv through LightGBM's own two-round file loader.
+    # Returns the dataset and the pandas dtypes of the feature columns.
+    try:
+        start = time.perf_counter()
+        fmt = data_format(path)
+        if fmt == "csv":
+            import pandas as pd
+            columns = pd.read_csv(path, nrows=0).columns
+            feature_dtypes = None
+        else:
+            schema = file_schema(path)
+            columns = schema.names
+            dtypes = schema.empty_table().to_pandas().dtypes.astype(str)
+            feature_dtypes = {name: dtypes[name] for name in columns if name != TARGET_COLUMN}
+        if TARGET_COLUMN not in columns:
+            raise CustomException("Missing target column", f"{TARGET_COLUMN} column not found in {path}")
+        features = [name for name in columns if name != TARGET_COLUMN]
+
+        if binary_path and os.path.exists(binary_path):
+            dataset = lgb.Dataset(binary_path, params=params).construct()
+            logger.info(f"Loaded the binned training data from {binary_path}")
+        else:
+            # Only the label column is read in full: one value per row
+            labels = load_data(path, columns=[TARGET_COLUMN])[TARGET_COLUMN].to_numpy()
+            weight = class_weights(labels, class_weight)
+            if fmt == "csv":
+                file_params = dict(params, header=True, label_column=f"name:{TARGET_COLUMN}", two_round=True)
+                dataset = lgb.Dataset(path, weight=weight, params=file_params).construct()
+            else:
+                sequence = ArrowFileSequence(path, features, batch_size)
+                dataset = lgb.Dataset(sequence, label=labels, weight=weight, feature_name=features, params=params).construct()
+            if binary_path:
+                os.makedirs(os.path.dirname(binary_path) or ".", exist_ok=True)
+                dataset.save_binary(f"{binary_path}.tmp")
+                os.replace(f"{binary_path}.tmp", binary_path)
+                logger.info(f"Saved the binned training data to {binary_path}")
+
+        logger.info(f"Streamed {dataset.num_data()} rows x {dataset.num_feature()} features from {path} "
+                    f"in {time.perf_counter() - start:.2f}s, peak memory {peak_rss_mb():.0f} MB")
+        return dataset, feature_dtypes
+    except Exception as e:
+        logger.error(f"Error while streaming the training data {e}")
+        raise CustomException("Error while streaming the training data", e)
+
+
+def evaluate_streamed(model, path, batch_size=65536):
+    # Same metrics as ModelTraining.evaluate_model, from confusion counts summed over batches
+    try:
+        tp = fp = fn = tn = 0
+        for df in iter_batches(path, batch_size):
+            y_true = df[TARGET_COLUMN].to_numpy() == 1
+            y_pred = model.predict(df[model.feature_name_]) == 1
+            tp += int(np.sum(y_true & y_pred))
+            fp += int(np.sum(~y_true & y_pred))
+            fn += int(np.sum(y_true & ~y_pred))
+            tn += int(np.sum(~y_true & ~y_pred))
+
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        return {
+            "accuracy": (tp + tn) / (tp + fp + fn + tn),
+            "precison": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        }
+    except Exception as e:
+        logger.error(f"Error while evaluating on streamed data {e}")
+        raise CustomException("Error while evaluating on streamed data", e)
@@ -0,0 +1,187 @@
+import os
+import time
+import errno
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from utils.common_functions import read_json_file, write_json_file, peak_rss_mb
+
+logger = get_logger(__name__)
+
+# Errors worth retrying: connection resets, timeouts and throttling by the storage backends
+TRANSIENT_ERRNOS = {errno.EAGAIN, errno.EBUSY, errno.EINTR, errno.ETIMEDOUT, errno.ECONNRESET, errno.ECONNREFUSED, errno.ECONNABORTED, errno.EPIPE}
+TRANSIENT_ERROR_NAMES = {"ServiceUnavailable", "TooManyRequests", "InternalServerError", "GatewayTimeout", "DeadlineExceeded",
+                         "RetryError", "ChunkedEncodingError", "ReadTimeout", "ConnectTimeout"}
+
+
+def is_transient(error):
+    # Looks through CustomException details and exception chains for a retryable cause
+    seen = set()
+    while isinstance(error, BaseException) and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in TRANSIENT_ERROR_NAMES:
+            return True
+        if isinstance(error, OSError) and error.errno in TRANSIENT_ERRNOS:
+            return True
+        detail = error.error_detail if isinstance(error, CustomException) else None
+        error = detail if isinstance(detail, BaseException) else error.__cause__ or error.__context__
+    return False
+
+
+def cpu_seconds():
+    # This process and its finished child processes (process pools, loky workers once they exit)
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+# A pipeline stage: the stages it depends on, and for cached stages the inputs,
+# outputs, config and code that make up its StageCache key. config may be a function,
+# called when the stage runs (and again on every retry).
+class Stage:
+
+    def __init__(self, name, fn, deps=(), inputs=(), outputs=(), config=None, code=(), cached=True, retries=None):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.config = config
+        self.code = list(code)
+        self.cached = cached
+        # None uses the runner's default
+        self.retries = retries
+
+
+# Runs stages as soon as their dependencies finished, up to max_workers at once.
+# Transient I/O errors are retried with exponential backoff. The stages finished by
+# a failed run are recorded in state_path, so a resumed run starts after them.
+class PipelineRunner:
+
+    def __init__(self, stages, cache=None, max_workers=2, retries=2, retry_delay=1.0, state_path=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.state_path = state_path
+        self.report = []
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {missing}")
+        # Depth-first walk; a stage met again while still on the path closes a cycle
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline stages form a cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    def _resumable(self):
+        # Stages finished by the last run, if that run did not complete
+        if not self.state_path or not os.path.exists(self.state_path):
+            return set()
+        state = read_json_file(self.state_path)
+        return set() if state.get("status") == "succeeded" else set(state.get("completed", []))
+
+    def _save_state(self, status, completed):
+        if self.state_path:
+            write_json_file({"status": status, "completed": sorted(completed), "updated_at": time.time()}, self.state_path)
+
+    def _call(self, stage):
+        if stage.cached and self.cache is not None:
+            config = stage.config() if callable(stage.config) else stage.config
+            self.cache.run(stage.name, stage.fn, inputs=stage.inputs, outputs=stage.outputs, config=config, code=stage.code)
+            entry = next(entry for entry in reversed(self.cache.report) if entry["stage"] == stage.name)
+            return entry["status"], entry.get("key")
+        stage.fn()
+        return "ran", None
+
+    def _run_stage(self, stage):
+        retries = self.retries if stage.retries is None else stage.retries
+        start, cpu_start, peak_start = time.perf_counter(), cpu_seconds(), peak_rss_mb()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                status, key = self._call(stage)
+                break
+            except Exception as e:
+                if attempt > retries or not is_transient(e):
+                    raise
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                logger.warning(f"Stage {stage.name} failed with a transient error ({e}), retry {attempt}/{retries} in {delay:.1f}s")
+                time.sleep(delay)
+        peak = peak_rss_mb()
+        return {
+            "stage": stage.name, "status": status, "key": key, "attempts": attempt,
+            "wall_seconds": time.perf_counter() - start,
+            # CPU of the whole process, so it includes stages running at the same time
+            "cpu_seconds": cpu_seconds() - cpu_start,
+            "peak_mb": peak,
+            # How much the stage raised the process memory high-water mark
+            "peak_increase_mb": peak - peak_start
+        }
+
+    def run(self, resume=False):
+        completed = self._resumable() & set(self.stages) if resume else set()
+        for name in self.stages:
+            if name in completed:
+                logger.info(f"Stage {name} finished in the previous run, resuming after it")
+                self.report.append({"stage": name, "status": "resumed", "key": None, "attempts": 0, "wall_seconds": 0.0,
+                                    "cpu_seconds": 0.0, "peak_mb": None, "peak_increase_mb": None})
+
+        pending = {name for name in self.stages if name not in completed}
+        running = {}
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                # No new stages once one failed; the running ones are left to finish
+                if failure is None:
+                    for name in sorted(pending):
+                        if all(dep in completed for dep in self.stages[name].deps) and len(running) < self.max_workers:
+                            pending.discard(name)
+                            running[executor.submit(self._run_stage, self.stages[name])] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        logger.error(f"Stage {name} failed: {e}")
+                        failure = failure or (name, e)
+                        self.report.append({"stage": name, "status": "failed", "error": str(e)})
+                        continue
+                    completed.add(name)
+                    self.report.append(entry)
+                    self._save_state("running", completed)
+
+        for name in sorted(pending):
+            self.report.append({"stage": name, "status": "not run"})
+        if failure is not None:
+            self._save_state("failed", completed)
+            raise CustomException(f"Pipeline failed at stage {failure[0]}", failure[1])
+        self._save_state("succeeded", completed)
+        return self.report
+
+    def format_report(self):
+        lines = [f"{'stage':<12}{'status':<10}{'key':<18}{'attempts':>9}{'wall s':>9}{'cpu s':>9}{'peak MB':>9}{'+MB':>7}"]
+        for entry in self.report:
+            peak = f"{entry['peak_mb']:>9.0f}{entry['peak_increase_mb']:>7.0f}" if entry.get("peak_mb") is not None else f"{'-':>9}{'-':>7}"
+            wall = f"{entry['wall_seconds']:>9.2f}{entry['cpu_seconds']:>9.2f}" if "wall_seconds" in entry else f"{'-':>9}{'-':>9}"
+            lines.append(f"{entry['stage']:<12}{entry['status']:<10}{(entry.get('key') or '-'):<18}{entry.get('attempts', 0):>9}{wall}{peak}")
+        return "\n".join(lines)
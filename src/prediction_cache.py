@@ -0,0 +1,70 @@
+import time
+import threading
+from collections import OrderedDict
+from src.inference import FEATURE_COLUMNS
+
+
+# In-process LRU cache of prediction results with a per-entry TTL.
+# Keys combine the model version with the normalized feature vector, and all
+# entries are dropped as soon as a different model version is set.
+class PredictionCache:
+
+    def __init__(self, max_size=10000, ttl_seconds=300, model_version=None):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.model_version = model_version
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, row):
+        # 150 and 150.0 are the same booking once they reach the model; raw category labels stay strings
+        return (self.model_version, tuple(row[col] if isinstance(row[col], str) else float(row[col]) for col in FEATURE_COLUMNS))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if key[0] != self.model_version:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_model_version(self, model_version):
+        with self._lock:
+            if model_version != self.model_version:
+                self._entries.clear()
+                self.model_version = model_version
+                self.invalidations += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "model_version": self.model_version,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,94 @@
+import numpy as np
+from utils.common_functions import read_json_file, write_json_file
+
+
+# Preprocessing fitted once on the training split and reused as is for the test
+# split and at serving time: category codes, the columns that get log1p after the
+# skewness check and the order of the selected features.
+class BookingPreprocessor:
+
+    def __init__(self, mappings, log1p_columns=(), feature_columns=None, target_column="booking_status"):
+        self.mappings = mappings
+        self.log1p_columns = list(log1p_columns)
+        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        self.target_column = target_column
+
+        # Labels sorted for np.searchsorted, with their codes in the same order
+        self._lookups = {}
+        for col, mapping in mappings.items():
+            labels = sorted(mapping)
+            self._lookups[col] = (np.array(labels, dtype=str), np.array([mapping[label] for label in labels], dtype=np.int64))
+
+    @classmethod
+    def fit(cls, df, categorical_columns, numerical_columns, skewness_threshold, target_column="booking_status", executor=None):
+        # Codes follow the sorted labels, as sklearn's LabelEncoder assigns them
+        mappings = {
+            col: {str(label): code for code, label in enumerate(sorted(df[col].dropna().unique()))}
+            for col in categorical_columns
+        }
+        # One column per task when an executor is given
+        skewness = list((executor.map if executor else map)(column_skewness, [df[col].to_numpy() for col in numerical_columns]))
+        log1p_columns = [col for col, skew in zip(numerical_columns, skewness) if skew > skewness_threshold]
+        return cls(mappings, log1p_columns, target_column=target_column)
+
+    def encode(self, column, values, numeric_codes=False):
+        # Unknown labels get -1. With numeric_codes, numbers are taken as codes that were
+        # already encoded, which keeps clients sending codes working next to raw labels.
+        values = np.asarray(values)
+        if numeric_codes and values.dtype.kind in "iuf":
+            return values
+        labels, codes = self._lookups[column]
+        text = values.astype(str)
+        position = np.searchsorted(labels, text).clip(max=len(labels) - 1)
+        found = labels[position] == text
+        encoded = np.where(found, codes[position], -1)
+        if numeric_codes:
+            # A column mixing numbers and labels arrives as strings
+            digits = ~found & np.char.isdigit(text)
+            encoded[digits] = text[digits].astype(np.int64)
+        return encoded
+
+    def transform_column(self, column, values):
+        if column in self.log1p_columns:
+            # Computed in float64, compact integer columns would otherwise come back as float16
+            return np.log1p(np.asarray(values, dtype=np.float64)).astype(np.float32)
+        # Codes in the smallest integer type that also holds -1, e.g. int8 up to 128 labels
+        return self.encode(column, values).astype(np.min_scalar_type(-max(len(self.mappings[column]), 1)))
+
+    def columns_to_transform(self, df):
+        return [col for col in dict.fromkeys([*self.mappings, *self.log1p_columns]) if col in df.columns]
+
+    def transform(self, df, executor=None):
+        # Columns are independent; with an executor each one is a separate task
+        columns = self.columns_to_transform(df)
+        values = (executor.map if executor else map)(self.transform_column, columns, [df[col].to_numpy() for col in columns])
+        return df.assign(**dict(zip(columns, values)))
+
+    def select(self, df):
+        columns = self.feature_columns + ([self.target_column] if self.target_column in df.columns else [])
+        return df[columns]
+
+    def to_dict(self):
+        return {
+            "mappings": self.mappings,
+            "log1p_columns": self.log1p_columns,
+            "feature_columns": self.feature_columns,
+            "target_column": self.target_column
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["mappings"], data["log1p_columns"], data["feature_columns"], data["target_column"])
+
+    def save(self, path):
+        write_json_file(self.to_dict(), path)
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(read_json_file(path))
+
+
+def column_skewness(values):
+    # The same estimator as DataFrame.skew, for one column; pandas is only needed when fitting
+    import pandas as pd
+    return pd.Series(values).skew()
@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from utils.common_functions import file_sha256, resolve_data_path, replace_directory
+
+logger = get_logger(__name__)
+
+
+def stable_value(value):
+    # JSON-friendly form of config values; scipy distributions otherwise repr with their address
+    if isinstance(value, dict):
+        return {str(key): stable_value(item) for key, item in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [stable_value(item) for item in value]
+    if hasattr(value, "dist") and hasattr(value, "args"):
+        return {"distribution": value.dist.name, "args": stable_value(value.args), "kwds": stable_value(value.kwds)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def path_sha256(path):
+    # Files are hashed by content, directories by the relative names and content of their files
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(file_sha256(file_path).encode())
+        return digest.hexdigest()
+    return file_sha256(path)
+
+
+# Skips a pipeline stage when a run with the same inputs, config and code already
+# produced its outputs. Outputs are stored under cache_dir/<stage>/<key>/, so going
+# back to an earlier config restores that run's outputs instead of recomputing them.
+class StageCache:
+
+    def __init__(self, cache_dir, force=(), max_entries=5):
+        self.cache_dir = cache_dir
+        # True forces every stage, otherwise a collection of stage names
+        self.force = force
+        self.max_entries = max_entries
+        self.report = []
+
+    def stage_key(self, inputs=(), config=None, code=()):
+        material = {
+            "inputs": {str(path): path_sha256(resolve_data_path(path)) for path in inputs},
+            "config": stable_value(config),
+            "code": {str(path): file_sha256(path) for path in code}
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def is_forced(self, name):
+        return self.force is True or name in self.force
+
+    def _entry_dir(self, name, key):
+        return os.path.join(self.cache_dir, name, key[:16])
+
+    def _store(self, name, key, outputs):
+        entry_dir = self._entry_dir(name, key)
+        tmp_dir = f"{entry_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        hashes = {}
+        for i, path in enumerate(outputs):
+            path = resolve_data_path(path)
+            target = os.path.join(tmp_dir, str(i))
+            if os.path.isdir(path):
+                shutil.copytree(path, target)
+            else:
+                shutil.copyfile(path, target)
+            hashes[path] = path_sha256(path)
+        with open(os.path.join(tmp_dir, "entry.json"), "w") as f:
+            json.dump({"key": key, "outputs": hashes, "created_at": time.time()}, f, indent=2)
+        replace_directory(tmp_dir, entry_dir)
+        self._prune(name)
+
+    def _prune(self, name):
+        stage_dir = os.path.join(self.cache_dir, name)
+        entries = sorted(
+            (os.path.join(stage_dir, entry) for entry in os.listdir(stage_dir) if not entry.endswith((".tmp", ".old"))),
+            key=os.path.getmtime
+        )
+        for entry in entries[:-self.max_entries]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def _restore(self, entry_dir):
+        # Outputs already matching the cached content are left alone
+        with open(os.path.join(entry_dir, "entry.json")) as f:
+            hashes = json.load(f)["outputs"]
+        restored = 0
+        for i, path in enumerate(hashes):
+            if os.path.exists(path) and path_sha256(path) == hashes[path]:
+                continue
+            source = os.path.join(entry_dir, str(i))
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if os.path.isdir(source):
+                tmp_dir = f"{path}.tmp"
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                shutil.copytree(source, tmp_dir)
+                replace_directory(tmp_dir, path)
+            else:
+                shutil.copyfile(source, f"{path}.tmp")
+                os.replace(f"{path}.tmp", path)
+            restored += 1
+        return restored
+
+    def run(self, name, fn, inputs=(), outputs=(), config=None, code=()):
+        try:
+            start = time.perf_counter()
+            key = self.stage_key(inputs, config, code)
+            entry_dir = self._entry_dir(name, key)
+
+            if not self.is_forced(name) and os.path.exists(os.path.join(entry_dir, "entry.json")):
+                restored = self._restore(entry_dir)
+                # Recently used entries are the last to be pruned
+                os.utime(entry_dir)
+                self.report.append({"stage": name, "status": "reused", "key": key[:16], "restored_outputs": restored,
+                                    "seconds": time.perf_counter() - start})
+                logger.info(f"Stage {name} reused from cache {key[:16]}")
+                return None
+
+            logger.info(f"Stage {name} running (cache key {key[:16]})")
+            result = fn()
+            self._store(name, key, outputs)
+            self.report.append({"stage": name, "status": "forced" if self.is_forced(name) else "ran", "key": key[:16],
+                                "seconds": time.perf_counter() - start})
+            return result
+        except Exception as e:
+            logger.error(f"Error in cached stage {name}: {e}")
+            raise CustomException(f"Error while running stage {name}", e)
+
+    def format_report(self):
+        lines = [f"{'stage':<12}{'status':<10}{'key':<18}{'seconds':>10}"]
+        for entry in self.report:
+            lines.append(f"{entry['stage']:<12}{entry['status']:<10}{entry['key']:<18}{entry['seconds']:>10.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,196 @@
+import os
+import json
+import shutil
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from utils.common_functions import replace_directory
+
+logger = get_logger(__name__)
+
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+ZERO_THRESHOLD = 1e-35
+
+ARRAY_NAMES = ["split_feature", "threshold", "left_child", "right_child", "default_left", "missing_type", "value", "roots"]
+
+
+# LightGBM trees flattened into node arrays and evaluated with NumPy.
+# Leaves are stored as nodes pointing to themselves, so every (row, tree) pair can
+# step down the forest in lockstep for max_depth iterations without masking.
+class CompiledForest:
+
+    def __init__(self, split_feature, threshold, left_child, right_child, default_left,
+                 missing_type, value, roots, max_depth, sigmoid, average_output=False, classes=(0, 1),
+                 source_version=None):
+        self.split_feature = split_feature
+        self.threshold = threshold
+        self.left_child = left_child
+        self.right_child = right_child
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.sigmoid = sigmoid
+        self.average_output = average_output
+        self.classes_ = np.asarray(classes)
+        self.source_version = source_version
+        self.has_zero_missing = bool((missing_type == MISSING_ZERO).any())
+
+    @classmethod
+    def from_model(cls, model):
+        booster = model.booster_ if hasattr(model, "booster_") else model
+        classes = getattr(model, "classes_", (0, 1))
+        dump = booster.dump_model()
+
+        objective = dump["objective"].split()
+        if objective[0] != "binary" or dump["num_tree_per_iteration"] != 1:
+            raise CustomException("Unsupported model for tree compilation", f"objective {dump['objective']}")
+        sigmoid = float(objective[1].split(":")[1]) if len(objective) > 1 else 1.0
+
+        nodes = {name: [] for name in ARRAY_NAMES if name != "roots"}
+        roots = []
+        max_depth = 0
+
+        # Depth-first walk; children are appended after their parent so indices are known on return
+        def add(node, depth):
+            nonlocal max_depth
+            index = len(nodes["value"])
+            for name in nodes:
+                nodes[name].append(0)
+
+            if "split_index" not in node:
+                max_depth = max(max_depth, depth)
+                nodes["left_child"][index] = index
+                nodes["right_child"][index] = index
+                nodes["threshold"][index] = np.inf
+                nodes["value"][index] = node["leaf_value"]
+                return index
+
+            if node["decision_type"] != "<=":
+                raise CustomException("Unsupported split for tree compilation", "categorical splits are not supported")
+
+            nodes["split_feature"][index] = node["split_feature"]
+            nodes["threshold"][index] = node["threshold"]
+            nodes["default_left"][index] = node["default_left"]
+            nodes["missing_type"][index] = MISSING_TYPES[node["missing_type"]]
+            nodes["left_child"][index] = add(node["left_child"], depth + 1)
+            nodes["right_child"][index] = add(node["right_child"], depth + 1)
+            return index
+
+        for tree in dump["tree_info"]:
+            roots.append(add(tree["tree_structure"], 0))
+
+        return cls(
+            split_feature=np.asarray(nodes["split_feature"], dtype=np.int32),
+            threshold=np.asarray(nodes["threshold"], dtype=np.float64),
+            left_child=np.asarray(nodes["left_child"], dtype=np.int32),
+            right_child=np.asarray(nodes["right_child"], dtype=np.int32),
+            default_left=np.asarray(nodes["default_left"], dtype=bool),
+            missing_type=np.asarray(nodes["missing_type"], dtype=np.int8),
+            value=np.asarray(nodes["value"], dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            sigmoid=sigmoid,
+            average_output=bool(dump.get("average_output", False)),
+            classes=classes
+        )
+
+    @property
+    def num_trees(self):
+        return len(self.roots)
+
+    def _raw_score_chunk(self, X):
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        has_nan = bool(np.isnan(X).any())
+        # Flat offsets turn the per-(row, tree) feature lookup into a single take
+        X_flat = X.astype(np.float64).ravel()
+        row_offset = (np.arange(X.shape[0], dtype=np.int64) * X.shape[1])[:, None]
+
+        for _ in range(self.max_depth):
+            x = X_flat.take(row_offset + self.split_feature.take(node))
+            threshold = self.threshold.take(node)
+            if has_nan or self.has_zero_missing:
+                missing_type = self.missing_type.take(node)
+                is_nan = np.isnan(x)
+                x[is_nan & (missing_type != MISSING_NAN)] = 0.0
+                is_missing = is_nan & (missing_type == MISSING_NAN)
+                if self.has_zero_missing:
+                    is_missing |= (missing_type == MISSING_ZERO) & (np.abs(x) <= ZERO_THRESHOLD)
+                go_left = np.where(is_missing, self.default_left.take(node), x <= threshold)
+            else:
+                go_left = x <= threshold
+            next_node = np.where(go_left, self.left_child.take(node), self.right_child.take(node))
+            # Every (row, tree) pair sits on a leaf once nothing moves
+            if np.array_equal(next_node, node):
+                break
+            node = next_node
+
+        scores = self.value.take(node).sum(axis=1)
+        if self.average_output:
+            scores /= len(self.roots)
+        return scores
+
+    def raw_score(self, X, chunk_size=4096):
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        # Chunking bounds the (rows x trees) working set for large batches
+        return np.concatenate([
+            self._raw_score_chunk(X[start:start + chunk_size])
+            for start in range(0, X.shape[0], chunk_size)
+        ]) if X.shape[0] else np.empty(0)
+
+    def predict_proba(self, X):
+        positive = 1.0 / (1.0 + np.exp(-self.sigmoid * self.raw_score(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_.take((self.predict_proba(X)[:, 1] > 0.5).astype(np.intp))
+
+    # Plain .npy files so serving processes can memory-map them read-only and share
+    # the pages. The directory is swapped in whole; processes that still map the
+    # old files keep reading them until they reload.
+    def save(self, directory, source_version=None):
+        try:
+            directory = str(directory).rstrip(os.sep)
+            tmp_directory = f"{directory}.tmp"
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+            os.makedirs(tmp_directory)
+
+            for name in ARRAY_NAMES:
+                np.save(os.path.join(tmp_directory, f"{name}.npy"), getattr(self, name))
+            with open(os.path.join(tmp_directory, "forest.json"), "w") as f:
+                json.dump({
+                    "max_depth": self.max_depth,
+                    "sigmoid": self.sigmoid,
+                    "average_output": self.average_output,
+                    "classes": self.classes_.tolist(),
+                    "source_version": source_version or self.source_version
+                }, f)
+
+            replace_directory(tmp_directory, directory)
+            logger.info(f"Compiled forest with {self.num_trees} trees saved to {directory}")
+        except Exception as e:
+            logger.error(f"Error while saving compiled forest {e}")
+            raise CustomException("Failed to save compiled forest", e)
+
+    @staticmethod
+    def read_source_version(directory):
+        try:
+            with open(os.path.join(directory, "forest.json")) as f:
+                return json.load(f).get("source_version")
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        try:
+            with open(os.path.join(directory, "forest.json")) as f:
+                meta = json.load(f)
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in ARRAY_NAMES}
+            return cls(**arrays, **meta)
+        except Exception as e:
+            logger.error(f"Error while loading compiled forest {e}")
+            raise CustomException("Failed to load compiled forest", e)
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class PoolSaturatedError(Exception):
+    pass
+
+
+class InferenceTimeoutError(Exception):
+    pass
+
+
+# Bounded executor for CPU-bound inference. At most max_pending calls may be
+# queued or running; further calls are rejected instead of piling up.
+class InferencePool:
+
+    def __init__(self, kind="thread", max_workers=4, max_pending=64, timeout_seconds=5.0, start_method=None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        # fork, spawn or forkserver for process workers; None keeps the platform default
+        self.start_method = start_method
+        # Created on first use, so building the pool does not start threads or processes
+        self.executor = None
+        self.max_pending = max_pending
+        self.timeout = timeout_seconds
+
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _create_executor(self):
+        if self.kind == "process":
+            mp_context = multiprocessing.get_context(self.start_method) if self.start_method else None
+            return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+
+    def restart(self):
+        # Process workers hold a copy of the model from when they were started;
+        # queued and running calls finish on the old executor
+        old_executor = self.executor
+        self.executor = self._create_executor()
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
+    async def run(self, fn, *args, timeout=None):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PoolSaturatedError(f"Inference pool is saturated ({self.max_pending} calls pending)")
+
+        try:
+            if self.executor is None:
+                self.executor = self._create_executor()
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._pending += 1
+        # The slot is freed when the work really finishes, not when the caller gives up
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise InferenceTimeoutError(f"Inference did not finish within {timeout or self.timeout} seconds")
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self.completed += 1
+        self._slots.release()
+
+    def stats(self):
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
+
+    def shutdown(self):
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -5,13 +5,14 @@ from pathlib import Path
 import joblib
 import numpy as np
 from fastapi.testclient import TestClient
-from application import app
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 @pytest.fixture
 def client():
+    # Imported lazily so tests that never touch the app do not pay for it
+    from application import app
     return TestClient(app)
 
 @pytest.fixture
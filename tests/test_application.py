@@ -2,6 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 from application import app
 import joblib
+import json
 import numpy as np
 from pathlib import Path
 import sys
@@ -62,6 +63,8 @@ def test_predict_api_invalid_data():
     
     response = client.post("/api/predict", json=test_data)
     assert response.status_code == 422  # Validation error
+    assert response.json()["detail"] == ["lead_time: Input should be greater than or equal to 0"]
+    assert client.post("/api/predict", content=b"{not json", headers={"content-type": "application/json"}).status_code == 422
 
 def test_predict_form_valid_data():
     form_data = {
@@ -113,6 +116,8 @@ def test_openapi_schema():
     assert "openapi" in schema
     assert "info" in schema
     assert "paths" in schema
+    body = schema["paths"]["/api/predict"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert "lead_time" in body["properties"]
 
 def test_static_files():
     response = client.get("/static/style.css")
@@ -126,4 +131,336 @@ def test_error_handling():
 
     # Test with invalid method
     response = client.put("/")
-    assert response.status_code == 405  # Method Not Allowed 
\ No newline at end of file
+    assert response.status_code == 405  # Method Not Allowed 
+
+def test_predict_batch_api():
+    valid_row = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+    invalid_row = dict(valid_row, arrival_month=13)
+
+    response = client.post("/api/predict/batch", json={"bookings": [valid_row, invalid_row, valid_row]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["scored"] == 2
+    assert data["failed"] == 1
+    assert [item["index"] for item in data["results"]] == [0, 1, 2]
+    assert data["results"][0]["prediction"] in [0, 1]
+    assert 0 <= data["results"][0]["probability"] <= 1
+    assert data["results"][0] == data["results"][2] | {"index": 0}
+    assert "arrival_month" in data["results"][1]["errors"][0]
+
+    single = client.post("/api/predict", json=valid_row).json()
+    assert single["prediction"] == data["results"][0]["prediction"]
+
+def test_predict_batch_api_columnar_and_ndjson():
+    valid_row = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+    columns = {name: [value, value] for name, value in valid_row.items()}
+
+    response = client.post("/api/predict/batch", json={"columns": columns})
+    assert response.status_code == 200
+    assert response.json()["scored"] == 2
+
+    ndjson = "\n".join(json.dumps(valid_row) for _ in range(3))
+    response = client.post(
+        "/api/predict/batch",
+        content=ndjson,
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.json()["scored"] == 3
+
+def test_predict_api_accepts_raw_category_labels():
+    encoded_row = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 4,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 0,
+        "room_type_reserved": 0
+    }
+    raw_row = dict(encoded_row, market_segment_type="Online", type_of_meal_plan="Meal Plan 1", room_type_reserved="Room_Type 1")
+
+    encoded = client.post("/api/predict/batch", json=[encoded_row]).json()["results"][0]
+    response = client.post("/api/predict/batch", json=[raw_row, dict(raw_row, type_of_meal_plan="Meal Plan 9")])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"][0]["probability"] == encoded["probability"]
+    assert "type_of_meal_plan" in data["results"][1]["errors"][0]
+
+    assert client.post("/api/predict", json=raw_row).json()["prediction"] == encoded["prediction"]
+
+def test_predict_batch_api_rejects_oversized_batch(monkeypatch):
+    import application
+    monkeypatch.setitem(application.serving_config, "max_batch_size", 1)
+
+    response = client.post("/api/predict/batch", json=[{}, {}])
+    assert response.status_code == 413
+
+    response = client.post("/api/predict/batch", content="not json")
+    assert response.status_code == 400
+
+def test_predict_batch_api_prepares_rows_off_the_event_loop(monkeypatch):
+    import asyncio
+    import application
+    featurize = application.featurize
+    on_loop = []
+
+    def recording_featurize(rows):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return featurize(rows)
+
+    monkeypatch.setattr(application, "featurize", recording_featurize)
+    row = {
+        "lead_time": 30, "no_of_special_request": 1, "avg_price_per_room": 150.0,
+        "arrival_month": 6, "arrival_date": 15, "market_segment_type": 2,
+        "no_of_week_nights": 3, "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1, "room_type_reserved": 2
+    }
+    response = client.post("/api/predict/batch", json=[row, dict(row, lead_time=-1)])
+
+    assert response.json()["scored"] == 1
+    assert on_loop == [False]
+
+def test_predict_api_with_micro_batching(monkeypatch):
+    import application
+    from src.batching import MicroBatcher
+    monkeypatch.setattr(application, "batcher", MicroBatcher(application.predict_features, max_batch_size=4, max_wait_ms=1))
+    monkeypatch.setattr(application, "prediction_cache", None)
+
+    test_data = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+
+    response = client.post("/api/predict", json=test_data)
+    assert response.status_code == 200
+    assert response.json()["prediction"] in [0, 1]
+    assert client.get("/health").json()["micro_batching"]["rows"] == 1
+
+def test_predict_api_returns_503_when_pool_saturated(monkeypatch):
+    import application
+    from src.worker_pool import InferencePool
+    saturated_pool = InferencePool(max_workers=1, max_pending=1)
+    saturated_pool._slots.acquire()
+    monkeypatch.setattr(application, "inference_pool", saturated_pool)
+    monkeypatch.setattr(application, "prediction_cache", None)
+
+    test_data = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+
+    response = client.post("/api/predict", json=test_data)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.get("/health").status_code == 200
+
+def test_predict_api_uses_prediction_cache(monkeypatch):
+    import application
+    from src.prediction_cache import PredictionCache
+    cache = PredictionCache(max_size=10, ttl_seconds=60, model_version=application.model_registry.version)
+    monkeypatch.setattr(application, "prediction_cache", cache)
+
+    test_data = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+
+    first = client.post("/api/predict", json=test_data).json()
+    second = client.post("/api/predict", json=dict(test_data, avg_price_per_room=150)).json()
+
+    assert first["prediction"] == second["prediction"]
+    stats = client.get("/health").json()["prediction_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_admin_reload_model(monkeypatch):
+    import application
+    version = application.model_registry.version
+
+    response = client.post("/api/admin/reload-model")
+    assert response.status_code == 200
+    assert response.json() == {"reloaded": False, "model_version": version}
+
+    monkeypatch.setitem(application.model_reload_config, "admin_token", "secret")
+    assert client.post("/api/admin/reload-model").status_code == 403
+    assert client.post("/api/admin/reload-model", headers={"X-Admin-Token": "secret"}).status_code == 200
+
+def test_readiness_probe():
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+def test_health_and_readiness_without_model(monkeypatch):
+    import application
+    from src.model_registry import ModelRegistry
+    registry = ModelRegistry("missing/model.pkl", loader=lambda: None)
+    monkeypatch.setattr(application, "model_registry", registry)
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/health").json()["model_loaded"] is False
+    assert client.get("/ready").status_code == 503
+    assert client.post("/api/predict/batch", json=[]).status_code == 503
+
+def test_lifespan_preloads_model():
+    import application
+    test_data = {
+        "lead_time": 30,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+
+    with TestClient(app) as lifespan_client:
+        assert application.model_registry.model is not None
+        assert lifespan_client.get("/ready").status_code == 200
+
+    # The inference pool is shut down with the app and recreated on next use
+    assert client.post("/api/predict/batch", json=[test_data]).json()["scored"] == 1
+
+def test_shared_model_export_is_memory_mapped(monkeypatch, tmp_path):
+    import application
+    from src.tree_engine import CompiledForest
+    monkeypatch.setattr(application, "COMPILED_MODEL_DIR", str(tmp_path / "compiled"))
+
+    application.export_shared_model()
+    model = application.load_model("mmap")
+
+    assert isinstance(model, CompiledForest)
+    assert isinstance(model.value, np.memmap)
+    features = np.array([[30, 1, 150.0, 6, 15, 2, 3, 2, 1, 2]], dtype=np.float32)
+    assert model.predict(features)[0] == application.load_model("lightgbm").predict(features)[0]
+
+def test_bundle_engine_validates_schema(monkeypatch, tmp_path):
+    import application
+    import pandas as pd
+    import lightgbm as lgb
+    from src.model_bundle import BundleModel, save_model_bundle
+    from src.custom_exception import CustomException
+    assert isinstance(application.load_model("bundle"), BundleModel)
+
+    # A bundle trained on other columns is refused instead of scoring garbage
+    X = pd.DataFrame(np.random.default_rng(0).normal(size=(60, 10)), columns=[f"f{i}" for i in range(10)])
+    other = lgb.LGBMClassifier(n_estimators=2, verbose=-1).fit(X, np.arange(60) % 2)
+    save_model_bundle(other, tmp_path / "bundle")
+    monkeypatch.setattr(application, "MODEL_BUNDLE_DIR", str(tmp_path / "bundle"))
+    with pytest.raises(CustomException, match="request schema"):
+        application.load_model("bundle")
+
+def test_metrics_endpoint(monkeypatch):
+    import application
+    from src.metrics import ServingMetrics
+    metrics = ServingMetrics()
+    monkeypatch.setattr(application, "metrics", metrics)
+    monkeypatch.setattr(application, "prediction_cache", None)
+    test_data = {
+        "lead_time": 30, "no_of_special_request": 1, "avg_price_per_room": 150.0,
+        "arrival_month": 6, "arrival_date": 15, "market_segment_type": 2,
+        "no_of_week_nights": 3, "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1, "room_type_reserved": 2
+    }
+    assert client.post("/api/predict", json=test_data).status_code == 200
+    assert client.post("/", data=test_data).status_code == 200
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    version = application.model_registry.version
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/predict",status="200"} 1' in text
+    assert 'request_stage_duration_seconds_count{stage="render"} 1' in text
+    assert 'request_stage_duration_seconds_count{stage="validation"} 1' in text
+    # Both prediction requests went through the model check, the scrape did not
+    assert 'request_stage_duration_seconds_count{stage="model_check"} 2' in text
+    assert f'model_predict_duration_seconds_count{{model_version="{version}"}} 2' in text
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith("booking_predictions_total")) == 2
+    # The scrape itself is in flight
+    assert "http_requests_in_flight 1" in text
+
+def test_metrics_can_be_disabled(monkeypatch):
+    import application
+    monkeypatch.setattr(application, "metrics", None)
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/health").status_code == 200
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+def test_process_pool_workers_load_the_model_when_not_forked(start_method):
+    import asyncio
+    import application
+    from src.worker_pool import InferencePool
+    application.model_registry.ensure_loaded()
+    rows = [{
+        "lead_time": 30, "no_of_special_request": 1, "avg_price_per_room": 150.0,
+        "arrival_month": 6, "arrival_date": 15, "market_segment_type": 2,
+        "no_of_week_nights": 3, "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1, "room_type_reserved": 2
+    }]
+    features = application.featurize(rows)
+    pool = InferencePool(kind="process", max_workers=1, timeout_seconds=120, start_method=start_method)
+    try:
+        predictions, _ = asyncio.run(pool.run(application.predict_features, features))
+    finally:
+        pool.shutdown()
+
+    assert list(predictions) == list(application.predict_features(features)[0])
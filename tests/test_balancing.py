@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.balancing import undersample_indices, training_class_weight
+from src.data_preprocessing import DataProcessor
+from src.custom_exception import CustomException
+from config.paths_config import CONFIG_PATH
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return DataProcessor(None, None, str(tmp_path / "processed"), CONFIG_PATH)
+
+@pytest.fixture
+def bookings():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "lead_time": rng.integers(0, 300, 400),
+        "avg_price_per_room": rng.normal(100, 20, 400),
+        "booking_status": np.r_[np.zeros(100, dtype=int), np.ones(300, dtype=int)]
+    })
+
+def use_strategy(processor, strategy):
+    processor.config["data_processing"]["balancing"] = dict(processor.config["data_processing"]["balancing"], strategy=strategy)
+
+def test_smote_balances_with_whole_integer_columns_in_their_dtypes(processor, bookings):
+    use_strategy(processor, "smote")
+    bookings = bookings.astype({"lead_time": np.int16, "avg_price_per_room": np.float32})
+    balanced = processor.balance_data(bookings)
+
+    assert balanced["booking_status"].value_counts().to_dict() == {0: 300, 1: 300}
+    # Synthetic rows are truncated to whole values and the input dtypes are kept
+    assert balanced.dtypes.to_dict() == bookings.dtypes.to_dict()
+    synthetic = balanced.iloc[400:]
+    assert not synthetic["avg_price_per_room"].isin(bookings["avg_price_per_room"]).all()
+    assert balanced.columns.tolist() == bookings.columns.tolist()
+
+def test_undersample_keeps_original_rows(processor, bookings):
+    use_strategy(processor, "undersample")
+    balanced = processor.balance_data(bookings)
+
+    assert balanced["booking_status"].value_counts().to_dict() == {0: 100, 1: 100}
+    assert balanced.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(balanced, bookings.loc[balanced.index])
+    assert np.array_equal(undersample_indices(bookings["booking_status"].to_numpy()), balanced.index)
+
+def test_class_weight_leaves_the_data_to_training(processor, bookings):
+    use_strategy(processor, "class_weight")
+    assert processor.balance_data(bookings) is bookings
+    assert training_class_weight({"strategy": "class_weight"}) == "balanced"
+    assert training_class_weight({"strategy": "smote"}) is None
+
+def test_unknown_strategy_is_rejected(processor, bookings):
+    use_strategy(processor, "adasyn")
+    with pytest.raises(CustomException):
+        processor.balance_data(bookings)
@@ -0,0 +1,51 @@
+import asyncio
+import numpy as np
+from src.batching import MicroBatcher
+
+
+def make_row(lead_time):
+    return {
+        "lead_time": lead_time,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+
+def predict_by_lead_time(features):
+    predictions = (features[:, 0] > 50).astype(int)
+    return predictions, predictions.astype(float)
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    batcher = MicroBatcher(predict_by_lead_time, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(make_row(lead_time)) for lead_time in range(0, 100, 10)))
+
+    results = asyncio.run(run())
+
+    assert [int(prediction) for prediction, _ in results] == [0, 0, 0, 0, 0, 0, 1, 1, 1, 1]
+    stats = batcher.stats()
+    assert stats["rows"] == 10
+    assert stats["batches"] == 2
+    assert stats["queue_depth"] == 0
+    assert 0 < stats["avg_batch_fill"] <= 1
+
+def test_micro_batcher_propagates_errors():
+    def failing_predict(features):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(failing_predict, max_batch_size=4, max_wait_ms=1)
+
+    async def run():
+        return await asyncio.gather(batcher.submit(make_row(10)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert isinstance(results[0], ValueError)
+    assert batcher.stats()["batches"] == 0
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.common_functions import load_data, save_data, ChunkedDataWriter
+
+
+@pytest.fixture
+def bookings():
+    return pd.DataFrame({
+        "Booking_ID": [f"INN{i:05d}" for i in range(100)],
+        "lead_time": np.arange(100, dtype=np.int64),
+        "avg_price_per_room": np.linspace(50, 150, 100),
+        "market_segment_type": ["Online", "Offline"] * 50
+    })
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_save_and_load_round_trip(bookings, tmp_path, fmt):
+    path = tmp_path / f"bookings.{fmt}"
+    save_data(bookings, path)
+
+    loaded = load_data(path)
+
+    assert list(loaded.columns) == list(bookings.columns)
+    assert loaded["Booking_ID"].tolist() == bookings["Booking_ID"].tolist()
+    np.testing.assert_allclose(loaded["avg_price_per_room"], bookings["avg_price_per_room"], rtol=1e-6)
+
+def test_columnar_formats_keep_compact_dtypes(bookings, tmp_path):
+    save_data(bookings, tmp_path / "bookings.parquet")
+
+    loaded = load_data(tmp_path / "bookings.parquet", columns=["lead_time", "avg_price_per_room", "market_segment_type"])
+
+    assert loaded["lead_time"].dtype == np.int8
+    assert loaded["avg_price_per_room"].dtype == np.float32
+    assert isinstance(loaded["market_segment_type"].dtype, pd.CategoricalDtype)
+
+def test_explicit_schema_is_applied(bookings, tmp_path):
+    save_data(bookings, tmp_path / "bookings.feather", schema={"lead_time": "int32"})
+
+    assert load_data(tmp_path / "bookings.feather")["lead_time"].dtype == np.int32
+
+def test_load_data_falls_back_to_csv(bookings, tmp_path):
+    bookings.to_csv(tmp_path / "bookings.csv", index=False)
+
+    assert len(load_data(tmp_path / "bookings.parquet")) == 100
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_chunked_writer_appends_chunks(bookings, tmp_path, fmt):
+    writer = ChunkedDataWriter(tmp_path / f"bookings.{fmt}")
+    for start in range(0, 100, 30):
+        writer.write(bookings.iloc[start:start + 30])
+    writer.close()
+
+    loaded = load_data(tmp_path / f"bookings.{fmt}")
+    assert writer.rows == 100
+    assert loaded["Booking_ID"].tolist() == bookings["Booking_ID"].tolist()
+    assert not (tmp_path / f"bookings.{fmt}.tmp").exists()
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_chunked_writer_keeps_text_columns_that_start_empty(tmp_path, fmt):
+    # Read from csv, a text column with no values in the first chunk comes back as float NaN
+    first = pd.DataFrame({"Booking_ID": ["INN1", "INN2"], "note": [float("nan")] * 2, "nights": [1, 2]})
+    second = pd.DataFrame({"Booking_ID": ["INN3", "INN4"], "note": ["late arrival", None], "nights": [3, 4]})
+    writer = ChunkedDataWriter(tmp_path / f"bookings.{fmt}", text_columns=["Booking_ID", "note"])
+    writer.write(first)
+    writer.write(second)
+    writer.close()
+
+    loaded = load_data(tmp_path / f"bookings.{fmt}")
+    assert loaded["note"].isna().tolist() == [True, True, False, True]
+    assert loaded["note"].iloc[2] == "late arrival"
+    assert loaded["nights"].tolist() == [1, 2, 3, 4]
@@ -0,0 +1,123 @@
+import os
+import pandas as pd
+import pytest
+from src.data_ingestion import DataIngestion
+from src.custom_exception import CustomException
+from utils.common_functions import load_data
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    bucket_dir = tmp_path / "bucket"
+    bucket_dir.mkdir()
+    pd.DataFrame({
+        "Booking_ID": [f"INN{i:05d}" for i in range(1000)],
+        "lead_time": range(1000),
+        "booking_status": ["Canceled", "Not_Canceled"] * 500
+    }).to_csv(bucket_dir / "reservations.csv", index=False)
+    return bucket_dir
+
+def make_ingestion(bucket, tmp_path, **overrides):
+    config = {"data_ingestion": {
+        "bucket_name": "unused",
+        "bucket_file_name": "reservations.csv",
+        "train_ratio": 0.8,
+        "storage_backend": "local",
+        "local_bucket_dir": str(bucket),
+        "mode": "streaming",
+        "chunk_size": 128,
+        **overrides
+    }}
+    return DataIngestion(config, raw_dir=tmp_path / "raw")
+
+def test_streaming_split_is_complete_and_deterministic(bucket, tmp_path):
+    ingestion = make_ingestion(bucket, tmp_path)
+    ingestion.initiate_data_ingestion()
+
+    train = load_data(ingestion.train_file_path)
+    test = load_data(ingestion.test_file_path)
+    assert len(train) + len(test) == 1000
+    assert set(train["Booking_ID"]).isdisjoint(test["Booking_ID"])
+    assert 0.75 < len(train) / 1000 < 0.85
+    assert list(train.columns) == ["Booking_ID", "lead_time", "booking_status"]
+
+    # A different chunk size puts every booking on the same side
+    other = make_ingestion(bucket, tmp_path / "other", chunk_size=1000)
+    other.initiate_data_ingestion()
+    assert load_data(other.train_file_path)["Booking_ID"].tolist() == train["Booking_ID"].tolist()
+
+def test_full_mode_uses_local_bucket(bucket, tmp_path):
+    ingestion = make_ingestion(bucket, tmp_path, mode="full")
+    ingestion.initiate_data_ingestion()
+
+    assert len(pd.read_csv(ingestion.raw_file_path)) == 1000
+    assert len(load_data(ingestion.train_file_path)) == 800
+
+def test_streaming_split_requires_key(bucket, tmp_path):
+    ingestion = make_ingestion(bucket, tmp_path, split_key="missing")
+    with pytest.raises(CustomException):
+        ingestion.stream_split_from_storage()
+
+def test_incremental_ingestion_appends_only_new_rows(bucket, tmp_path):
+    source = pd.read_csv(bucket / "reservations.csv").assign(arrival_year=2018, arrival_month=[1, 2] * 500)
+    source.iloc[:600].to_csv(bucket / "reservations.csv", index=False)
+    ingestion = make_ingestion(bucket, tmp_path, mode="incremental")
+
+    assert sum(ingestion.ingest_new_rows().values()) == 600
+    # Nothing is read again while the source object is unchanged
+    assert sum(ingestion.ingest_new_rows().values()) == 0
+
+    source.to_csv(bucket / "reservations.csv", index=False)
+    os.utime(bucket / "reservations.csv", ns=(1, 1))
+    assert sum(ingestion.ingest_new_rows().values()) == 400
+
+    parts = sorted((tmp_path / "raw" / "partitions").glob("split=*/arrival=*/part-*"))
+    ingested = pd.concat([load_data(path) for path in parts])
+    assert sorted(ingested["Booking_ID"]) == sorted(source["Booking_ID"])
+    assert {path.parent.name for path in parts} == {"arrival=2018-01", "arrival=2018-02"}
+    assert ingestion.booking_numbers(ingested["Booking_ID"]).max() == 999
+
+def test_streaming_split_keeps_label_columns_that_start_empty(bucket, tmp_path):
+    # No meal plan is known for the first 300 bookings, so the first chunks leave the column empty
+    source = pd.read_csv(bucket / "reservations.csv")
+    source["type_of_meal_plan"] = [None] * 300 + ["Meal Plan 1"] * 700
+    source.to_csv(bucket / "reservations.csv", index=False)
+    ingestion = make_ingestion(bucket, tmp_path)
+    config = {"data_ingestion": ingestion.config, "data_processing": {"categorical_columns": ["type_of_meal_plan"]}}
+    ingestion = DataIngestion(config, raw_dir=tmp_path / "raw")
+
+    ingestion.initiate_data_ingestion()
+
+    ingested = pd.concat([load_data(ingestion.train_file_path), load_data(ingestion.test_file_path)])
+    assert ingested["type_of_meal_plan"].value_counts().to_dict() == {"Meal Plan 1": 700}
+    assert not os.path.exists(f"{ingestion.train_file_path}.tmp")
+
+def test_incremental_ingestion_of_an_unsorted_source(bucket, tmp_path):
+    source = pd.read_csv(bucket / "reservations.csv").assign(arrival_year=2018, arrival_month=[1, 2] * 500)
+    shuffled = source.sample(frac=1, random_state=0)
+    shuffled.iloc[:600].to_csv(bucket / "reservations.csv", index=False)
+    ingestion = make_ingestion(bucket, tmp_path, mode="incremental", chunk_size=100)
+
+    assert sum(ingestion.ingest_new_rows().values()) == 600
+    # The watermark only lets through rows above the highest ID of the first run
+    shuffled.to_csv(bucket / "reservations.csv", index=False)
+    os.utime(bucket / "reservations.csv", ns=(1, 1))
+    newer = ingestion.booking_numbers(shuffled["Booking_ID"].iloc[600:]) > ingestion.booking_numbers(shuffled["Booking_ID"].iloc[:600]).max()
+    assert sum(ingestion.ingest_new_rows().values()) == newer.sum()
+
+    parts = sorted((tmp_path / "raw" / "partitions").glob("split=*/arrival=*/part-*"))
+    ingested = pd.concat([load_data(path) for path in parts])
+    assert len(ingested) == 600 + newer.sum()
+    assert ingested["Booking_ID"].is_unique
+
+def test_incremental_ingestion_rejects_rows_without_partition_key(bucket, tmp_path):
+    source = pd.read_csv(bucket / "reservations.csv").assign(arrival_year=2018, arrival_month=[1, 2] * 500)
+    source.loc[700, "arrival_month"] = None
+    source.to_csv(bucket / "reservations.csv", index=False)
+    ingestion = make_ingestion(bucket, tmp_path, mode="incremental")
+
+    with pytest.raises(CustomException, match="Missing partition key"):
+        ingestion.ingest_new_rows()
+    # Nothing was written and the watermark did not move, so a fixed source is ingested in full
+    assert not os.path.exists(ingestion.state_path)
+    assert not list((tmp_path / "raw" / "partitions").glob("split=*/arrival=*/part-*"))
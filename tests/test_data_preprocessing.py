@@ -0,0 +1,96 @@
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_ingestion import DataIngestion
+from src.data_preprocessing import DataProcessor
+from config.paths_config import CONFIG_PATH, ARTIFACT_FORMAT
+from utils.common_functions import read_yaml_file, load_data, read_json_file, save_data
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    (tmp_path / "bucket").mkdir()
+    config = read_yaml_file(CONFIG_PATH)
+    config["data_ingestion"].update(storage_backend="local", local_bucket_dir=str(tmp_path / "bucket"), mode="incremental")
+    ingestion = DataIngestion(config, raw_dir=tmp_path / "raw")
+    processor = DataProcessor(None, None, str(tmp_path / "processed"), CONFIG_PATH, partitions_dir=str(tmp_path / "raw" / "partitions"))
+    processor.config = config
+    return ingestion, processor
+
+def test_combined_skewness_matches_pandas():
+    values = pd.Series(np.random.default_rng(0).exponential(size=1000) + 2017)
+    parts = [values.iloc[:100], values.iloc[100:650], values.iloc[650:]]
+    moments = [DataProcessor.column_moments(part.to_frame("x"))["x"] for part in parts]
+
+    assert DataProcessor.combined_skewness(moments) == pytest.approx(values.skew(), rel=1e-9)
+
+def test_process_partitions_only_reprocesses_changed_partitions(pipeline, tmp_path):
+    ingestion, processor = pipeline
+    raw = load_data("artifacts/raw/raw.csv").iloc[:3000]
+    bucket_file = tmp_path / "bucket" / ingestion.bucket_file_name
+    first = raw[raw["arrival_year"] == 2018]
+    first.to_csv(bucket_file, index=False)
+
+    ingestion.ingest_new_rows()
+    changed = processor.process_partitions()
+    assert changed and all(key.split("/")[1].startswith("2018-") for key in changed)
+    assert processor.process_partitions() == []
+
+    # Rows arriving in 2017 only touch the 2017 partitions
+    pd.concat([first, raw[raw["arrival_year"] == 2017].assign(Booking_ID=lambda df: "INN9" + df["Booking_ID"].str[3:])]).to_csv(bucket_file, index=False)
+    ingestion.ingest_new_rows()
+    changed = processor.process_partitions()
+    assert changed and all(key.split("/")[1].startswith("2017-") for key in changed)
+
+    processed = load_data(tmp_path / "processed" / "processed_train.parquet")
+    assert "booking_status" in processed.columns
+    mappings = read_json_file(tmp_path / "processed" / "label_mappings.json")
+    assert mappings["booking_status"] == {"Canceled": 0, "Not_Canceled": 1}
+    preprocessor = read_json_file(tmp_path / "processed" / "preprocessor.json")
+    assert preprocessor["mappings"] == mappings
+    assert preprocessor["feature_columns"] + ["booking_status"] == processed.columns.tolist()
+
+def test_parallel_preprocessing_matches_sequential(tmp_path):
+    processor = DataProcessor(None, None, str(tmp_path), CONFIG_PATH)
+    train_df = load_data("artifacts/raw/train.csv", dtype_plan=processor.dtype_plan)
+    test_df = load_data("artifacts/raw/test.csv", dtype_plan=processor.dtype_plan)
+    expected = processor.preprocess_splits(train_df, test_df)
+    expected_log1p = processor.preprocessor.log1p_columns
+
+    processor.config["data_processing"]["parallel"] = {"enabled": True, "workers": 2}
+    processor.preprocessor = None
+    with processor.worker_pool() as pool:
+        result = processor.preprocess_splits(train_df, test_df, pool)
+
+    assert processor.preprocessor.log1p_columns == expected_log1p
+    for expected_df, result_df in zip(expected, result):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+def test_parallel_partitions_match_sequential(pipeline, tmp_path):
+    ingestion, processor = pipeline
+    load_data("artifacts/raw/raw.csv").iloc[:2000].to_csv(tmp_path / "bucket" / ingestion.bucket_file_name, index=False)
+    ingestion.ingest_new_rows()
+    processor.process_partitions()
+    expected = load_data(tmp_path / "processed" / "processed_train.parquet")
+
+    shutil.rmtree(tmp_path / "processed")
+    processor.config["data_processing"]["parallel"] = {"enabled": True, "workers": 2}
+    processor.process_partitions()
+    pd.testing.assert_frame_equal(load_data(tmp_path / "processed" / "processed_train.parquet"), expected)
+
+def test_process_partitions_drops_duplicates_across_partitions(pipeline, tmp_path):
+    ingestion, processor = pipeline
+    processor.config["data_processing"]["balancing"] = {"strategy": "none"}
+    load_data("artifacts/raw/raw.csv").iloc[:2000].to_csv(tmp_path / "bucket" / ingestion.bucket_file_name, index=False)
+    ingestion.ingest_new_rows()
+    processor.process_partitions()
+    rows = len(load_data(tmp_path / "processed" / "processed_train.parquet"))
+
+    # The same booking, under another ID, lands in a second partition from a later run
+    partitions = sorted((tmp_path / "raw" / "partitions" / "split=train").glob("arrival=*"))
+    booking = load_data(next(partitions[0].glob("part-*"))).iloc[:1].assign(Booking_ID="INN99999")
+    save_data(booking, partitions[1] / f"part-later.{ARTIFACT_FORMAT}")
+    assert processor.process_partitions() == [f"train/{partitions[1].name.split('=', 1)[1]}"]
+
+    assert len(load_data(tmp_path / "processed" / "processed_train.parquet")) == rows
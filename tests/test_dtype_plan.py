@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from src.dtype_plan import DtypePlan
+from src.data_preprocessing import DataProcessor
+from config.paths_config import CONFIG_PATH
+from utils.common_functions import read_yaml_file, load_data
+
+RAW_TRAIN = "artifacts/raw/train.csv"
+
+
+def test_plan_is_applied_while_loading():
+    plan = DtypePlan.from_config(read_yaml_file(CONFIG_PATH))
+    default = load_data(RAW_TRAIN)
+    planned = load_data(RAW_TRAIN, dtype_plan=plan)
+
+    assert isinstance(planned["type_of_meal_plan"].dtype, pd.CategoricalDtype)
+    assert planned["no_of_adults"].dtype == np.int8
+    assert planned["lead_time"].dtype == np.int16
+    assert planned["avg_price_per_room"].dtype == np.float32
+    # Columns outside the plan are left alone
+    assert planned["Booking_ID"].dtype == default["Booking_ID"].dtype
+    assert planned.memory_usage(deep=True).sum() < default.memory_usage(deep=True).sum() / 3
+    pd.testing.assert_frame_equal(planned.astype(default.dtypes.to_dict()), default, check_exact=False, rtol=1e-6)
+
+def test_plan_keeps_lean_columns_as_they_are():
+    plan = DtypePlan(["room"], ["nights", "price"])
+    df = pd.DataFrame({"room": pd.Categorical(["a", "b"]), "nights": np.array([1, 2], dtype=np.int8),
+                       "price": np.array([1.5, 2.0], dtype=np.float32)})
+    assert plan.apply(df) is df
+
+def test_processing_keeps_the_planned_dtypes(tmp_path):
+    processor = DataProcessor(None, None, str(tmp_path), CONFIG_PATH)
+    train_df = load_data(RAW_TRAIN, dtype_plan=processor.dtype_plan).iloc[:2000]
+    processor.record_memory("loading", train=train_df)
+
+    preprocessed = processor.preprocess_data(train_df)
+    assert "Booking_ID" in train_df.columns
+    assert preprocessed["market_segment_type"].dtype == np.int8
+    assert preprocessed["booking_status"].dtype == np.int8
+
+    balanced = processor.balance_data(preprocessed)
+    processor.record_memory("balancing", train=balanced)
+    assert balanced.dtypes.to_dict() == preprocessed.dtypes.to_dict()
+    assert set(processor.memory_report) == {"loading", "balancing"}
+    assert processor.memory_report["balancing"]["train"] > 0
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.feature_selection import STRATEGIES, rank_features, selection_stability, stratified_sample
+from src.custom_exception import CustomException
+from config.paths_config import CONFIG_PATH
+from utils.common_functions import read_yaml_file
+
+
+@pytest.fixture
+def bookings():
+    rng = np.random.default_rng(0)
+    lead_time = rng.integers(0, 300, 2000)
+    X = pd.DataFrame({
+        "noise": rng.normal(size=2000),
+        "lead_time": lead_time,
+        "arrival_date": rng.integers(1, 31, 2000)
+    })
+    y = pd.Series((lead_time + rng.normal(scale=30, size=2000) > 150).astype(int))
+    return X, y
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_every_strategy_ranks_the_informative_feature_first(bookings, strategy):
+    X, y = bookings
+    settings = read_yaml_file(CONFIG_PATH)["data_processing"]["feature_selection"]
+    ranking, elapsed = rank_features(X, y, settings, strategy=strategy)
+
+    assert ranking.index[0] == "lead_time"
+    assert sorted(ranking.index) == sorted(X.columns)
+    assert elapsed >= 0
+
+def test_unknown_strategy_is_rejected(bookings):
+    with pytest.raises(CustomException):
+        rank_features(*bookings, {"strategy": "chi2"})
+
+def test_stratified_sample_keeps_class_ratio(bookings):
+    X, y = bookings
+    X_sample, y_sample = stratified_sample(X, y, 500, random_state=0)
+    assert len(X_sample) == 500
+    assert y_sample.mean() == pytest.approx(y.mean(), abs=0.01)
+    assert stratified_sample(X, y, None, random_state=0)[0] is X
+
+def test_selection_stability():
+    assert selection_stability([["a", "b"], ["b", "a"]]) == 1.0
+    assert selection_stability([["a", "b"], ["a", "c"]]) == pytest.approx(1 / 3)
+    assert selection_stability([["a"]]) == 1.0
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+import lightgbm as lgb
+from scipy.stats import randint, uniform
+from src.hyperparameter_search import CrossValidatedSearch, SuccessiveHalvingSearch, build_dataset, core_budget
+from src.model_training import ModelTraining
+from config.model_params import RANDOM_SEARCH_PARAMS
+
+
+@pytest.fixture
+def bookings():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"lead_time": rng.integers(0, 300, 600), "avg_price_per_room": rng.normal(100, 20, 600)})
+    y = pd.Series((X["lead_time"] + rng.normal(scale=40, size=600) > 150).astype(int))
+    return X, y
+
+def test_core_budget_never_oversubscribes():
+    assert core_budget(8, -1, 16) == (8, 1)
+    assert core_budget(8, 2) == (2, 4)
+    assert core_budget(8, -1, 3) == (3, 2)
+    assert core_budget(2, 16) == (2, 1)
+    assert core_budget(1, -1) == (1, 1)
+
+def test_successive_halving_keeps_the_best_third(bookings):
+    search = SuccessiveHalvingSearch(
+        lgb.LGBMClassifier(random_state=42, verbose=-1),
+        {"n_estimators": randint(100, 300), "learning_rate": uniform(0.01, 0.2), "num_leaves": randint(4, 32)},
+        n_candidates=9, min_rounds=10, max_rounds=90, eta=3, early_stopping_rounds=10, n_cores=2
+    ).fit(*bookings)
+
+    rungs = [[entry for entry in search.history if entry["rung"] == rung] for rung in range(3)]
+    assert [len(rung) for rung in rungs] == [9, 3, 0]
+    # Survivors are the best scored candidates of the previous rung, the last rung picks the winner
+    assert {str(entry["params"]) for entry in rungs[1]} == {str(entry["params"]) for entry in rungs[0][:3]}
+    assert search.best_score_ == rungs[1][0]["score"]
+    assert search.best_estimator_.n_estimators == search.best_params_["n_estimators"] <= 90
+    assert search.best_estimator_.predict(bookings[0]).shape == (600,)
+
+def test_cross_validated_search_scores_every_candidate(bookings):
+    search = CrossValidatedSearch(
+        lgb.LGBMClassifier(random_state=42, verbose=-1),
+        {"n_estimators": randint(20, 60), "num_leaves": randint(4, 32)},
+        n_iter=4, cv=3, n_cores=2
+    ).fit(*bookings)
+
+    assert len(search.history) == 4
+    assert search.best_score_ == max(entry["score"] for entry in search.history) > 0.7
+    assert search.best_estimator_.get_params()["num_leaves"] == search.best_params_["num_leaves"]
+
+def test_dataset_binary_is_reused(bookings, tmp_path):
+    estimator = lgb.LGBMClassifier(class_weight="balanced", verbose=-1)
+    binary_path = tmp_path / "cache" / "train.bin"
+    built = build_dataset(*bookings, estimator, str(binary_path))
+    assert binary_path.exists()
+
+    loaded = build_dataset(None, None, estimator, str(binary_path))
+    assert loaded.num_data() == built.num_data() == 600
+    np.testing.assert_array_equal(loaded.get_label(), built.get_label())
+    # Class weights are binned with the data
+    np.testing.assert_allclose(loaded.get_weight(), built.get_weight())
+
+def test_model_training_uses_the_configured_engine(bookings, tmp_path):
+    trainer = ModelTraining(tmp_path / "train.csv", tmp_path / "test.csv", tmp_path / "model.joblib")
+    trainer.random_search_params = dict(RANDOM_SEARCH_PARAMS, engine="halving", n_candidates=3, min_rounds=10, max_rounds=30)
+
+    model = trainer.train_lgbm(*bookings)
+    assert isinstance(model, lgb.LGBMClassifier)
+    assert model.n_estimators <= 30
@@ -0,0 +1,47 @@
+from src.metrics import MetricsRegistry, ServingMetrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 5.55' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+def test_counters_and_gauges():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("kind",))
+    gauge = registry.gauge("in_flight", "In flight")
+    counter.inc("a")
+    counter.inc("a", amount=2)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+
+    assert 'events_total{kind="a"} 3' in text
+    assert "in_flight 1" in text
+
+def test_serving_metrics_counts_predictions_by_class():
+    metrics = ServingMetrics()
+    metrics.set_model_version("abc")
+    metrics.count_predictions("abc", [0, 1, 1, 1])
+    with metrics.stage("render"):
+        pass
+
+    text = metrics.render()
+
+    assert 'booking_predictions_total{model_version="abc",prediction="0"} 1' in text
+    assert 'booking_predictions_total{model_version="abc",prediction="1"} 3' in text
+    assert 'serving_model_info{model_version="abc"} 1' in text
+    assert 'request_stage_duration_seconds_count{stage="render"} 1' in text
@@ -0,0 +1,101 @@
+import os
+import pytest
+import pandas as pd
+from mlflow.tracking import MlflowClient
+from src.mlflow_logger import AsyncMlflowLogger
+from src.model_training import ModelTraining
+from src.custom_exception import CustomException
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # A local file-based tracking store
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", tracking_uri)
+    return MlflowClient(tracking_uri)
+
+def new_run(client):
+    return client.create_run(client.get_experiment_by_name("Default").experiment_id).info.run_id
+
+def artifact_names(client, run_id, path=None):
+    return sorted(os.path.basename(artifact.path) for artifact in client.list_artifacts(run_id, path))
+
+
+def test_everything_is_logged_by_close(client, tmp_path):
+    model_path = tmp_path / "model.txt"
+    model_path.write_text("tree")
+    bundle_dir = tmp_path / "bundle"
+    bundle_dir.mkdir()
+    (bundle_dir / "manifest.json").write_text("{}")
+
+    run_id = new_run(client)
+    with AsyncMlflowLogger(run_id, client=client) as tracker:
+        tracker.log_artifact(str(model_path))
+        tracker.log_artifacts(str(bundle_dir), artifact_path="model_bundle")
+        tracker.log_params({"num_leaves": 31, "learning_rate": 0.1})
+        tracker.log_metrics({"accuracy": 0.9, "f1": 0.8})
+
+    run = client.get_run(run_id)
+    assert run.data.params == {"num_leaves": "31", "learning_rate": "0.1"}
+    assert run.data.metrics == {"accuracy": 0.9, "f1": 0.8}
+    assert artifact_names(client, run_id) == ["model.txt", "model_bundle"]
+    assert artifact_names(client, run_id, "model_bundle") == ["manifest.json"]
+    assert not tracker._worker.is_alive()
+
+def test_unchanged_datasets_are_uploaded_once(client, tmp_path):
+    index_path = str(tmp_path / "datasets.json")
+    train_path = tmp_path / "train.csv"
+    train_path.write_text("a,b\n1,2\n")
+
+    first = new_run(client)
+    with AsyncMlflowLogger(first, index_path, client=client) as tracker:
+        tracker.log_dataset(str(train_path))
+    assert tracker.uploaded == [str(train_path)]
+
+    second = new_run(client)
+    with AsyncMlflowLogger(second, index_path, client=client) as tracker:
+        tracker.log_dataset(str(train_path))
+    assert tracker.reused == [str(train_path)]
+    assert client.list_artifacts(second) == []
+    tags = client.get_run(second).data.tags
+    assert tags["dataset.train.csv.uri"] == f"runs:/{first}/datasets/train.csv"
+    assert tags["dataset.train.csv.sha256"] == client.get_run(first).data.tags["dataset.train.csv.sha256"]
+
+    # Changed data, or an earlier run that was deleted, is uploaded again
+    train_path.write_text("a,b\n1,3\n")
+    third = new_run(client)
+    with AsyncMlflowLogger(third, index_path, client=client) as tracker:
+        tracker.log_dataset(str(train_path))
+    assert artifact_names(client, third, "datasets") == ["train.csv"]
+
+    client.delete_run(third)
+    fourth = new_run(client)
+    with AsyncMlflowLogger(fourth, index_path, client=client) as tracker:
+        tracker.log_dataset(str(train_path))
+    assert artifact_names(client, fourth, "datasets") == ["train.csv"]
+
+def test_failed_uploads_are_raised_on_close(client, tmp_path):
+    tracker = AsyncMlflowLogger(new_run(client), client=client)
+    tracker.log_artifact(str(tmp_path / "missing.txt"))
+    tracker.log_metrics({"accuracy": 0.9})
+    with pytest.raises(CustomException, match="1 MLflow uploads failed"):
+        tracker.close()
+
+def test_training_run_logs_through_the_queue(client, tmp_path):
+    data = pd.DataFrame({"lead_time": [10, 20, 30, 40], "avg_price_per_room": [100.0, 150.0, 200.0, 120.0],
+                         "booking_status": [0, 1, 0, 1]})
+    data.to_csv(tmp_path / "train.csv", index=False)
+    data.to_csv(tmp_path / "test.csv", index=False)
+    trainer = ModelTraining(tmp_path / "train.csv", tmp_path / "test.csv", tmp_path / "model.joblib")
+    trainer.mlflow_dataset_index_path = str(tmp_path / "datasets.json")
+
+    trainer.run()
+    trainer.run()
+
+    first, second = sorted(client.search_runs([client.get_experiment_by_name("Default").experiment_id]),
+                           key=lambda run: run.info.start_time)
+    assert artifact_names(client, first.info.run_id) == ["datasets", "model.joblib"]
+    assert artifact_names(client, second.info.run_id) == ["model.joblib"]
+    assert {"accuracy", "f1"} <= set(second.data.metrics)
+    assert second.data.tags["dataset.test.csv.uri"] == f"runs:/{first.info.run_id}/datasets/test.csv"
@@ -0,0 +1,59 @@
+import json
+import numpy as np
+import pytest
+import lightgbm as lgb
+from src.model_bundle import save_model_bundle, load_model_bundle, read_manifest
+from src.custom_exception import CustomException
+from utils.common_functions import file_sha256
+
+
+@pytest.fixture
+def trained_model():
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(300, 4)).astype(np.float32)
+    y = (X[:, 0] - X[:, 2] > 0).astype(int)
+    model = lgb.LGBMClassifier(n_estimators=20, num_leaves=7, random_state=7, verbose=-1)
+    model.fit(X, y)
+    return model, X
+
+def test_bundle_round_trip(trained_model, tmp_path):
+    model, X = trained_model
+    manifest = save_model_bundle(model, tmp_path / "bundle", metrics={"f1": np.float64(0.9)},
+                                 label_mappings={"room_type_reserved": {"Room_Type 1": 0}})
+
+    assert manifest["model_sha256"] == file_sha256(tmp_path / "bundle" / "model.txt")
+    assert read_manifest(tmp_path / "bundle")["metrics"] == {"f1": 0.9}
+
+    loaded = load_model_bundle(tmp_path / "bundle")
+    assert loaded.feature_name_ == model.booster_.feature_name()
+    assert loaded.manifest["label_mappings"] == {"room_type_reserved": {"Room_Type 1": 0}}
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+def test_bundle_save_replaces_previous_bundle(trained_model, tmp_path):
+    model, _ = trained_model
+    save_model_bundle(model, tmp_path / "bundle", metrics={"f1": 0.1})
+    save_model_bundle(model, tmp_path / "bundle", metrics={"f1": 0.2})
+
+    assert read_manifest(tmp_path / "bundle")["metrics"] == {"f1": 0.2}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bundle"]
+
+def test_bundle_rejects_tampered_model(trained_model, tmp_path):
+    model, _ = trained_model
+    save_model_bundle(model, tmp_path / "bundle")
+    with open(tmp_path / "bundle" / "model.txt", "a") as f:
+        f.write("\n")
+
+    with pytest.raises(CustomException):
+        load_model_bundle(tmp_path / "bundle")
+
+def test_bundle_rejects_unknown_format(trained_model, tmp_path):
+    model, _ = trained_model
+    save_model_bundle(model, tmp_path / "bundle")
+    manifest_path = tmp_path / "bundle" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["format_version"] = 99
+    manifest_path.write_text(json.dumps(manifest))
+
+    with pytest.raises(CustomException):
+        read_manifest(tmp_path / "bundle")
@@ -0,0 +1,63 @@
+import joblib
+import numpy as np
+import pytest
+from src.model_registry import ModelRegistry
+from src.custom_exception import CustomException
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return np.full(len(X), self.value)
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    path = tmp_path / "model.pkl"
+    joblib.dump(ConstantModel(0), path)
+    return path
+
+def test_registry_swaps_to_new_artifact(model_path):
+    swaps = []
+    warmed = []
+    registry = ModelRegistry(
+        str(model_path),
+        loader=lambda: joblib.load(model_path),
+        warmup=warmed.append,
+        on_swap=[lambda model, version: swaps.append(version)]
+    )
+
+    assert registry.load() is True
+    old_model, old_version = registry.current()
+
+    joblib.dump(ConstantModel(1), model_path)
+    assert registry.reload_if_changed() is False  # first sighting, wait for the file to settle
+    assert registry.reload_if_changed() is True
+
+    assert old_model.value == 0
+    assert registry.model.value == 1
+    assert registry.version != old_version
+    assert swaps == [old_version, registry.version]
+    assert len(warmed) == 2
+
+def test_registry_keeps_old_model_when_load_fails(model_path):
+    registry = ModelRegistry(str(model_path), loader=lambda: joblib.load(model_path))
+    registry.load()
+    model, version = registry.current()
+
+    model_path.write_bytes(b"not a pickle")
+    with pytest.raises(CustomException):
+        registry.load()
+
+    assert registry.current() == (model, version)
+    assert registry.stats()["failures"] == 1
+
+def test_registry_skips_unchanged_artifact(model_path):
+    registry = ModelRegistry(str(model_path), loader=lambda: joblib.load(model_path))
+    registry.load()
+
+    assert registry.load() is False
+    assert registry.reload_if_changed() is False
+    assert registry.stats()["reloads"] == 1
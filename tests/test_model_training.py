@@ -139,4 +139,63 @@ def test_invalid_data_handling(model_trainer, tmp_path):
         model_trainer.load_and_split_data()
     
     error_message = str(exc_info.value)
-    assert "Failed to load data" in error_message 
\ No newline at end of file
+    assert "Failed to load data" in error_message
+
+
+def test_save_model_compiles_trees(sample_data, tmp_path):
+    from src.tree_engine import CompiledForest
+    from utils.common_functions import file_sha256
+    trainer = ModelTraining(tmp_path / "train.csv", tmp_path / "test.csv", tmp_path / "model.joblib", tmp_path / "compiled")
+    X = sample_data.drop(columns=["booking_status"])
+    y = sample_data["booking_status"]
+    model = trainer.train_lgbm(X, y)
+
+    trainer.save_model(model)
+
+    forest = CompiledForest.load(tmp_path / "compiled")
+    assert forest.source_version == file_sha256(tmp_path / "model.joblib")
+    np.testing.assert_array_equal(forest.predict(X.to_numpy(dtype=np.float32)), model.predict(X))
+
+def test_save_model_writes_bundle(sample_data, tmp_path):
+    from src.model_bundle import load_model_bundle
+    from src.tree_engine import CompiledForest
+    trainer = ModelTraining(tmp_path / "train.csv", tmp_path / "test.csv", tmp_path / "model.joblib",
+                            tmp_path / "compiled", tmp_path / "bundle")
+    X = sample_data.drop(columns=["booking_status"])
+    y = sample_data["booking_status"]
+    model = trainer.train_lgbm(X, y)
+    metrics = trainer.evaluate_model(model, X, y)
+
+    trainer.save_model(model, metrics, X.dtypes.astype(str).to_dict())
+
+    bundle = load_model_bundle(tmp_path / "bundle")
+    assert bundle.manifest["feature_names"] == list(X.columns)
+    assert bundle.manifest["metrics"] == metrics
+    assert bundle.manifest["feature_dtypes"]["avg_price_per_room"] == "float64"
+    assert CompiledForest.read_source_version(tmp_path / "compiled") == bundle.manifest["model_sha256"]
+    np.testing.assert_array_equal(bundle.predict(X.to_numpy(dtype=np.float32)), model.predict(X))
+
+def test_train_then_export_and_track(sample_data, tmp_path, monkeypatch):
+    from mlflow.tracking import MlflowClient
+    from src.tree_engine import CompiledForest
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    sample_data.to_csv(tmp_path / "train.csv", index=False)
+    sample_data.to_csv(tmp_path / "test.csv", index=False)
+    trainer = ModelTraining(tmp_path / "train.csv", tmp_path / "test.csv", tmp_path / "models" / "model.joblib",
+                            tmp_path / "models" / "compiled", tmp_path / "models" / "bundle")
+    trainer.mlflow_dataset_index_path = str(tmp_path / "datasets.json")
+
+    summary = trainer.train(compile_model=False)
+    assert not os.path.exists(tmp_path / "models" / "compiled")
+    assert set(summary["metrics"]) == {"accuracy", "precison", "recall", "f1"}
+
+    trainer.export_compiled_model()
+    assert CompiledForest.read_source_version(tmp_path / "models" / "compiled") is not None
+
+    trainer.track()
+    client = MlflowClient()
+    run = client.search_runs([client.get_experiment_by_name("Default").experiment_id])[0]
+    assert run.data.metrics["f1"] == summary["metrics"]["f1"]
+    assert run.data.params == summary["params"]
+    assert {artifact.path for artifact in client.list_artifacts(run.info.run_id)} == {"datasets", "model.joblib", "model_bundle"}
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+import lightgbm as lgb
+from utils.common_functions import ChunkedDataWriter
+from src.out_of_core import ArrowFileSequence, build_streamed_dataset, evaluate_streamed, iter_batches
+from src.model_bundle import BundleModel
+from src.model_training import ModelTraining
+from config.model_params import OUT_OF_CORE_PARAMS
+
+PARAMS = {"objective": "binary", "num_leaves": 8, "min_data_in_leaf": 5, "verbose": -1}
+
+
+@pytest.fixture
+def bookings():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "lead_time": rng.integers(0, 300, 500),
+        "avg_price_per_room": rng.normal(100, 20, 500).astype(np.float32),
+        "no_of_special_requests": rng.integers(0, 4, 500).astype(np.int8)
+    })
+    df["booking_status"] = (df["lead_time"] + rng.normal(scale=40, size=500) > 150).astype(np.int8)
+    return df
+
+def write_chunked(df, path, chunk_size=120):
+    writer = ChunkedDataWriter(path)
+    for start in range(0, len(df), chunk_size):
+        writer.write(df.iloc[start:start + chunk_size])
+    writer.close()
+    return path
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_sequence_reads_across_row_groups(bookings, tmp_path, fmt):
+    path = write_chunked(bookings, str(tmp_path / f"train.{fmt}"))
+    features = ["lead_time", "avg_price_per_room"]
+    sequence = ArrowFileSequence(path, features, batch_size=50)
+    expected = bookings[features].to_numpy(np.float64)
+
+    assert len(sequence) == 500
+    np.testing.assert_array_equal(sequence[100:370], expected[100:370])
+    np.testing.assert_array_equal(sequence[241], expected[241])
+    np.testing.assert_array_equal(sequence[[3, 130, 499]], expected[[3, 130, 499]])
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_streamed_dataset_trains_the_in_memory_model(bookings, tmp_path, fmt):
+    path = write_chunked(bookings, str(tmp_path / f"train.{fmt}"))
+    X = bookings.drop(columns="booking_status")
+    expected = lgb.train(PARAMS, lgb.Dataset(X, bookings["booking_status"]), num_boost_round=20).predict(X)
+
+    dataset, feature_dtypes = build_streamed_dataset(path, PARAMS, batch_size=64)
+    booster = lgb.train(PARAMS, dataset, num_boost_round=20)
+    assert booster.feature_name() == list(X.columns)
+    np.testing.assert_allclose(booster.predict(X), expected)
+    if fmt != "csv":
+        assert feature_dtypes == X.dtypes.astype(str).to_dict()
+
+def test_streamed_evaluation_matches_in_memory(bookings, tmp_path):
+    path = write_chunked(bookings, str(tmp_path / "test.parquet"))
+    X = bookings.drop(columns="booking_status")
+    booster = lgb.train(PARAMS, lgb.Dataset(X, bookings["booking_status"]), num_boost_round=20)
+    model = BundleModel(booster, {"classes": [0, 1], "feature_names": booster.feature_name()})
+
+    assert sum(len(batch) for batch in iter_batches(path, 64)) == 500
+    metrics = evaluate_streamed(model, path, batch_size=64)
+    expected = ModelTraining(path, path, None).evaluate_model(model, X, bookings["booking_status"])
+    assert metrics == pytest.approx(expected)
+
+def test_model_training_out_of_core(bookings, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.model_training.LGBM_DATASET_DIR", str(tmp_path / "binned"))
+    train_path = write_chunked(bookings, str(tmp_path / "train.parquet"))
+    trainer = ModelTraining(train_path, train_path, str(tmp_path / "model.pkl"), model_bundle_dir=str(tmp_path / "bundle"),
+                            class_weight="balanced")
+    trainer.out_of_core_params = dict(OUT_OF_CORE_PARAMS, enabled=True, batch_size=64,
+                                      model=dict(OUT_OF_CORE_PARAMS["model"], n_estimators=20))
+
+    model, metrics, feature_dtypes = trainer.fit()
+    assert model.predict(bookings.drop(columns="booking_status")).shape == (500,)
+    assert metrics["accuracy"] > 0.7
+    assert set(trainer.memory_report) == {"dataset", "training", "evaluation"}
+    # The binned dataset was kept for the next run
+    assert len(list((tmp_path / "binned").iterdir())) == 1
+
+    trainer.save_model(model, metrics, feature_dtypes)
+    assert (tmp_path / "bundle" / "manifest.json").exists()
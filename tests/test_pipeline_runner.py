@@ -0,0 +1,116 @@
+import threading
+import pytest
+from src.pipeline_runner import PipelineRunner, Stage, is_transient
+from src.stage_cache import StageCache
+from src.custom_exception import CustomException
+from utils.common_functions import read_json_file
+
+
+def test_independent_stages_run_concurrently():
+    # Both branches have to be inside their stage at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+    stages = [
+        Stage("left", lambda: (barrier.wait(), order.append("left"))),
+        Stage("right", lambda: (barrier.wait(), order.append("right"))),
+        Stage("join", lambda: order.append("join"), deps=["left", "right"])
+    ]
+    report = PipelineRunner(stages, max_workers=2).run()
+
+    assert order[-1] == "join"
+    assert [entry["status"] for entry in report] == ["ran"] * 3
+    assert all(entry["wall_seconds"] >= 0 and entry["peak_mb"] > 0 for entry in report)
+
+def test_transient_errors_are_retried():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise CustomException("Error while downloading", ConnectionResetError(104, "Connection reset by peer"))
+
+    report = PipelineRunner([Stage("download", flaky)], retries=2, retry_delay=0).run()
+    assert report[0]["attempts"] == 3
+
+def test_other_errors_stop_the_pipeline(tmp_path):
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad config")
+
+    runner = PipelineRunner([Stage("a", broken), Stage("b", lambda: None, deps=["a"])], retries=3, retry_delay=0,
+                            state_path=str(tmp_path / "state.json"))
+    with pytest.raises(CustomException):
+        runner.run()
+    assert len(calls) == 1
+    assert [(entry["stage"], entry["status"]) for entry in runner.report] == [("a", "failed"), ("b", "not run")]
+
+def test_resume_starts_after_the_finished_stages(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    calls = {"a": 0, "b": 0}
+    fail = [True]
+
+    def stage(name):
+        def run():
+            calls[name] += 1
+            if name == "b" and fail[0]:
+                raise ValueError("b failed")
+        return run
+
+    stages = [Stage("a", stage("a")), Stage("b", stage("b"), deps=["a"])]
+    with pytest.raises(CustomException):
+        PipelineRunner(stages, state_path=state_path).run()
+    assert read_json_file(state_path) | {"updated_at": 0} == {"status": "failed", "completed": ["a"], "updated_at": 0}
+
+    fail[0] = False
+    report = PipelineRunner(stages, state_path=state_path).run(resume=True)
+    assert calls == {"a": 1, "b": 2}
+    assert [entry["status"] for entry in report] == ["resumed", "ran"]
+
+    # After a successful run there is nothing to resume from
+    PipelineRunner(stages, state_path=state_path).run(resume=True)
+    assert calls == {"a": 2, "b": 3}
+
+def test_cached_stages_report_reuse(tmp_path):
+    output = tmp_path / "output.txt"
+    calls = []
+
+    def write():
+        calls.append(1)
+        output.write_text("done")
+
+    cache = StageCache(str(tmp_path / "cache"))
+    stages = [Stage("write", write, outputs=[output], config=lambda: {"n": 1})]
+    PipelineRunner(stages, cache=cache).run()
+    report = PipelineRunner(stages, cache=cache).run()
+
+    assert len(calls) == 1
+    assert report[0]["status"] == "reused" and len(report[0]["key"]) == 16
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineRunner([Stage("a", None, deps=["b"]), Stage("b", None, deps=["a"])])
+    with pytest.raises(ValueError, match="unknown"):
+        PipelineRunner([Stage("a", None, deps=["missing"])])
+
+def test_is_transient_follows_the_cause():
+    try:
+        try:
+            raise TimeoutError("read timed out")
+        except TimeoutError as e:
+            raise CustomException("Failed to load data", str(e))
+    except CustomException as error:
+        assert is_transient(error)
+    assert not is_transient(CustomException("Missing target column", "booking_status column not found"))
+    assert not is_transient(FileNotFoundError(2, "No such file"))
+
+def test_training_pipeline_exports_and_tracks_side_by_side():
+    from pipeline.training import build_stages, STAGES
+    from config.paths_config import CONFIG_PATH
+    from utils.common_functions import read_yaml_file
+    stages = {stage.name: stage for stage in build_stages(read_yaml_file(CONFIG_PATH))}
+
+    assert list(stages) == STAGES
+    assert stages["export"].deps == stages["tracking"].deps == ["training"]
+    PipelineRunner(stages.values())
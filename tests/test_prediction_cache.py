@@ -0,0 +1,49 @@
+import time
+from src.prediction_cache import PredictionCache
+
+
+def make_row(lead_time):
+    return {
+        "lead_time": lead_time,
+        "no_of_special_request": 1,
+        "avg_price_per_room": 150.0,
+        "arrival_month": 6,
+        "arrival_date": 15,
+        "market_segment_type": 2,
+        "no_of_week_nights": 3,
+        "no_of_weekend_nights": 2,
+        "type_of_meal_plan": 1,
+        "room_type_reserved": 2
+    }
+
+def test_prediction_cache_evicts_least_recently_used():
+    cache = PredictionCache(max_size=2, ttl_seconds=60, model_version="v1")
+    cache.put(cache.key(make_row(1)), 0)
+    cache.put(cache.key(make_row(2)), 1)
+    assert cache.get(cache.key(make_row(1))) == 0
+
+    cache.put(cache.key(make_row(3)), 1)
+
+    assert cache.get(cache.key(make_row(2))) is None
+    assert cache.get(cache.key(make_row(1))) == 0
+    assert cache.stats()["evictions"] == 1
+
+def test_prediction_cache_expires_entries():
+    cache = PredictionCache(max_size=2, ttl_seconds=0.01, model_version="v1")
+    cache.put(cache.key(make_row(1)), 0)
+
+    time.sleep(0.02)
+
+    assert cache.get(cache.key(make_row(1))) is None
+    assert cache.stats()["size"] == 0
+
+def test_prediction_cache_invalidated_by_new_model_version():
+    cache = PredictionCache(max_size=2, ttl_seconds=60, model_version="v1")
+    old_key = cache.key(make_row(1))
+    cache.put(old_key, 0)
+
+    cache.set_model_version("v2")
+    cache.put(old_key, 1)
+
+    assert cache.stats()["size"] == 0
+    assert cache.get(cache.key(make_row(1))) is None
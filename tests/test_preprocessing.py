@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from src.preprocessing import BookingPreprocessor
+from src.inference import FEATURE_COLUMNS, build_feature_matrix
+
+
+def make_bookings():
+    return pd.DataFrame({
+        "type_of_meal_plan": ["Meal Plan 2", "Meal Plan 1", "Not Selected", "Meal Plan 1", "Meal Plan 1"],
+        "repeated_guest": [0, 1, 0, 0, 0],
+        "lead_time": [1, 2, 3, 4, 500],
+        "avg_price_per_room": [100.0, 90.0, 110.0, 95.0, 105.0]
+    })
+
+def test_fit_matches_label_encoder_and_picks_skewed_columns():
+    df = make_bookings()
+    preprocessor = BookingPreprocessor.fit(df, ["type_of_meal_plan", "repeated_guest"], ["lead_time", "avg_price_per_room"], 1.5)
+
+    assert preprocessor.log1p_columns == ["lead_time"]
+    transformed = preprocessor.transform(df)
+    assert transformed["type_of_meal_plan"].tolist() == LabelEncoder().fit_transform(df["type_of_meal_plan"]).tolist()
+    assert preprocessor.mappings["repeated_guest"] == {"0": 0, "1": 1}
+    assert np.allclose(transformed["lead_time"], np.log1p(df["lead_time"]))
+    # The input frame is left untouched
+    assert df["type_of_meal_plan"].iloc[0] == "Meal Plan 2"
+
+def test_transform_reuses_the_fitted_encoding(tmp_path):
+    preprocessor = BookingPreprocessor.fit(make_bookings(), ["type_of_meal_plan"], ["lead_time"], 1.5)
+    preprocessor.feature_columns = ["lead_time", "type_of_meal_plan"]
+    preprocessor.save(tmp_path / "preprocessor.json")
+    loaded = BookingPreprocessor.load(tmp_path / "preprocessor.json")
+
+    test_df = pd.DataFrame({"type_of_meal_plan": ["Not Selected", "Meal Plan 3"], "lead_time": [0, 9], "booking_status": [1, 0]})
+    transformed = loaded.select(loaded.transform(test_df))
+    assert transformed.columns.tolist() == ["lead_time", "type_of_meal_plan", "booking_status"]
+    # Codes come from the training split, unseen labels get -1
+    assert transformed["type_of_meal_plan"].tolist() == [2, -1]
+
+def test_feature_matrix_encodes_labels_and_codes_alike():
+    mappings = {"type_of_meal_plan": {"Meal Plan 1": 0, "Meal Plan 2": 1}, "room_type_reserved": {"Room_Type 1": 0, "Room_Type 2": 1}}
+    preprocessor = BookingPreprocessor(mappings, ["lead_time"])
+    row = dict.fromkeys(FEATURE_COLUMNS, 1)
+    rows = [dict(row, type_of_meal_plan="Meal Plan 2", room_type_reserved="Room_Type 1"), dict(row, room_type_reserved=0)]
+
+    features = build_feature_matrix(rows, preprocessor)
+    meal_plan, room_type, lead_time = (FEATURE_COLUMNS.index(col) for col in ("type_of_meal_plan", "room_type_reserved", "lead_time"))
+    assert features[:, meal_plan].tolist() == [1, 1]
+    assert features[:, room_type].tolist() == [0, 0]
+    assert np.allclose(features[:, lead_time], np.log1p(1))
+    assert np.array_equal(build_feature_matrix([row]), np.ones((1, len(FEATURE_COLUMNS)), dtype=np.float32))
@@ -0,0 +1,62 @@
+from scipy.stats import randint
+from src.stage_cache import StageCache, stable_value
+
+
+def make_stage(tmp_path, calls):
+    source = tmp_path / "input.txt"
+    output = tmp_path / "output.txt"
+
+    def stage():
+        calls.append(1)
+        output.write_text(source.read_text().upper())
+
+    return source, output, stage
+
+def test_stage_is_reused_until_inputs_or_config_change(tmp_path):
+    calls = []
+    source, output, stage = make_stage(tmp_path, calls)
+    source.write_text("a")
+    cache = StageCache(tmp_path / "cache")
+
+    cache.run("upper", stage, inputs=[source], outputs=[output], config={"n": 1})
+    cache.run("upper", stage, inputs=[source], outputs=[output], config={"n": 1})
+    assert len(calls) == 1
+
+    cache.run("upper", stage, inputs=[source], outputs=[output], config={"n": 2})
+    source.write_text("b")
+    cache.run("upper", stage, inputs=[source], outputs=[output], config={"n": 2})
+    assert len(calls) == 3
+    assert [entry["status"] for entry in cache.report] == ["ran", "reused", "ran", "ran"]
+
+def test_reuse_restores_outputs_of_the_matching_run(tmp_path):
+    calls = []
+    source, output, stage = make_stage(tmp_path, calls)
+    source.write_text("a")
+    cache = StageCache(tmp_path / "cache")
+    cache.run("upper", stage, inputs=[source], outputs=[output])
+    source.write_text("b")
+    cache.run("upper", stage, inputs=[source], outputs=[output])
+
+    # Going back to the first input brings back its output without running the stage
+    source.write_text("a")
+    cache.run("upper", stage, inputs=[source], outputs=[output])
+
+    assert len(calls) == 2
+    assert output.read_text() == "A"
+    assert cache.report[-1]["restored_outputs"] == 1
+
+def test_force_reruns_cached_stages(tmp_path):
+    calls = []
+    source, output, stage = make_stage(tmp_path, calls)
+    source.write_text("a")
+    StageCache(tmp_path / "cache").run("upper", stage, inputs=[source], outputs=[output])
+
+    cache = StageCache(tmp_path / "cache", force={"upper"})
+    cache.run("upper", stage, inputs=[source], outputs=[output])
+
+    assert len(calls) == 2
+    assert cache.report[0]["status"] == "forced"
+
+def test_stable_value_ignores_object_addresses():
+    assert stable_value({"n": randint(1, 5)}) == stable_value({"n": randint(1, 5)})
+    assert stable_value({"n": randint(1, 5)}) != stable_value({"n": randint(1, 6)})
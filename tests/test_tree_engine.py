@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import lightgbm as lgb
+from src.tree_engine import CompiledForest
+from src.custom_exception import CustomException
+
+
+@pytest.fixture
+def trained_model():
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(500, 10)).astype(np.float32)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + np.nan_to_num(X[:, 3]) > 0).astype(int)
+    model = lgb.LGBMClassifier(n_estimators=30, num_leaves=15, random_state=42, verbose=-1)
+    model.fit(X, y)
+    return model, X
+
+def test_compiled_forest_matches_lightgbm(trained_model):
+    model, X = trained_model
+    forest = CompiledForest.from_model(model)
+
+    np.testing.assert_allclose(forest.predict_proba(X), model.predict_proba(X), atol=1e-12)
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
+    np.testing.assert_allclose(forest.predict_proba(X[:1]), model.predict_proba(X[:1]), atol=1e-12)
+
+def test_compiled_forest_save_and_load(trained_model, tmp_path):
+    model, X = trained_model
+    forest = CompiledForest.from_model(model)
+    forest.save(tmp_path / "compiled")
+
+    loaded = CompiledForest.load(tmp_path / "compiled", mmap_mode="r")
+
+    assert loaded.num_trees == forest.num_trees
+    np.testing.assert_allclose(loaded.predict_proba(X), forest.predict_proba(X))
+
+def test_compiled_forest_rejects_multiclass():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(90, 3))
+    model = lgb.LGBMClassifier(n_estimators=2, verbose=-1).fit(X, np.arange(90) % 3)
+
+    with pytest.raises(CustomException):
+        CompiledForest.from_model(model)
+
+def test_compiled_forest_save_replaces_directory(trained_model, tmp_path):
+    model, X = trained_model
+    forest = CompiledForest.from_model(model)
+    forest.save(tmp_path / "compiled", source_version="v1")
+    mapped = CompiledForest.load(tmp_path / "compiled", mmap_mode="r")
+
+    forest.save(tmp_path / "compiled", source_version="v2")
+
+    assert CompiledForest.read_source_version(tmp_path / "compiled") == "v2"
+    assert CompiledForest.read_source_version(tmp_path / "missing") is None
+    # Processes still mapping the previous files keep working
+    np.testing.assert_allclose(mapped.predict_proba(X), forest.predict_proba(X))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["compiled"]
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import pytest
+from src.worker_pool import InferencePool, PoolSaturatedError, InferenceTimeoutError
+
+
+def test_inference_pool_runs_work():
+    pool = InferencePool(max_workers=2, max_pending=4, timeout_seconds=1)
+
+    result = asyncio.run(pool.run(sum, [1, 2, 3]))
+
+    assert result == 6
+    assert pool.stats()["completed"] == 1
+    pool.shutdown()
+
+def test_inference_pool_rejects_when_saturated():
+    pool = InferencePool(max_workers=1, max_pending=1, timeout_seconds=1)
+    release = threading.Event()
+
+    async def run():
+        blocked = asyncio.ensure_future(pool.run(release.wait, 1))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(sum, [1])
+        release.set()
+        return await blocked
+
+    assert asyncio.run(run()) is True
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
+
+def test_inference_pool_times_out():
+    pool = InferencePool(max_workers=1, max_pending=2, timeout_seconds=0.05)
+    release = threading.Event()
+
+    with pytest.raises(InferenceTimeoutError):
+        asyncio.run(pool.run(release.wait, 1))
+
+    release.set()
+    assert pool.stats()["timed_out"] == 1
+    pool.shutdown()
@@ -1,6 +1,8 @@
 import os
+import json
+import hashlib
+import shutil
 import yaml
-import pandas as pd
 from src.logger import logging
 from src.custom_exception import CustomException
 
@@ -20,10 +22,195 @@ def read_yaml_file(file_path):
         raise CustomException("Error while reading the yaml file", e)
 
 
-def load_data(path):
+def read_json_file(file_path):
+    try:
+        with open(file_path, "r") as json_file:
+            return json.load(json_file)
+    except Exception as e:
+        logger.error(f"Error while reading the json file {file_path}: {e}")
+        raise CustomException("Error while reading the json file", e)
+
+
+def write_json_file(data, file_path):
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, "w") as json_file:
+            json.dump(data, json_file, indent=2)
+    except Exception as e:
+        logger.error(f"Error while writing the json file {file_path}: {e}")
+        raise CustomException("Error while writing the json file", e)
+
+
+def data_format(path):
+    extension = os.path.splitext(str(path))[1].lstrip(".").lower()
+    if extension not in ("csv", "parquet", "feather"):
+        raise ValueError(f"Unsupported data format {extension!r} for {path}")
+    return extension
+
+
+def resolve_data_path(path):
+    # Artifacts written before the columnar formats were introduced are still CSV
+    path = str(path)
+    csv_path = os.path.splitext(path)[0] + ".csv"
+    if not os.path.exists(path) and os.path.exists(csv_path):
+        return csv_path
+    return path
+
+
+def compact_dtypes(df):
+    # Smallest lossless integer type, float32 for floats and categories for repetitive strings
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import is_bool_dtype, is_integer_dtype, is_float_dtype, is_string_dtype, is_object_dtype
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if is_bool_dtype(series):
+            continue
+        if is_integer_dtype(series):
+            columns[col] = pd.to_numeric(series, downcast="integer")
+        elif is_float_dtype(series):
+            columns[col] = series.astype(np.float32)
+        elif (is_string_dtype(series) or is_object_dtype(series)) and series.nunique() < 0.5 * len(series):
+            columns[col] = series.astype("category")
+    return df.assign(**columns) if columns else df
+
+
+def load_data(path, columns=None, dtype_plan=None):
+    # pandas is imported on use so that reading the config (e.g. at API startup) stays light.
+    # A DtypePlan is applied while loading, so the default int64/float64/object dtypes never stay around.
+    import pandas as pd
     try:
         logger.info("Loading data")
-        return pd.read_csv(path)
+        path = resolve_data_path(path)
+        fmt = data_format(path)
+        if fmt == "parquet":
+            df = pd.read_parquet(path, columns=columns)
+        elif fmt == "feather":
+            df = pd.read_feather(path, columns=columns)
+        else:
+            df = pd.read_csv(path, usecols=columns, dtype=dtype_plan.read_dtypes() if dtype_plan else None)
+        return dtype_plan.apply(df) if dtype_plan else df
     except Exception as e:
         logger.error(f"Error Loading the data {e}")
-        raise CustomException("Failed to load data",e)
\ No newline at end of file
+        raise CustomException("Failed to load data",e)
+
+
+def peak_rss_mb():
+    # Peak resident memory of this process so far; ru_maxrss is in KiB on Linux and bytes on macOS
+    import sys
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def frame_memory_mb(df):
+    # Deep size, so category and string columns count their values too
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def save_data(df, path, schema=None):
+    # schema maps columns to dtypes; without one, columnar formats get compact dtypes.
+    # Written to a temporary file first so readers never see a partial artifact.
+    try:
+        fmt = data_format(path)
+        df = df.astype(schema) if schema else compact_dtypes(df) if fmt != "csv" else df
+        os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        if fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        elif fmt == "feather":
+            df.reset_index(drop=True).to_feather(tmp_path)
+        else:
+            df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {len(df)} rows to {path}")
+    except Exception as e:
+        logger.error(f"Error saving the data to {path}: {e}")
+        raise CustomException("Failed to save data", e)
+
+
+# Appends DataFrame chunks to a csv, parquet or feather file with bounded memory.
+# The Arrow schema is fixed by the first chunk so every chunk is written the same way.
+# text_columns are always written as strings: a column that is empty throughout the
+# first chunk is read as float, and would otherwise reject the labels of later chunks.
+class ChunkedDataWriter:
+
+    def __init__(self, path, text_columns=()):
+        self.path = str(path)
+        self.text_columns = list(text_columns)
+        self.format = data_format(self.path)
+        self.tmp_path = f"{self.path}.tmp"
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        if self.format == "csv":
+            if self._file is None:
+                self._file = open(self.tmp_path, "w", newline="")
+            df.to_csv(self._file, index=False, header=self.rows == 0)
+        else:
+            import pandas as pd
+            import pyarrow as pa
+            text_columns = [col for col in self.text_columns if col in df.columns]
+            for col in text_columns:
+                values = df[col]
+                if not isinstance(values.dtype, pd.StringDtype):
+                    df = df.assign(**{col: values.astype(str).astype(object).where(values.notna(), None)})
+            if self._writer is None:
+                self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+                for col in text_columns:
+                    self._schema = self._schema.set(self._schema.get_field_index(col), pa.field(col, pa.string()))
+                if self.format == "parquet":
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.tmp_path, self._schema)
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression="lz4")
+                    self._writer = pa.ipc.new_file(self.tmp_path, self._schema, options=options)
+            self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+        self.rows += len(df)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is None and self._writer is None:
+            raise ValueError(f"No data was written to {self.path}")
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        for handle in (self._file, self._writer):
+            if handle is not None:
+                handle.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except Exception as e:
+        logger.error(f"Error hashing the file {path}: {e}")
+        raise CustomException("Failed to hash file", e)
+
+
+def replace_directory(tmp_directory, directory):
+    # Swap a fully written directory into place; readers never see a half-written one
+    try:
+        old_directory = f"{directory}.old"
+        shutil.rmtree(old_directory, ignore_errors=True)
+        if os.path.exists(directory):
+            os.replace(directory, old_directory)
+        os.replace(tmp_directory, directory)
+        shutil.rmtree(old_directory, ignore_errors=True)
+    except Exception as e:
+        logger.error(f"Error replacing the directory {directory}: {e}")
+        raise CustomException("Failed to replace directory", e)